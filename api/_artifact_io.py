@@ -0,0 +1,154 @@
+"""Optional compression for stage2 artifact files, with transparent reads.
+
+``STAGE2_COMPRESSION`` selects ``gzip`` or ``zstd`` (zstd needs the
+``zstandard`` package and falls back to gzip without it). A compressed
+artifact is stored next to its logical path with a ``.gz``/``.zst``
+suffix, and readers here try the plain file first, then the compressed
+variants, so code that reads through this module does not care how a
+file was written.
+
+Only the files named in ``STAGE2_COMPRESS_FILES`` are compressed. By
+default these are ``annotation.json``, which repeats every VTT body, plus
+the events/emotion VTTs and the CTM. Every Python reader of stage2
+artifacts goes through this module. The Node jobs (``nightly_irr.js``,
+``nightly_adjudication.js``, ``export_dataset.js``) cannot, and read the
+files in ``NODE_READ_FILES`` as plain text, so ``*`` compresses every
+artifact except those and ``item_meta.json``. Listing one of them
+explicitly is allowed but logs a warning.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+LOGGER = logging.getLogger("artifact_io")
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+DEFAULT_COMPRESSED_FILES = frozenset({"annotation.json", "events.vtt", "emotion.vtt", "transcript.ctm"})
+NEVER_COMPRESSED_FILES = frozenset({"item_meta.json"})
+NODE_READ_FILES = frozenset(
+    {
+        "transcript.vtt",
+        "translation.vtt",
+        "code_switch.vtt",
+        "code_switch_spans.json",
+        "diarization.rttm",
+        "speaker_profiles.json",
+        "qa_result.json",
+    }
+)
+
+_mode = (os.environ.get("STAGE2_COMPRESSION") or "").strip().lower()
+if _mode == "zstd" and zstandard is None:
+    LOGGER.warning("STAGE2_COMPRESSION=zstd but zstandard is not installed; using gzip")
+    _mode = "gzip"
+COMPRESSION_MODE = _mode if _mode in {"gzip", "zstd"} else ""
+_names = (os.environ.get("STAGE2_COMPRESS_FILES") or "").strip()
+COMPRESS_ALL = _names == "*"
+COMPRESSED_FILES = (
+    frozenset(name.strip() for name in _names.split(",") if name.strip())
+    if _names and not COMPRESS_ALL
+    else DEFAULT_COMPRESSED_FILES
+)
+if COMPRESSION_MODE and COMPRESSED_FILES & NODE_READ_FILES:
+    LOGGER.warning(
+        "STAGE2_COMPRESS_FILES includes %s, which the Node jobs read uncompressed",
+        ", ".join(sorted(COMPRESSED_FILES & NODE_READ_FILES)),
+    )
+
+
+def logical_path(path: Path) -> Path:
+    """Strip a compression suffix: ``x.vtt.gz`` -> ``x.vtt``."""
+
+    if path.suffix in COMPRESSION_SUFFIXES:
+        return path.with_suffix("")
+    return path
+
+
+def _variants(path: Path):
+    yield path
+    for suffix in COMPRESSION_SUFFIXES:
+        yield path.with_name(path.name + suffix)
+
+
+def stored_path(path: Path) -> Optional[Path]:
+    """Return the file actually holding the artifact at logical ``path``."""
+
+    for candidate in _variants(path):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def encode_for_storage(path: Path, data: bytes) -> Tuple[Path, bytes]:
+    """Return the on-disk path and bytes to write for logical ``path``."""
+
+    if (
+        not COMPRESSION_MODE
+        or path.name in NEVER_COMPRESSED_FILES
+        or not (path.name in COMPRESSED_FILES or (COMPRESS_ALL and path.name not in NODE_READ_FILES))
+    ):
+        return path, data
+    if COMPRESSION_MODE == "zstd":
+        return path.with_name(path.name + ".zst"), zstandard.ZstdCompressor(level=3).compress(data)
+    # mtime=0 keeps output deterministic so identical bodies still dedupe.
+    return path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def stale_variants(path: Path, written: Path):
+    """Other encodings of ``path`` that a write to ``written`` supersedes."""
+
+    return [candidate for candidate in _variants(path) if candidate != written]
+
+
+def decode(stored: Path, data: bytes) -> bytes:
+    codec = COMPRESSION_SUFFIXES.get(stored.suffix)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {stored}")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def read_artifact_bytes(path: Path) -> bytes:
+    """Read the artifact at logical ``path`` whichever way it was stored."""
+
+    stored = stored_path(path)
+    if stored is None:
+        raise FileNotFoundError(str(path))
+    return decode(stored, stored.read_bytes())
+
+
+def read_artifact_text(path: Path, encoding: str = "utf-8") -> str:
+    return read_artifact_bytes(path).decode(encoding)
+
+
+def load_artifact_json(path: Path) -> Any:
+    return json.loads(read_artifact_bytes(path))
+
+
+__all__ = [
+    "COMPRESSION_MODE",
+    "COMPRESSION_SUFFIXES",
+    "NODE_READ_FILES",
+    "decode",
+    "encode_for_storage",
+    "load_artifact_json",
+    "logical_path",
+    "read_artifact_bytes",
+    "read_artifact_text",
+    "stale_variants",
+    "stored_path",
+]
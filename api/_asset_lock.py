@@ -0,0 +1,63 @@
+"""Per-asset lock for read-modify-write updates under ``stage2_output``.
+
+``item_meta.json`` and each pass's ``qa_result.json`` are rewritten by
+annotation submits, background QA derivation and adjudication promotes,
+which can run on several threads or processes at once. Each of them holds
+:func:`asset_lock` for the asset directory around its read, merge and
+write, and writes through :func:`write_json_atomic` so a concurrent reader
+never sees a half-written file.
+
+The lock file is a dot-file inside the asset directory, which the blob
+store, exports and migrations already skip.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+LOCK_FILENAME = ".asset.lock"
+
+
+@contextmanager
+def asset_lock(asset_dir: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``asset_dir``.
+
+    ``flock`` locks belong to the open file, so threads of one process
+    exclude each other as well as other processes.
+    """
+
+    asset_dir.mkdir(parents=True, exist_ok=True)
+    fd = os.open(asset_dir / LOCK_FILENAME, os.O_RDWR | os.O_CREAT)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def write_json_atomic(path: Path, payload: Any) -> None:
+    """Write ``payload`` as indented JSON via a sibling temp file and rename."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=str(path.parent), prefix=f".{path.name}.", delete=False
+    ) as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+        temp_name = handle.name
+    os.replace(temp_name, path)
+
+
+__all__ = ["LOCK_FILENAME", "asset_lock", "write_json_atomic"]
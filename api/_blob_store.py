@@ -0,0 +1,159 @@
+"""Content-addressed blob store backing stage2 artifact files.
+
+Each unique file body is stored once under ``<root>/<aa>/<bb>/<sha256>``
+and every per-pass path that holds those bytes is a hardlink to it. Views
+are always replaced with a rename, never rewritten in place, so editing
+one pass cannot change the bytes seen by another. A blob's link count
+doubles as its reference count: a count of 1 means no view points at it
+any more and :meth:`BlobStore.collect_garbage` may delete it.
+
+When the blob root and the view are on different filesystems the view
+falls back to a plain copy.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# Files rewritten in place (``item_meta.json``) must never share an inode.
+NON_BLOB_FILENAMES = frozenset({"item_meta.json"})
+
+
+def is_blob_eligible(path: Path) -> bool:
+    return path.name not in NON_BLOB_FILENAMES and not path.name.startswith(".")
+
+
+class BlobStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store ``data`` if it is new and return its SHA-256 digest."""
+
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.blob_path(digest)
+        if target.exists():
+            return digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=str(target.parent), prefix=".blob.", delete=False) as handle:
+            handle.write(data)
+            temp_name = handle.name
+        os.chmod(temp_name, 0o444)
+        os.replace(temp_name, target)
+        return digest
+
+    def put_file(self, path: Path) -> str:
+        """Store the contents of ``path``, linking instead of copying if possible."""
+
+        digest = sha256_file(path)
+        target = self.blob_path(digest)
+        if target.exists():
+            return digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.parent / f".blob.{os.getpid()}.{digest[:16]}"
+        try:
+            os.link(path, temp)
+        except OSError:
+            shutil.copy2(path, temp)
+        os.chmod(temp, 0o444)
+        os.replace(temp, target)
+        return digest
+
+    def link_view(self, digest: str, path: Path) -> bool:
+        """Atomically point ``path`` at blob ``digest``.
+
+        Returns ``True`` for a hardlink and ``False`` when a copy had to be
+        made instead.
+        """
+
+        source = self.blob_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, reserved = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+        os.close(fd)
+        # os.link cannot overwrite, so the link is made next to the reserved
+        # name, which no other thread or process can also be using.
+        temp = f"{reserved}.link"
+        linked = True
+        try:
+            try:
+                os.link(source, temp)
+            except OSError as exc:
+                if exc.errno not in {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}:
+                    raise
+                shutil.copyfile(source, reserved)
+                temp = reserved
+                linked = False
+            os.replace(temp, path)
+        finally:
+            for leftover in {reserved, temp}:
+                try:
+                    os.unlink(leftover)
+                except FileNotFoundError:
+                    pass
+        return linked
+
+    def write_view(self, path: Path, data: bytes) -> str:
+        digest = self.put_bytes(data)
+        self.link_view(digest, path)
+        return digest
+
+    def is_view(self, path: Path, digest: Optional[str] = None) -> bool:
+        """Return ``True`` if ``path`` already shares an inode with its blob."""
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_nlink < 2:
+            return False
+        digest = digest or sha256_file(path)
+        try:
+            blob = self.blob_path(digest).stat()
+        except OSError:
+            return False
+        return (blob.st_dev, blob.st_ino) == (stat.st_dev, stat.st_ino)
+
+    def iter_blobs(self) -> Iterator[Path]:
+        if not self.root.is_dir():
+            return
+        for path in self.root.glob("??/??/*"):
+            if path.is_file() and not path.name.startswith("."):
+                yield path
+
+    def collect_garbage(self, dry_run: bool = False) -> Dict[str, int]:
+        """Delete blobs no view links to any more."""
+
+        stats = {"blobs": 0, "removed": 0, "bytes_freed": 0}
+        for path in self.iter_blobs():
+            stats["blobs"] += 1
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if stat.st_nlink > 1:
+                continue
+            stats["removed"] += 1
+            stats["bytes_freed"] += stat.st_size
+            if not dry_run:
+                path.unlink(missing_ok=True)
+        return stats
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+__all__ = ["BlobStore", "NON_BLOB_FILENAMES", "is_blob_eligible", "sha256_file"]
@@ -0,0 +1,209 @@
+"""Vectorised alignment of cue and diarization segments between passes.
+
+Cues from a WebVTT transcript or speaker turns from an RTTM file are parsed
+into sorted NumPy ``start``/``end`` arrays. Two passes are paired by a
+sorted sweep: every cue's nearest start on the other side is found with
+``searchsorted`` and mutual nearest neighbours within ``threshold`` seconds
+are kept, giving a one-to-one alignment in O(n log n). Overlap, voice-tag
+agreement and boundary deviation are computed over the whole arrays at once.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+VOICE_TAG_REGEX = re.compile(r"^<v\s+S\d+>", re.IGNORECASE)
+DEFAULT_ALIGNMENT_THRESHOLD_SEC = 0.12
+
+_VTT_TIMESTAMP_REGEX = re.compile(r"(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?")
+
+
+@dataclass
+class CueArrays:
+    """Segments of one pass, sorted by start time."""
+
+    starts: np.ndarray
+    ends: np.ndarray
+    voice_tags: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.starts.size)
+
+
+def _from_rows(rows: list) -> CueArrays:
+    if not rows:
+        return CueArrays(
+            starts=np.empty(0, dtype=np.float64),
+            ends=np.empty(0, dtype=np.float64),
+            voice_tags=np.empty(0, dtype=bool),
+        )
+    data = np.asarray(rows, dtype=np.float64)
+    order = np.lexsort((data[:, 1], data[:, 0]))
+    data = data[order]
+    return CueArrays(starts=data[:, 0], ends=data[:, 1], voice_tags=data[:, 2].astype(bool))
+
+
+def _parse_vtt_timestamp(value: str) -> Optional[float]:
+    match = _VTT_TIMESTAMP_REGEX.search(value or "")
+    if not match:
+        return None
+    hours, minutes, seconds = (int(match.group(i)) for i in (1, 2, 3))
+    fraction = float(f"0.{match.group(4)}") if match.group(4) else 0.0
+    return hours * 3600 + minutes * 60 + seconds + fraction
+
+
+def parse_vtt(content: str) -> CueArrays:
+    """Parse WebVTT cues; ``voice_tags`` marks cues opening with ``<v Sn>``."""
+
+    rows = []
+    for block in re.split(r"\n\n+", (content or "").replace("\r", "")):
+        lines = [line for line in block.split("\n") if line.strip()]
+        time_index = next((i for i, line in enumerate(lines) if "-->" in line), -1)
+        if time_index < 0:
+            continue
+        start_raw, _, end_raw = lines[time_index].partition("-->")
+        start = _parse_vtt_timestamp(start_raw)
+        end = _parse_vtt_timestamp(end_raw)
+        if start is None or end is None:
+            continue
+        text = "\n".join(lines[time_index + 1 :]).strip()
+        rows.append((start, end, 1.0 if VOICE_TAG_REGEX.match(text) else 0.0))
+    return _from_rows(rows)
+
+
+def parse_rttm(content: str) -> CueArrays:
+    """Parse ``SPEAKER`` lines of an RTTM file into segments."""
+
+    rows = []
+    for line in (content or "").splitlines():
+        parts = line.strip().split()
+        if len(parts) < 5 or parts[0].startswith("#") or parts[0].upper() != "SPEAKER":
+            continue
+        try:
+            start = float(parts[3])
+            duration = float(parts[4])
+        except ValueError:
+            continue
+        if not np.isfinite(start) or not np.isfinite(duration) or duration <= 0:
+            continue
+        rows.append((start, start + duration, 1.0))
+    return _from_rows(rows)
+
+
+def _nearest(sorted_values: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Index of the nearest value in ``sorted_values`` for every query."""
+
+    right = np.searchsorted(sorted_values, queries)
+    right = np.clip(right, 0, sorted_values.size - 1)
+    left = np.clip(right - 1, 0, sorted_values.size - 1)
+    pick_left = np.abs(queries - sorted_values[left]) <= np.abs(sorted_values[right] - queries)
+    return np.where(pick_left, left, right)
+
+
+def align_starts(
+    starts_a: np.ndarray,
+    starts_b: np.ndarray,
+    threshold: float = DEFAULT_ALIGNMENT_THRESHOLD_SEC,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return index arrays of cues paired between two sorted start arrays."""
+
+    if starts_a.size == 0 or starts_b.size == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    nearest_b = _nearest(starts_b, starts_a)
+    nearest_a = _nearest(starts_a, starts_b)
+    idx_a = np.arange(starts_a.size)
+    mutual = nearest_a[nearest_b] == idx_a
+    close = np.abs(starts_a - starts_b[nearest_b]) <= threshold
+    keep = mutual & close
+    return idx_a[keep], nearest_b[keep]
+
+
+def _union(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if starts.size == 0:
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    new_group = np.empty(starts.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1]
+    group = np.cumsum(new_group) - 1
+    merged_ends = np.zeros(int(group[-1]) + 1)
+    np.maximum.at(merged_ends, group, ends)
+    return starts[new_group], merged_ends
+
+
+def _overlap(a: CueArrays, b: CueArrays) -> Tuple[float, float]:
+    """Return (seconds covered by both passes, seconds covered by either)."""
+
+    starts_a, ends_a = _union(a.starts, a.ends)
+    starts_b, ends_b = _union(b.starts, b.ends)
+    times = np.concatenate([starts_a, ends_a, starts_b, ends_b])
+    if times.size == 0:
+        return 0.0, 0.0
+    deltas = np.concatenate(
+        [
+            np.ones(starts_a.size),
+            -np.ones(ends_a.size),
+            np.ones(starts_b.size),
+            -np.ones(ends_b.size),
+        ]
+    )
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    coverage = np.cumsum(deltas[order])[:-1]
+    spans = np.diff(times)
+    return float(spans[coverage >= 2].sum()), float(spans[coverage >= 1].sum())
+
+
+def _deviation_stats(values: np.ndarray) -> Dict[str, Optional[float]]:
+    if values.size == 0:
+        return {"mean": None, "median": None, "p95": None, "max": None}
+    return {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
+
+
+def compare_passes(
+    a: CueArrays,
+    b: CueArrays,
+    threshold: float = DEFAULT_ALIGNMENT_THRESHOLD_SEC,
+) -> Dict[str, Any]:
+    """Align two passes and summarise how far they agree."""
+
+    idx_a, idx_b = align_starts(a.starts, b.starts, threshold)
+    tags_a = a.voice_tags[idx_a]
+    tags_b = b.voice_tags[idx_b]
+    disagreements = int(np.count_nonzero(tags_a != tags_b))
+    pairs = int(idx_a.size)
+    both, either = _overlap(a, b)
+    return {
+        "cues_a": len(a),
+        "cues_b": len(b),
+        "pairs": pairs,
+        "unmatched_a": len(a) - pairs,
+        "unmatched_b": len(b) - pairs,
+        "voice_tag_disagreements": disagreements,
+        "voice_tag_agreement": (pairs - disagreements) / pairs if pairs else None,
+        "overlap_seconds": both,
+        "overlap_ratio": both / either if either else None,
+        "start_deviation": _deviation_stats(np.abs(a.starts[idx_a] - b.starts[idx_b])),
+        "end_deviation": _deviation_stats(np.abs(a.ends[idx_a] - b.ends[idx_b])),
+    }
+
+
+__all__ = [
+    "CueArrays",
+    "DEFAULT_ALIGNMENT_THRESHOLD_SEC",
+    "VOICE_TAG_REGEX",
+    "align_starts",
+    "compare_passes",
+    "parse_rttm",
+    "parse_vtt",
+]
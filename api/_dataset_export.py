@@ -0,0 +1,792 @@
+"""Streaming dataset export with per-asset work fanned out to processes.
+
+This is the Python counterpart of the clip pass in
+``scripts/export_dataset.js``. :func:`process_asset` does everything one
+asset needs (QA gating, duration sums, copying and, for public exports,
+redacting its VTTs, voice-tag extraction) and returns the ``dataset.jsonl``
+record; it only touches that asset's directories, so assets run in
+parallel on a :class:`~concurrent.futures.ProcessPoolExecutor`.
+:func:`export_dataset` keeps a bounded number of assets in flight and
+appends their records to ``dataset.jsonl`` in asset-id order as they come
+back, so memory stays flat however large the corpus is.
+
+Progress is checkpointed to ``.export_checkpoint.json`` in the dataset
+folder every ``checkpoint_every`` assets: the last asset written and the
+byte lengths of ``dataset.jsonl`` and ``export_log.txt`` at that point.
+A rerun with the same options truncates both files back to those lengths
+and carries on after that asset. ``qa_summary.json`` is computed from
+``dataset.jsonl`` once every asset is done, then the checkpoint is removed.
+
+The dataset card, coverage and IRR files are still produced by the Node
+script.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import random
+import re
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from api._artifact_io import load_artifact_json, read_artifact_bytes, stored_path
+
+LOGGER = logging.getLogger("dataset_export")
+
+CHECKPOINT_FILENAME = ".export_checkpoint.json"
+CHECKPOINT_VERSION = 1
+REQUIRED_FILES = (
+    "transcript.vtt",
+    "translation.vtt",
+    "code_switch.vtt",
+    "code_switch_spans.json",
+    "diarization.rttm",
+    "speaker_profiles.json",
+    "qa_result.json",
+)
+REQUIRED_METRICS = (
+    "code_switch_f1_at300ms",
+    "diarization_boundary_mae_sec",
+    "cue_delta_sec",
+    "translation_pct_in_bounds",
+)
+REDACTED_FILES = frozenset({"transcript.vtt", "translation.vtt"})
+VIDEO_SUFFIXES = frozenset({".mp4", ".mov", ".mkv", ".webm"})
+SENSITIVE_EVENT_CATEGORIES = (
+    "pii_name",
+    "pii_phone",
+    "pii_email",
+    "pii_address",
+    "minor_face",
+    "political",
+    "religious",
+    "explicit",
+)
+PROVENANCE_FIELDS = (
+    "collection_mode",
+    "license_type",
+    "license_document_id",
+    "processing_location_country",
+    "takedown_supported",
+)
+MIN_PUBLIC_DURATION_SEC = 30 * 60
+MAX_PUBLIC_DURATION_SEC = 60 * 60
+
+_ASSET_ID_RE = re.compile(r"^ea_[A-Za-z0-9_]+$")
+_TIMESTAMP_RE = re.compile(r"(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?")
+_CATEGORIES = "|".join(
+    [re.escape(category) for category in SENSITIVE_EVENT_CATEGORIES]
+    + ["pii_[a-z0-9_]+", "safety_pii_[a-z0-9_]+", "safety_minor_[a-z0-9_]+", "safety_(?:explicit|political|religious)"]
+)
+_REDACTIONS = (
+    (re.compile(rf"(<c[^>]*\b(?:{_CATEGORIES})\b[^>]*>)([\s\S]*?)(</c>)", re.I), r"\1[REDACTED]\3"),
+    (
+        re.compile(rf'(<(?!/)[^>]*\bdata-category\s*=\s*"(?:{_CATEGORIES})"[^>]*>)([\s\S]*?)(</[^>]+>)', re.I),
+        r"\1[REDACTED]\3",
+    ),
+    (re.compile(rf"(NOTE[^\n]*\b(?:{_CATEGORIES})\b[^\n]*:?)\s*([^\n]*)", re.I), r"\1 [REDACTED]"),
+    (re.compile(rf"(\b(?:{_CATEGORIES})\b\s*:\s*)([^\n]+)", re.I), r"\1[REDACTED]"),
+)
+
+
+def is_asset_id(name: str) -> bool:
+    return bool(_ASSET_ID_RE.match(name))
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """``Number(value)`` as the Node exporter sees it; ``None`` for NaN."""
+
+    if value is None or isinstance(value, (list, dict)):
+        return None
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    text = str(value).strip()
+    if not text:
+        return 0.0
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return None if math.isnan(number) else number
+
+
+def _json_number(value: float) -> Any:
+    # JSON.stringify writes integral numbers without a fraction.
+    return int(value) if math.isfinite(value) and value == int(value) else value
+
+
+def parse_vtt_timestamp(value: str) -> float:
+    match = _TIMESTAMP_RE.search(value)
+    if not match:
+        return 0.0
+    hours, minutes, seconds, fraction = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + (float(f"0.{fraction}") if fraction else 0.0)
+
+
+def sum_vtt_durations(content: str) -> float:
+    total = 0.0
+    for line in content.splitlines():
+        if "-->" not in line:
+            continue
+        start_text, end_text = line.split("-->")[:2]
+        start, end = parse_vtt_timestamp(start_text), parse_vtt_timestamp(end_text)
+        if end >= start:
+            total += end - start
+    return total
+
+
+def redact_sensitive_text(content: str) -> str:
+    for pattern, replacement in _REDACTIONS:
+        content = pattern.sub(replacement, content)
+    return content
+
+
+def normalize_voice_tag(value: Any) -> Optional[str]:
+    raw = str(value or "").strip()
+    if not raw:
+        return None
+    if re.fullmatch(r"S\d+", raw, re.I):
+        return raw.upper()
+    match = re.fullmatch(r"SPK(\d+)", raw, re.I) or re.fullmatch(r"(\d+)", raw)
+    if match and int(match.group(1)) > 0:
+        return f"S{int(match.group(1))}"
+    if re.fullmatch(r"[A-Za-z]", raw):
+        return f"S{ord(raw.upper()) - 64}"
+    return raw
+
+
+def parse_vtt_cues(content: str) -> List[Dict[str, Any]]:
+    cues = []
+    for block in re.split(r"\n\n+", content.replace("\r", "")):
+        lines = [line for line in block.split("\n") if line.strip()]
+        index = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if index is None:
+            continue
+        start_text, end_text = lines[index].split("-->")[:2]
+        cues.append(
+            {
+                "start": parse_vtt_timestamp(start_text),
+                "end": parse_vtt_timestamp(end_text),
+                "text": "\n".join(lines[index + 1 :]),
+            }
+        )
+    return cues
+
+
+def extract_voice_tags(content: str) -> List[Dict[str, Any]]:
+    tags = []
+    for cue in parse_vtt_cues(content):
+        text = cue["text"].strip()
+        match = re.match(r"<v\s+([^>]+)>", text, re.I)
+        if not match:
+            continue
+        speaker = normalize_voice_tag(match.group(1))
+        if not speaker:
+            continue
+        tags.append(
+            {
+                "speaker": speaker,
+                "start": _json_number(round(cue["start"], 3)),
+                "end": _json_number(round(cue["end"], 3)),
+                "text": text[match.end() :].strip(),
+            }
+        )
+    return tags
+
+
+def parse_split_ratios(value: str) -> List[float]:
+    ratios = []
+    for part in value.split(","):
+        number = _to_number(part)
+        if number is not None and number >= 0:
+            ratios.append(number)
+    if not ratios or all(number == 0 for number in ratios):
+        raise ValueError("Invalid split ratio configuration.")
+    return ratios
+
+
+def split_labels(length: int) -> List[str]:
+    base = ("train", "validation", "test")
+    return [base[i] if i < len(base) else f"split{i + 1}" for i in range(length)]
+
+
+def hash_to_split(asset_id: str, ratios: List[float], labels: List[str]) -> str:
+    normalized = int(hashlib.md5(asset_id.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    total = sum(ratios)
+    cumulative = 0.0
+    for i, ratio in enumerate(ratios):
+        cumulative += ratio / total
+        if normalized <= cumulative or i == len(ratios) - 1:
+            return labels[i] if i < len(labels) else f"split{i + 1}"
+    return labels[0] if labels else "train"
+
+
+def _read_text(path: Path) -> str:
+    return read_artifact_bytes(path).decode("utf-8")
+
+
+def _load_json(path: Path) -> Any:
+    try:
+        return load_artifact_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _review_status(meta: Dict[str, Any], using_merged: bool) -> Optional[str]:
+    adjudication = meta.get("adjudication")
+    if isinstance(adjudication, dict) and isinstance(adjudication.get("status"), str):
+        return adjudication["status"].lower()
+    for key in ("review_status", "reviewStatus"):
+        if isinstance(meta.get(key), str):
+            return meta[key].lower()
+    return "locked" if using_merged else None
+
+
+def _copy_artifact(source: Path, dest: Path) -> None:
+    stored = stored_path(source)
+    if stored == source:
+        shutil.copyfile(source, dest)
+    else:
+        # Compressed in the output tree; ship the plain file.
+        dest.write_bytes(read_artifact_bytes(source))
+
+
+def _first_video(directory: Path) -> Optional[Path]:
+    for child in sorted(directory.iterdir()):
+        if child.is_file() and child.suffix.lower() in VIDEO_SUFFIXES:
+            return child
+    return None
+
+
+def process_asset(asset_id: str, options: Dict[str, Any], extras: Dict[str, Any], write: bool = True) -> Dict[str, Any]:
+    """Gate one asset and, with ``write``, copy its files and build its record.
+
+    Returns ``{"asset_id", "log", "duration", "record"}``; ``record`` is
+    ``None`` when the asset was skipped or ``write`` is false. ``extras``
+    carries this asset's ``rights`` list and ``provenance`` entry.
+    """
+
+    result: Dict[str, Any] = {"asset_id": asset_id, "log": [], "duration": 0.0, "record": None}
+
+    def skip(reason: str) -> Dict[str, Any]:
+        result["log"].append(f"SKIPPED {asset_id} reason={reason}")
+        result["skipped"] = True
+        return result
+
+    asset_dir = Path(options["source"]) / asset_id
+    merged_dir = asset_dir / "merged"
+    using_merged = merged_dir.exists()
+    clip_source = merged_dir if using_merged else asset_dir
+    meta = _load_json(asset_dir / "item_meta.json")
+    review_status = _review_status(meta if isinstance(meta, dict) else {}, using_merged)
+
+    qa_path = clip_source / "qa_result.json"
+    if stored_path(qa_path) is None:
+        return skip("missing_qa_result")
+    qa = _load_json(qa_path)
+    if not isinstance(qa, dict):
+        return skip("invalid_qa_json")
+    metrics = {name: _to_number(qa.get(name)) for name in REQUIRED_METRICS}
+    if any(value is None for value in metrics.values()):
+        return skip("missing_metrics")
+    gold_target = bool(
+        qa.get("goldTarget") or qa.get("gold_target") or qa.get("isGold") or qa.get("gold") is True or qa.get("target") == "gold"
+    )
+    if not options["include_gold"] and gold_target:
+        return skip("gold_target_excluded")
+    f1 = metrics["code_switch_f1_at300ms"]
+    if f1 < options["min_f1"]:
+        return skip(f"f1_below_threshold value={f1:.4f}")
+    if stored_path(clip_source / "transcript.vtt") is None:
+        return skip("missing_transcript_vtt")
+    missing = next((name for name in REQUIRED_FILES if stored_path(clip_source / name) is None), None)
+    if missing:
+        return skip(f"missing_file file={missing}")
+
+    transcript = _read_text(clip_source / "transcript.vtt")
+    duration = sum_vtt_durations(transcript)
+    result["duration"] = duration
+    if not write:
+        return result
+
+    public = options["public"]
+    dataset_root = Path(options["dataset_root"])
+    dest_dir = dataset_root / "clips" / asset_id
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    files: Dict[str, str] = {}
+    for name in REQUIRED_FILES:
+        if public and name in REDACTED_FILES:
+            redacted = redact_sensitive_text(_read_text(clip_source / name))
+            (dest_dir / name).write_text(redacted, encoding="utf-8")
+            if name == "transcript.vtt":
+                transcript = redacted
+        else:
+            _copy_artifact(clip_source / name, dest_dir / name)
+        files[name] = f"clips/{asset_id}/{name}"
+    video = _first_video(clip_source)
+    if video is not None:
+        shutil.copyfile(video, dest_dir / video.name)
+        files[video.name] = f"clips/{asset_id}/{video.name}"
+
+    split = hash_to_split(asset_id, options["split_ratios"], options["split_labels"])
+    record: Dict[str, Any] = {
+        "asset_id": asset_id,
+        "split": split,
+        "summary": {"total_duration_sec": _json_number(duration)},
+        "qa": {name: _json_number(value) for name, value in metrics.items()},
+        "voice_tags": extract_voice_tags(transcript),
+        "files": files,
+        "rights": list(extras.get("rights") or []),
+    }
+    if review_status:
+        record["review_status"] = review_status
+    provenance = extras.get("provenance") or {}
+    for field in PROVENANCE_FIELDS:
+        record[field] = provenance.get(field)
+    if public:
+        record["blurred"] = True
+    result["record"] = record
+    label = "PUBLIC_EXPORTED" if public else "INCLUDED"
+    result["log"].append(f"{label} {asset_id} split={split} duration_sec={duration:.3f}")
+    return result
+
+
+def _process_task(task: Tuple[str, Dict[str, Any], Dict[str, Any], bool]) -> Dict[str, Any]:
+    return process_asset(*task)
+
+
+def _ordered_results(executor: Executor, tasks: Iterable[Tuple], lookahead: int) -> Iterator[Dict[str, Any]]:
+    pending: Deque = deque()
+    for task in tasks:
+        pending.append(executor.submit(_process_task, task))
+        while len(pending) >= max(1, lookahead):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def sample_public_subset(
+    clips: List[Dict[str, Any]], min_sec: float, max_sec: float, rng: random.Random
+) -> List[Dict[str, Any]]:
+    shuffled = list(clips)
+    rng.shuffle(shuffled)
+    selected: List[Dict[str, Any]] = []
+    total = 0.0
+    for clip in shuffled:
+        projected = total + clip["duration"]
+        if total >= min_sec and projected > max_sec:
+            continue
+        selected.append(clip)
+        total = projected
+        if min_sec <= total <= max_sec:
+            break
+    if total < min_sec:
+        for clip in shuffled:
+            if clip in selected:
+                continue
+            selected.append(clip)
+            total += clip["duration"]
+            if total >= min_sec:
+                break
+    return selected or shuffled
+
+
+def _normalize_rights(value: Any) -> List[str]:
+    if isinstance(value, list):
+        items = [str(item).strip() for item in value]
+    elif isinstance(value, str):
+        text = value.strip()
+        if text.startswith("[") and text.endswith("]") or text.startswith("{"):
+            try:
+                return _normalize_rights(json.loads(text))
+            except ValueError:
+                pass
+        items = [item.strip() for item in re.split(r"[;|,]", text)]
+    elif value is None:
+        return []
+    else:
+        items = [str(value).strip()]
+    return list(dict.fromkeys(item for item in items if item))
+
+
+def _csv_rows(path: Path) -> List[Dict[str, str]]:
+    reader = csv.DictReader(io.StringIO(path.read_text(encoding="utf-8")))
+    return [{(key or "").strip().lower(): value for key, value in row.items()} for row in reader]
+
+
+def _pick(row: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if row.get(key) is not None:
+            return row[key]
+    return None
+
+
+def load_rights(path: Path) -> Dict[str, List[str]]:
+    """Load ``asset_id -> [rights]`` from a JSON or CSV file."""
+
+    if path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, list):
+            return {
+                str(asset_id): _normalize_rights(entry.get("rights") or entry.get("licenses") or [])
+                for entry in data
+                if isinstance(entry, dict)
+                for asset_id in [_pick(entry, "asset_id", "assetId", "id")]
+                if asset_id
+            }
+        return {str(key): _normalize_rights(value) for key, value in (data or {}).items()}
+    if path.suffix.lower() == ".csv":
+        rows = _csv_rows(path)
+        if rows and ("rights" not in rows[0] and "licenses" not in rows[0]):
+            raise ValueError("Rights CSV must include asset_id and rights columns.")
+        mapping = {}
+        for row in rows:
+            asset_id = (_pick(row, "asset_id", "assetid", "id") or "").strip()
+            if asset_id:
+                mapping[asset_id] = _normalize_rights(_pick(row, "rights", "licenses"))
+        return mapping
+    raise ValueError("Unsupported rights metadata format. Use CSV or JSON.")
+
+
+def _provenance_string(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    text = str(value).strip()
+    return text or None
+
+
+def _takedown(value: Any) -> Any:
+    if isinstance(value, str):
+        text = value.strip()
+        if text.lower() in {"true", "yes", "y", "1", "supported"}:
+            return True
+        if text.lower() in {"false", "no", "n", "0", "unsupported", "not supported"}:
+            return False
+        return text or None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value in (0, 1):
+        return bool(value)
+    return value
+
+
+def normalize_provenance(raw: Dict[str, Any]) -> Dict[str, Any]:
+    source = raw.get("provenance") if isinstance(raw.get("provenance"), dict) else raw
+    document = _provenance_string(
+        _pick(source, "license_document_id", "licenseDocumentId", "license_document", "licenseDocId", "license_documentid")
+    )
+    return {
+        "collection_mode": _provenance_string(_pick(source, "collection_mode", "collectionMode", "collection-mode")),
+        "license_type": _provenance_string(_pick(source, "license_type", "licenseType", "license-type")),
+        "license_document_id": document
+        if document is not None
+        else _provenance_string(_pick(source, "consent_ref", "consentRef", "consent_reference")),
+        "processing_location_country": _provenance_string(
+            _pick(
+                source,
+                "processing_location_country",
+                "processing_location",
+                "processing_country",
+                "processingLocationCountry",
+                "processingLocation",
+            )
+        ),
+        "takedown_supported": _takedown(
+            _pick(source, "takedown_supported", "takedownSupported", "takedown_support", "takedown", "takedownSupport")
+        ),
+    }
+
+
+def load_provenance(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load ``clip_id -> provenance fields`` from a JSON or CSV ledger."""
+
+    if path.suffix.lower() == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, list):
+            entries = [
+                (_pick(entry, "clip_id", "clipId", "asset_id", "assetId", "id"), entry)
+                for entry in data
+                if isinstance(entry, dict)
+            ]
+        elif isinstance(data, dict):
+            entries = list(data.items())
+        else:
+            raise ValueError("Provenance JSON must be an object or array.")
+    elif path.suffix.lower() == ".csv":
+        rows = _csv_rows(path)
+        if rows and not any(key in rows[0] for key in ("clip_id", "clipid", "asset_id", "assetid", "id")):
+            raise ValueError("Provenance CSV must include a clip_id column.")
+        entries = [(_pick(row, "clip_id", "clipid", "asset_id", "assetid", "id"), row) for row in rows]
+    else:
+        raise ValueError("Unsupported provenance ledger format. Use CSV or JSON.")
+    return {
+        str(clip_id).strip(): normalize_provenance(record if isinstance(record, dict) else {})
+        for clip_id, record in entries
+        if clip_id and str(clip_id).strip()
+    }
+
+
+def _write_json(path: Path, payload: Dict[str, Any], indent: Optional[int] = 2) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=str(path.parent), prefix=f".{path.name}.", delete=False
+    ) as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=indent)
+        temp_name = handle.name
+    os.replace(temp_name, path)
+
+
+class _Stat:
+    """Running mean and sample standard deviation (Welford)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0
+
+
+def summarize_dataset(path: Path) -> Dict[str, Any]:
+    """Read ``dataset.jsonl`` back line by line into the export summaries."""
+
+    stats = {name: _Stat() for name in REQUIRED_METRICS}
+    splits: Dict[str, int] = {}
+    rights: Dict[str, int] = {}
+    count = 0
+    duration = 0.0
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            count += 1
+            duration += float(record["summary"]["total_duration_sec"])
+            for name, stat in stats.items():
+                stat.add(float(record["qa"][name]))
+            splits[record["split"]] = splits.get(record["split"], 0) + 1
+            for right in record.get("rights") or []:
+                rights[right] = rights.get(right, 0) + 1
+    f1, mae = stats["code_switch_f1_at300ms"], stats["diarization_boundary_mae_sec"]
+    cue, pct = stats["cue_delta_sec"], stats["translation_pct_in_bounds"]
+    qa_summary = {
+        "count": count,
+        "mean_f1": f1.mean,
+        "std_f1": f1.std,
+        "mean_mae": mae.mean,
+        "std_mae": mae.std,
+        "mean_translation_pct_in_bounds": pct.mean,
+        "std_translation_pct_in_bounds": pct.std,
+        "mean_cue_delta_sec": cue.mean,
+        "std_cue_delta_sec": cue.std,
+    }
+    return {"qa_summary": qa_summary, "total_duration_sec": duration, "splits": splits, "rights": rights}
+
+
+def _fingerprint(options: Dict[str, Any]) -> str:
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _reopen(path: Path, length: int):
+    """Open ``path`` for writing at ``length``, dropping anything after it."""
+
+    handle = path.open("r+b" if path.exists() else "w+b")
+    handle.truncate(length)
+    handle.seek(length)
+    return handle
+
+
+def export_dataset(
+    source: Path,
+    out: Path,
+    version: str,
+    *,
+    min_f1: float = 0.80,
+    include_gold: bool = True,
+    split_ratio: str = "0.8,0.1,0.1",
+    public: bool = False,
+    rights: Optional[Dict[str, List[str]]] = None,
+    provenance: Optional[Dict[str, Dict[str, Any]]] = None,
+    workers: Optional[int] = None,
+    checkpoint_every: int = 50,
+    resume: bool = True,
+) -> Dict[str, Any]:
+    """Export ``source`` into ``out/<version>[-public]`` and return counts."""
+
+    ratios = parse_split_ratios(split_ratio)
+    dataset_root = (out / (f"{version}-public" if public else version)).resolve()
+    (dataset_root / "clips").mkdir(parents=True, exist_ok=True)
+    options = {
+        "source": str(source.resolve()),
+        "dataset_root": str(dataset_root),
+        "min_f1": min_f1,
+        "include_gold": include_gold,
+        "split_ratios": ratios,
+        "split_labels": split_labels(len(ratios)),
+        "public": public,
+    }
+    rights = rights or {}
+    provenance = provenance or {}
+    fingerprint = _fingerprint(
+        {**options, "rights": _fingerprint(rights), "provenance": _fingerprint(provenance)}
+    )
+    checkpoint_path = dataset_root / CHECKPOINT_FILENAME
+    jsonl_path = dataset_root / "dataset.jsonl"
+    log_path = dataset_root / "export_log.txt"
+
+    checkpoint: Dict[str, Any] = {}
+    if resume and checkpoint_path.exists():
+        try:
+            checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            checkpoint = {}
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("fingerprint") != fingerprint:
+            LOGGER.warning("Ignoring checkpoint in %s: written with different options", dataset_root)
+            checkpoint = {}
+        elif _size(jsonl_path) < int(checkpoint.get("dataset_bytes") or 0) or _size(log_path) < int(
+            checkpoint.get("log_bytes") or 0
+        ):
+            LOGGER.warning("Ignoring checkpoint in %s: output files are shorter than recorded", dataset_root)
+            checkpoint = {}
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": fingerprint,
+        "last_asset_id": None,
+        "dataset_bytes": 0,
+        "log_bytes": 0,
+        **checkpoint,
+    }
+    resumed_after = checkpoint["last_asset_id"]
+
+    def extras(asset_id: str) -> Dict[str, Any]:
+        return {"rights": rights.get(asset_id, []), "provenance": provenance.get(asset_id, {})}
+
+    asset_ids: List[str] = []
+    if source.is_dir():
+        asset_ids = sorted(path.name for path in source.iterdir() if path.is_dir() and is_asset_id(path.name))
+    workers = max(1, workers or os.cpu_count() or 1)
+    processed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, _reopen(
+        jsonl_path, checkpoint["dataset_bytes"]
+    ) as dataset, _reopen(log_path, checkpoint["log_bytes"]) as log:
+
+        def write_log(lines: Iterable[str]) -> None:
+            for line in lines:
+                log.write(f"{line}\n".encode("utf-8"))
+
+        def save_checkpoint() -> None:
+            for handle in (dataset, log):
+                handle.flush()
+                os.fsync(handle.fileno())
+            checkpoint["dataset_bytes"] = dataset.tell()
+            checkpoint["log_bytes"] = log.tell()
+            _write_json(checkpoint_path, checkpoint, indent=None)
+
+        if public and checkpoint.get("selected") is None:
+            # The subset depends on every clip's duration, so gate the whole
+            # corpus first; only the selected clips are copied and redacted.
+            candidates = []
+            scan = ((asset_id, options, {}, False) for asset_id in asset_ids)
+            for result in _ordered_results(executor, scan, workers * 4):
+                write_log(result["log"])
+                if not result.get("skipped"):
+                    candidates.append(result)
+            selected = sample_public_subset(
+                candidates, MIN_PUBLIC_DURATION_SEC, MAX_PUBLIC_DURATION_SEC, random.Random(version)
+            )
+            selected_ids = {clip["asset_id"] for clip in selected}
+            for clip in candidates:
+                if clip["asset_id"] in selected_ids:
+                    write_log([f"PUBLIC_SELECTED {clip['asset_id']} duration_sec={clip['duration']:.3f}"])
+                else:
+                    write_log([f"PUBLIC_NOT_SELECTED {clip['asset_id']}"])
+            selected_sec = sum(clip["duration"] for clip in selected)
+            if selected_sec < MIN_PUBLIC_DURATION_SEC:
+                write_log([f"PUBLIC_WARNING insufficient_duration selected_sec={selected_sec:.3f}"])
+            elif selected_sec > MAX_PUBLIC_DURATION_SEC:
+                write_log([f"PUBLIC_WARNING duration_above_max selected_sec={selected_sec:.3f}"])
+            checkpoint["selected"] = sorted(selected_ids)
+            save_checkpoint()
+        if public:
+            asset_ids = checkpoint["selected"]
+
+        remaining = [asset_id for asset_id in asset_ids if resumed_after is None or asset_id > resumed_after]
+        tasks = ((asset_id, options, extras(asset_id), True) for asset_id in remaining)
+        for result in _ordered_results(executor, tasks, workers * 4):
+            write_log(result["log"])
+            if result["record"] is not None:
+                line = json.dumps(result["record"], ensure_ascii=False, separators=(",", ":"))
+                dataset.write(f"{line}\n".encode("utf-8"))
+            checkpoint["last_asset_id"] = result["asset_id"]
+            processed += 1
+            if processed % max(1, checkpoint_every) == 0:
+                save_checkpoint()
+        save_checkpoint()
+
+    summary = summarize_dataset(jsonl_path)
+    _write_json(dataset_root / "qa_summary.json", summary["qa_summary"])
+    if public:
+        _write_json(
+            dataset_root / "public_eval_summary.json",
+            {
+                "clip_count": summary["qa_summary"]["count"],
+                "total_minutes": round(summary["total_duration_sec"] / 60, 2),
+                "rights_distribution": summary["rights"],
+                "duration_bounds_minutes": {
+                    "min": MIN_PUBLIC_DURATION_SEC // 60,
+                    "max": MAX_PUBLIC_DURATION_SEC // 60,
+                },
+            },
+        )
+    checkpoint_path.unlink()
+    return {
+        "dataset_root": str(dataset_root),
+        "records": summary["qa_summary"]["count"],
+        "processed": processed,
+        "resumed_after": resumed_after,
+        "splits": summary["splits"],
+        "total_duration_sec": summary["total_duration_sec"],
+    }
+
+
+__all__ = [
+    "REQUIRED_FILES",
+    "export_dataset",
+    "extract_voice_tags",
+    "hash_to_split",
+    "is_asset_id",
+    "load_provenance",
+    "load_rights",
+    "process_asset",
+    "redact_sensitive_text",
+    "sum_vtt_durations",
+    "summarize_dataset",
+]
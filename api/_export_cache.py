@@ -0,0 +1,127 @@
+"""Size-bounded on-disk cache of finished export archives.
+
+Archives are keyed by the annotation row they were built from: its row id
+plus a SHA-256 of its canonical JSON, so a new submission (a new row) or an
+edited row never hits an old archive. The key doubles as the export's ETag.
+Files live under ``<dir>/<asset hash>/<key>.zip`` so every archive for an
+asset can be dropped at once when a new annotation for it arrives. Total
+size is kept under ``max_bytes`` by evicting the least recently served
+archives; hits bump the file's mtime.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# Bump when the archive layout changes so cached archives are not reused.
+FORMAT_VERSION = 1
+
+
+def _asset_dirname(asset_id: str) -> str:
+    return hashlib.sha256(str(asset_id).encode("utf-8")).hexdigest()[:32]
+
+
+class ExportCache:
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(row_id: Any, data: Any, variant: str = "") -> str:
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        content = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        material = f"{FORMAT_VERSION}\0{variant}\0{row_id}\0{content}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def path(self, asset_id: str, key: str) -> Path:
+        return self.directory / _asset_dirname(asset_id) / f"{key}.zip"
+
+    def get(self, asset_id: str, key: str) -> Optional[Path]:
+        """Return the cached archive for ``key`` and mark it recently used."""
+
+        if not self.enabled:
+            return None
+        path = self.path(asset_id, key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def store(self, asset_id: str, key: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass ``chunks`` through, keeping a copy once all were consumed.
+
+        A client that disconnects part way leaves nothing behind.
+        """
+
+        if not self.enabled:
+            yield from chunks
+            return
+        target = self.path(asset_id, key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile("wb", dir=str(target.parent), prefix=".export.", delete=False)
+        complete = False
+        try:
+            with handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if complete:
+                os.replace(handle.name, target)
+            else:
+                try:
+                    os.unlink(handle.name)
+                except OSError:
+                    pass
+        self.evict()
+
+    def invalidate(self, asset_id: str) -> None:
+        """Drop every cached archive for ``asset_id``."""
+
+        shutil.rmtree(self.directory / _asset_dirname(asset_id), ignore_errors=True)
+
+    def evict(self) -> int:
+        """Delete least recently used archives until the cache fits."""
+
+        if not self._evict_lock.acquire(blocking=False):
+            return 0
+        try:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*/*.zip"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            removed = 0
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
+        finally:
+            self._evict_lock.release()
+
+
+__all__ = ["ExportCache"]
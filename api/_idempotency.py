@@ -0,0 +1,185 @@
+"""Bounded, expiring store of results for idempotent submissions.
+
+A request is identified either by a client supplied ``Idempotency-Key`` or,
+failing that, by a SHA-256 of its canonical JSON body. Both are scoped (by
+endpoint and annotator) before hashing, so keys from different clients do
+not collide. Results are kept in an in-process LRU and mirrored to one
+small JSON file per key so other workers and restarts see them too. Entries
+expire after ``ttl_seconds`` and the store is trimmed to ``max_entries``.
+
+Trimming walks the whole directory, so it runs on a background thread and
+at most once per ``prune_interval_seconds`` across all workers sharing the
+directory; a marker file records when it last ran.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+PRUNE_MARKER = ".last_prune"
+
+
+def request_key(scope: str, client_key: Optional[str], body: Any) -> str:
+    """Return the store key for a request."""
+
+    if client_key and client_key.strip():
+        material = f"key\0{scope}\0{client_key.strip()}"
+    else:
+        canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        material = f"body\0{scope}\0{canonical}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        directory: Path,
+        ttl_seconds: int = 86400,
+        max_entries: int = 10000,
+        prune_interval_seconds: float = 300.0,
+    ) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.prune_interval_seconds = prune_interval_seconds
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, list] = {}
+        self._next_prune = 0.0
+        self._prune_thread: Optional[threading.Thread] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - float(entry.get("created_at") or 0) < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result for ``key`` if it has not expired."""
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry):
+                    self._memory.move_to_end(key)
+                    return entry["result"]
+                del self._memory[key]
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not self._fresh(entry):
+            return None
+        self._remember(key, entry)
+        return entry.get("result")
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        entry = {"created_at": time.time(), "result": result}
+        self._remember(key, entry)
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=str(path.parent), prefix=".key.", delete=False
+            ) as handle:
+                json.dump(entry, handle, ensure_ascii=False)
+                temp_name = handle.name
+            os.replace(temp_name, path)
+        except OSError:
+            # The in-memory entry still deduplicates retries to this worker.
+            return
+        now = time.time()
+        with self._lock:
+            due = now >= self._next_prune
+            if due:
+                self._next_prune = now + self.prune_interval_seconds
+                self._prune_thread = threading.Thread(
+                    target=self._prune_if_due, name="idempotency-prune", daemon=True
+                )
+        if due:
+            self._prune_thread.start()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @contextmanager
+    def claim(self, key: str) -> Iterator[Optional[Dict[str, Any]]]:
+        """Serialise concurrent requests for ``key`` within this process.
+
+        Yields the stored result if one exists; otherwise the caller does
+        the work and calls :meth:`put` before leaving the block, so a
+        concurrent duplicate waiting on the same key sees its result.
+        """
+
+        with self._lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield self.get(key)
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    self._key_locks.pop(key, None)
+
+    def _prune_if_due(self) -> None:
+        """Prune unless another worker did so within the interval."""
+
+        marker = self.directory / PRUNE_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < self.prune_interval_seconds:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        try:
+            marker.touch()
+        except OSError:
+            return
+        self.prune()
+
+    def prune(self) -> int:
+        """Delete expired key files and the oldest beyond ``max_entries``."""
+
+        entries = []
+        now = time.time()
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime >= self.ttl_seconds:
+                removed += self._unlink(path)
+            else:
+                entries.append((mtime, path))
+        entries.sort()
+        for _mtime, path in entries[: max(0, len(entries) - self.max_entries)]:
+            removed += self._unlink(path)
+        return removed
+
+    @staticmethod
+    def _unlink(path: Path) -> int:
+        try:
+            path.unlink()
+        except OSError:
+            return 0
+        return 1
+
+
+__all__ = ["IdempotencyStore", "request_key"]
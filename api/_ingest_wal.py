@@ -0,0 +1,303 @@
+"""Durable write-ahead log for ingestion endpoints.
+
+Requests are appended to ``<dir>/ingest.wal.jsonl`` (one JSON object per
+line, fsynced) and acknowledged before any slow work runs. A background
+flusher hands the pending entries to one or more named *sinks* in batches.
+Each sink has its own committed offset in ``ingest.wal.checkpoint.json``,
+so a slow or failing sink (e.g. Supabase) does not hold back the others
+(e.g. writing artifacts to disk). Delivery is at-least-once: a crash
+between a sink finishing a batch and its offset being saved replays that
+batch on restart. A sink that handled only the start of a batch reports
+how much through :class:`WALRetryableError` and is retried from there.
+
+Once every sink has caught up the log is swapped for an empty file. The
+checkpoint records the log's inode, so offsets saved against an older log
+are discarded rather than applied to the new one.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+LOGGER = logging.getLogger("ingest_wal")
+
+WAL_FILENAME = "ingest.wal.jsonl"
+CHECKPOINT_FILENAME = "ingest.wal.checkpoint.json"
+RETRY_BACKOFF_MAX_SECONDS = 60.0
+
+Sink = Callable[[List[Dict[str, Any]]], None]
+
+
+class WALRetryableError(Exception):
+    """Raised by a sink when the batch should be retried later.
+
+    ``delivered`` is how many leading entries of the batch the sink did
+    handle; the sink's offset moves past them so only the rest is retried.
+    """
+
+    def __init__(self, message: str = "", delivered: int = 0) -> None:
+        super().__init__(message)
+        self.delivered = max(0, delivered)
+
+
+@contextmanager
+def _flock(path: Path, blocking: bool = True) -> Iterator[bool]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+") as handle:
+        flags = fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(handle.fileno(), flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class IngestWAL:
+    def __init__(
+        self,
+        directory: Path,
+        sinks: Dict[str, Sink],
+        batch_size: int = 100,
+        flush_interval: float = 0.25,
+    ) -> None:
+        self.directory = directory
+        self.path = directory / WAL_FILENAME
+        self.checkpoint_path = directory / CHECKPOINT_FILENAME
+        self.sinks = sinks
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._retry_at: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._last_error: Dict[str, Optional[str]] = {}
+        self._last_flush_at: Optional[str] = None
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> str:
+        """Durably log ``record`` and return its WAL id."""
+
+        entry_id = uuid.uuid4().hex
+        entry = {"id": entry_id, "logged_at": _now_iso(), "record": record}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with _flock(self.path.with_suffix(".lock")):
+            with self.path.open("ab") as handle:
+                # A crash can leave a torn final line; terminate it so this
+                # entry starts on its own line (the fragment is skipped on read).
+                if handle.tell() > 0 and self._last_byte() != b"\n":
+                    line = b"\n" + line
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+        self.start()
+        self._wake.set()
+        return entry_id
+
+    def _last_byte(self) -> bytes:
+        with self.path.open("rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1)
+
+    # -- checkpoint --------------------------------------------------------
+
+    def _inode(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_ino
+        except FileNotFoundError:
+            return None
+
+    def _load_offsets(self) -> Dict[str, int]:
+        try:
+            data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            data = {}
+        offsets = data.get("offsets") if isinstance(data, dict) else None
+        if not isinstance(offsets, dict) or data.get("inode") != self._inode():
+            offsets = {}
+        return {name: int(offsets.get(name) or 0) for name in self.sinks}
+
+    def _save_offsets(self, offsets: Dict[str, int]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"inode": self._inode(), "offsets": offsets, "updated_at": _now_iso()})
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=str(self.directory), prefix=".checkpoint.", delete=False
+        ) as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+            temp_name = handle.name
+        os.replace(temp_name, self.checkpoint_path)
+
+    # -- reading -----------------------------------------------------------
+
+    def _read_from(
+        self, offset: int, limit: Optional[int], ends: Optional[List[int]] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return up to ``limit`` entries after ``offset`` and the new offset.
+
+        When ``ends`` is given, the offset just past each returned entry is
+        appended to it.
+        """
+
+        entries: List[Dict[str, Any]] = []
+        try:
+            handle = self.path.open("rb")
+        except FileNotFoundError:
+            return entries, offset
+        with handle:
+            handle.seek(offset)
+            while limit is None or len(entries) < limit:
+                line = handle.readline()
+                if not line or not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and isinstance(entry.get("record"), dict):
+                    entries.append(entry)
+                    if ends is not None:
+                        ends.append(offset)
+        return entries, offset
+
+    # -- flushing ----------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="ingest-wal-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                while self.flush_once():
+                    pass
+            except Exception:  # pragma: no cover - keep the flusher alive
+                LOGGER.exception("Ingest WAL flush failed")
+
+    def flush_once(self) -> bool:
+        """Deliver one batch per sink; return ``True`` if more may be pending.
+
+        Only one process flushes a directory at a time; others return
+        immediately and leave the work to the lock holder.
+        """
+
+        with _flock(self.directory / "flusher.lock", blocking=False) as acquired:
+            if not acquired:
+                return False
+            offsets = self._load_offsets()
+            progressed = False
+            for name, sink in self.sinks.items():
+                if time.monotonic() < self._retry_at.get(name, 0.0):
+                    continue
+                ends: List[int] = []
+                entries, new_offset = self._read_from(offsets[name], self.batch_size, ends)
+                if new_offset == offsets[name]:
+                    continue
+                try:
+                    if entries:
+                        sink(entries)
+                except Exception as exc:
+                    delivered = min(getattr(exc, "delivered", 0), len(ends))
+                    if isinstance(exc, WALRetryableError) and delivered:
+                        offsets[name] = ends[delivered - 1]
+                        self._save_offsets(offsets)
+                        progressed = True
+                    failures = self._failures.get(name, 0) + 1
+                    self._failures[name] = failures
+                    self._last_error[name] = repr(exc)
+                    self._retry_at[name] = time.monotonic() + min(
+                        RETRY_BACKOFF_MAX_SECONDS, self.flush_interval * (2**failures)
+                    )
+                    if not isinstance(exc, WALRetryableError):
+                        LOGGER.exception("Ingest WAL sink %s failed", name)
+                    continue
+                self._failures.pop(name, None)
+                self._retry_at.pop(name, None)
+                self._last_error[name] = None
+                offsets[name] = new_offset
+                self._save_offsets(offsets)
+                progressed = True
+            if progressed:
+                self._last_flush_at = _now_iso()
+            self._maybe_rotate(offsets)
+            return progressed
+
+    def _maybe_rotate(self, offsets: Dict[str, int]) -> None:
+        with _flock(self.path.with_suffix(".lock")):
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return
+            if size == 0 or any(offset < size for offset in offsets.values()):
+                return
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=str(self.directory), prefix=".wal.", delete=False
+            ) as handle:
+                temp_name = handle.name
+            os.replace(temp_name, self.path)
+            self._save_offsets({name: 0 for name in self.sinks})
+
+    # -- metrics -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        offsets = self._load_offsets()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        sinks: Dict[str, Any] = {}
+        oldest: Optional[str] = None
+        for name, offset in offsets.items():
+            pending, _ = self._read_from(offset, None)
+            if pending and (oldest is None or pending[0]["logged_at"] < oldest):
+                oldest = pending[0]["logged_at"]
+            sinks[name] = {
+                "depth": len(pending),
+                "pending_bytes": max(0, size - offset),
+                "consecutive_failures": self._failures.get(name, 0),
+                "last_error": self._last_error.get(name),
+            }
+        lag = None
+        if oldest:
+            logged = datetime.fromisoformat(oldest.replace("Z", "+00:00"))
+            lag = max(0.0, (datetime.now(timezone.utc) - logged).total_seconds())
+        return {
+            "depth": max((sink["depth"] for sink in sinks.values()), default=0),
+            "lag_seconds": lag,
+            "log_bytes": size,
+            "sinks": sinks,
+            "last_flush_at": self._last_flush_at,
+            "flusher_running": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+__all__ = ["IngestWAL", "WALRetryableError"]
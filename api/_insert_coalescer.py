@@ -0,0 +1,100 @@
+"""Coalesce concurrent single-row inserts into bulk requests.
+
+Callers hand :meth:`InsertCoalescer.submit` one record and block on the
+returned future. A background thread collects the records that arrive
+within ``window_seconds`` of the first one (or until ``max_rows`` are
+waiting), passes them to ``send`` in one call and resolves every caller's
+future from the per-record outcome ``send`` returns. Batches are sent on a
+small pool so a slow upstream request does not stop the next window from
+being collected.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger("insert_coalescer")
+
+# ``send`` returns one entry per record: ``None`` when it was stored, an
+# error message otherwise.
+Send = Callable[[List[Any]], List[Optional[str]]]
+
+
+class InsertCoalescer:
+    def __init__(
+        self,
+        send: Send,
+        window_seconds: float = 0.02,
+        max_rows: int = 100,
+        max_in_flight: int = 4,
+    ) -> None:
+        self.send = send
+        self.window_seconds = max(0.0, window_seconds)
+        self.max_rows = max(1, max_rows)
+        self._pending: List[Tuple[Any, "Future[Optional[str]]"]] = []
+        self._first_at = 0.0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="insert-coalescer")
+        self._stats = {"records": 0, "batches": 0, "failed_records": 0}
+
+    def submit(self, record: Any) -> "Future[Optional[str]]":
+        future: "Future[Optional[str]]" = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="insert-coalescer", daemon=True)
+                self._thread.start()
+            if not self._pending:
+                self._first_at = time.monotonic()
+            self._pending.append((record, future))
+            self._cond.notify()
+        return future
+
+    def insert(self, record: Any, timeout: Optional[float] = None) -> Optional[str]:
+        """Submit ``record`` and wait for its outcome."""
+
+        return self.submit(record).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                while len(self._pending) < self.max_rows:
+                    remaining = self._first_at + self.window_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self.max_rows]
+                del self._pending[: self.max_rows]
+                # Records left over start the next window now.
+                self._first_at = time.monotonic()
+                self._stats["records"] += len(batch)
+                self._stats["batches"] += 1
+            self._pool.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[Any, "Future[Optional[str]]"]]) -> None:
+        try:
+            outcomes = self.send([record for record, _future in batch])
+            if len(outcomes) != len(batch):
+                raise RuntimeError(f"send returned {len(outcomes)} outcomes for {len(batch)} records")
+        except Exception as exc:
+            LOGGER.exception("Coalesced insert of %s records failed", len(batch))
+            outcomes = [f"Supabase exception: {exc!r}"] * len(batch)
+        failed = sum(1 for outcome in outcomes if outcome is not None)
+        if failed:
+            with self._cond:
+                self._stats["failed_records"] += failed
+        for (_record, future), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
+
+
+__all__ = ["InsertCoalescer"]
@@ -0,0 +1,185 @@
+"""Pass directory index stored in ``item_meta.json``.
+
+Annotation submits record every pass directory they write under the
+``passes`` key so promotion and export can locate the newest pass without
+walking the asset tree.
+
+A pass directory is whatever directory holds one annotator's output for
+one pass, relative to the asset directory. Stage 2 pipeline trees use
+``pass_N/<annotator>/`` (or ``<annotator>/pass_N/``); ``POST
+/api/annotations`` writes to ``<annotator>/`` and records that directory
+with the submitted ``pass_number``. Either way everything inside it
+(``annotation.json``, ``qa_result.json``, VTT/CTM files) is the pass
+output, and promotion stages the whole directory into ``merged/``.
+
+Trees written before the index existed are discovered once with
+:func:`discover_passes` and can be backfilled by the caller.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PASS_INDEX_KEY = "passes"
+
+
+def record_pass(
+    meta: Dict[str, Any],
+    pass_number: int,
+    rel_path: str,
+    completed_at: str,
+) -> None:
+    """Add or refresh the entry for ``rel_path`` in ``meta``'s pass index."""
+
+    entries = meta.get(PASS_INDEX_KEY)
+    if not isinstance(entries, list):
+        entries = []
+    entries = [
+        entry
+        for entry in entries
+        if isinstance(entry, dict)
+        and not (entry.get("path") == rel_path and entry.get("pass_number") == pass_number)
+    ]
+    entries.append(
+        {
+            "pass_number": int(pass_number),
+            "path": rel_path,
+            "completed_at": completed_at,
+        }
+    )
+    entries.sort(key=lambda entry: (entry.get("pass_number") or 0, str(entry.get("completed_at") or "")))
+    meta[PASS_INDEX_KEY] = entries
+
+
+def indexed_passes(meta: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Return the recorded pass entries, or ``None`` when no index exists."""
+
+    if not isinstance(meta, dict):
+        return None
+    entries = meta.get(PASS_INDEX_KEY)
+    if not isinstance(entries, list):
+        return None
+    valid: List[Dict[str, Any]] = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("path"):
+            continue
+        rel = Path(str(entry["path"]))
+        if rel.is_absolute() or ".." in rel.parts:
+            continue
+        try:
+            number = int(entry.get("pass_number"))
+        except (TypeError, ValueError):
+            continue
+        valid.append({**entry, "pass_number": number})
+    return valid
+
+
+def _parse_pass_number(name: str) -> Optional[int]:
+    segment = name.lower()
+    if not segment.startswith("pass"):
+        return None
+    digits = "".join(ch for ch in segment.split("pass")[-1] if ch.isdigit())
+    if not digits:
+        return None
+    return int(digits)
+
+
+def scan_pass_dirs(asset_dir: Path) -> List[Dict[str, Any]]:
+    """Walk ``asset_dir`` for ``pass_*`` directories (legacy fallback)."""
+
+    entries: List[Dict[str, Any]] = []
+    for path in asset_dir.rglob("pass_*"):
+        if not path.is_dir():
+            continue
+        if "merged" in {segment.lower() for segment in path.parts}:
+            continue
+        number = _parse_pass_number(path.name)
+        if number is None:
+            continue
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        completed_at = datetime.fromtimestamp(mtime, timezone.utc).isoformat().replace("+00:00", "Z")
+        entries.append(
+            {
+                "pass_number": number,
+                "path": path.relative_to(asset_dir).as_posix(),
+                "completed_at": completed_at,
+            }
+        )
+    entries.sort(key=lambda entry: (entry["pass_number"], entry["completed_at"]))
+    return entries
+
+
+def assigned_pass_dirs(asset_dir: Path, meta: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return ``<annotator>/`` directories named by ``item_meta`` assignments.
+
+    Covers API submissions made before the index existed, whose only
+    record of the pass number is the ``assignments`` list.
+    """
+
+    assignments = meta.get("assignments") if isinstance(meta, dict) else None
+    if not isinstance(assignments, list):
+        return []
+    latest: Dict[str, Dict[str, Any]] = {}
+    for entry in assignments:
+        if not isinstance(entry, dict):
+            continue
+        annotator_id = str(entry.get("annotator_id") or "")
+        if not annotator_id or annotator_id in {".", ".."} or "/" in annotator_id or "\\" in annotator_id:
+            continue
+        if not (asset_dir / annotator_id).is_dir():
+            continue
+        try:
+            number = int(entry.get("pass_number", 1))
+        except (TypeError, ValueError):
+            number = 1
+        latest[annotator_id] = {
+            "pass_number": number,
+            "path": annotator_id,
+            "completed_at": str(entry.get("submitted_at") or ""),
+        }
+    entries = list(latest.values())
+    entries.sort(key=lambda entry: (entry["pass_number"], entry["completed_at"]))
+    return entries
+
+
+def discover_passes(asset_dir: Path, meta: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the indexed passes, or rebuild them from the tree and assignments."""
+
+    passes = indexed_passes(meta)
+    if passes is not None:
+        return passes
+    entries = scan_pass_dirs(asset_dir) + assigned_pass_dirs(asset_dir, meta)
+    entries.sort(key=lambda entry: (entry["pass_number"], entry["completed_at"]))
+    return entries
+
+
+def latest_pass_dir(asset_dir: Path, entries: List[Dict[str, Any]]) -> Optional[Path]:
+    """Return the newest existing pass directory among ``entries``."""
+
+    ordered = sorted(
+        entries,
+        key=lambda entry: (entry.get("pass_number") or 0, str(entry.get("completed_at") or "")),
+        reverse=True,
+    )
+    for entry in ordered:
+        candidate = asset_dir / str(entry["path"])
+        if os.path.isdir(candidate):
+            return candidate
+    return None
+
+
+__all__ = [
+    "PASS_INDEX_KEY",
+    "record_pass",
+    "indexed_passes",
+    "scan_pass_dirs",
+    "assigned_pass_dirs",
+    "discover_passes",
+    "latest_pass_dir",
+]
@@ -0,0 +1,25 @@
+"""Data directories shared between the API modules.
+
+Several directories are written by one endpoint and read by another
+(``/api/annotations`` drops cached archives that ``/api/export`` serves,
+for example), so they must resolve to the same place in every module.
+Relative paths, whether from the environment or the defaults, are taken
+from the repository root rather than the process's working directory.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def data_dir(key: str, default: str) -> Path:
+    """Return ``$key`` (or ``default``) as a path anchored at :data:`ROOT_DIR`."""
+
+    path = Path(os.environ.get(key) or default).expanduser()
+    return path if path.is_absolute() else ROOT_DIR / path
+
+
+__all__ = ["ROOT_DIR", "data_dir"]
@@ -0,0 +1,241 @@
+"""Server-side QA metrics derived from a stage2 submission.
+
+Python counterparts of the scorers in ``public/stage2/qa_metrics.js`` so the
+numbers the export QA report and nightly jobs look for (code-switch F1,
+diarization MAE, cue length diff, translation completeness) can be computed
+once at ingest instead of by re-parsing every VTT later.
+
+Metrics come in two groups:
+
+* per submission (:func:`derive_submission_metrics`), from the submission's
+  own files only: cue statistics and translation coverage;
+* per pair of passes (:func:`derive_agreement`), from two submissions for
+  the same asset: code-switch span F1, diarization boundary MAE and cue
+  alignment statistics.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from api._cue_alignment import compare_passes, parse_vtt
+
+TARGET_CUE_MEAN_SEC = 2.5
+TARGET_CUE_RANGE = (2.0, 3.0)
+# code_switch_spans.json stores seconds; the JS default of 300 is in ms.
+CODESWITCH_TOLERANCE_SEC = 0.3
+DIARIZATION_PENALTY_SEC = 5.0
+
+Cue = Tuple[float, float, str]
+
+
+def _parse_timestamp(value: str) -> float:
+    parts = value.strip().replace(",", ".").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_cues(content: Optional[str]) -> List[Cue]:
+    """Parse VTT text into ``(start, end, text)`` cues like ``parseVttCues``."""
+
+    cues: List[Cue] = []
+    for block in re.split(r"\n\n+", (content or "").replace("\r", "")):
+        lines = [line for line in block.strip().split("\n") if line]
+        if not lines:
+            continue
+        time_index = next((i for i, line in enumerate(lines) if "-->" in line), 0)
+        start_raw, sep, end_raw = lines[time_index].partition("-->")
+        if not sep:
+            continue
+        try:
+            start = _parse_timestamp(start_raw.split()[0] if start_raw.split() else "")
+            end = _parse_timestamp(end_raw.split()[0] if end_raw.split() else "")
+        except ValueError:
+            continue
+        if end <= start:
+            continue
+        cues.append((start, end, "\n".join(lines[time_index + 1 :])))
+    return cues
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def cue_stats(transcript_vtt: Optional[str], translation_vtt: Optional[str]) -> Dict[str, Any]:
+    transcript = parse_cues(transcript_vtt)
+    translation = parse_cues(translation_vtt)
+    durations = [end - start for start, end, _ in transcript if end > start]
+    mean = _mean(durations)
+    std = math.sqrt(_mean([(d - mean) ** 2 for d in durations])) if len(durations) > 1 else 0.0
+    source_chars = sum(len(re.sub(r"\s+", "", text)) for _, _, text in transcript)
+    translated_chars = sum(len(re.sub(r"\s+", "", text)) for _, _, text in translation)
+    if source_chars:
+        completeness = translated_chars / source_chars
+    else:
+        completeness = 1.0 if translated_chars else 0.0
+    return {
+        "cue_count": len(transcript),
+        "avg_cue_length_sec": mean,
+        "std_cue_length_sec": std,
+        "target_diff_sec": mean - TARGET_CUE_MEAN_SEC,
+        "within_target_range": TARGET_CUE_RANGE[0] <= mean <= TARGET_CUE_RANGE[1],
+        "source_char_count": source_chars,
+        "translation_char_count": translated_chars,
+        "translation_char_ratio": completeness,
+    }
+
+
+def translation_stats(translation_vtt: Optional[str], reference_vtt: Optional[str]) -> Dict[str, Any]:
+    translation = parse_cues(translation_vtt)
+    reference = parse_cues(reference_vtt)
+    translated = sum(len(text.split()) for _, _, text in translation if text.strip())
+    referenced = sum(len(text.split()) for _, _, text in reference if text.strip())
+    if referenced:
+        completeness = translated / referenced
+        correctness = 1 - min(1.0, abs(translated - referenced) / referenced)
+    else:
+        completeness = 1.0 if translated else 0.0
+        correctness = 1.0
+    return {
+        "completeness": completeness,
+        "correctness": correctness,
+        "translation_tokens": translated,
+        "reference_tokens": referenced,
+        "cue_count": len(translation),
+    }
+
+
+def _spans(content: Optional[str]) -> List[Tuple[float, float]]:
+    try:
+        data = json.loads(content or "")
+    except ValueError:
+        return []
+    spans = data.get("spans") if isinstance(data, dict) else data
+    result = []
+    for span in spans if isinstance(spans, list) else []:
+        if not isinstance(span, dict):
+            continue
+        try:
+            start, end = float(span.get("start")), float(span.get("end"))
+        except (TypeError, ValueError):
+            continue
+        if end > start:
+            result.append((start, end))
+    return sorted(result)
+
+
+def codeswitch_f1(
+    pred_json: Optional[str],
+    gold_json: Optional[str],
+    tolerance: float = CODESWITCH_TOLERANCE_SEC,
+) -> Dict[str, Any]:
+    """Span F1 with greedy closest matching, as ``scoreCodeSwitchF1``."""
+
+    preds, golds = _spans(pred_json), _spans(gold_json)
+    if not preds and not golds:
+        return {"precision": 1.0, "recall": 1.0, "f1": 1.0, "tp": 0, "fp": 0, "fn": 0}
+    used = set()
+    tp = 0
+    for gold_start, gold_end in golds:
+        best, best_score = -1, math.inf
+        for index, (start, end) in enumerate(preds):
+            if index in used or start > gold_end + tolerance or end < gold_start - tolerance:
+                continue
+            score = abs(start - gold_start) + abs(end - gold_end)
+            if score < best_score:
+                best, best_score = index, score
+        if best >= 0:
+            used.add(best)
+            tp += 1
+    fp, fn = len(preds) - tp, len(golds) - tp
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1, "tp": tp, "fp": fp, "fn": fn}
+
+
+def _boundaries(rttm: Optional[str]) -> List[float]:
+    starts = []
+    for line in (rttm or "").splitlines():
+        parts = line.split()
+        if len(parts) < 5 or parts[0].upper() != "SPEAKER":
+            continue
+        try:
+            start, duration = float(parts[3]), float(parts[4])
+        except ValueError:
+            continue
+        if duration > 0:
+            starts.append(start)
+    return sorted(starts)[1:]
+
+
+def diarization_mae(
+    pred_rttm: Optional[str],
+    gold_rttm: Optional[str],
+    penalty: float = DIARIZATION_PENALTY_SEC,
+) -> Optional[float]:
+    """Speaker-change boundary MAE, as ``scoreDiarizationMAE``."""
+
+    preds, golds = _boundaries(pred_rttm), _boundaries(gold_rttm)
+    if not preds and not golds:
+        return 0.0
+    if not golds:
+        return penalty
+    used = set()
+    deltas = []
+    for gold in golds:
+        candidates = [(abs(pred - gold), index) for index, pred in enumerate(preds) if index not in used]
+        if candidates:
+            delta, index = min(candidates)
+            used.add(index)
+            deltas.append(delta)
+        else:
+            deltas.append(penalty)
+    deltas.extend(penalty for index in range(len(preds)) if index not in used)
+    return _mean(deltas)
+
+
+def derive_submission_metrics(files: Dict[str, Any]) -> Dict[str, Any]:
+    transcript = files.get("transcript_vtt")
+    translation = files.get("translation_vtt")
+    cues = cue_stats(transcript, translation)
+    translation_metrics = translation_stats(translation, transcript)
+    return {
+        "cues": cues,
+        "translation": translation_metrics,
+        "cue_diff_sec": cues["target_diff_sec"],
+        "translation_char_ratio": cues["translation_char_ratio"],
+        "translation_completeness": translation_metrics["completeness"],
+    }
+
+
+def derive_agreement(files: Dict[str, Any], reference: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare a submission against another pass of the same asset."""
+
+    codeswitch = codeswitch_f1(files.get("code_switch_spans_json"), reference.get("code_switch_spans_json"))
+    return {
+        "codeswitch": codeswitch,
+        "codeswitch_f1": codeswitch["f1"],
+        "diarization_mae": diarization_mae(files.get("diarization_rttm"), reference.get("diarization_rttm")),
+        "cue_alignment": compare_passes(
+            parse_vtt(files.get("transcript_vtt") or ""),
+            parse_vtt(reference.get("transcript_vtt") or ""),
+        ),
+    }
+
+
+__all__ = [
+    "codeswitch_f1",
+    "cue_stats",
+    "derive_agreement",
+    "derive_submission_metrics",
+    "diarization_mae",
+    "parse_cues",
+    "translation_stats",
+]
@@ -0,0 +1,213 @@
+"""Running QA totals across the corpus, per annotator, per cell and per day.
+
+Every ``qa_result.json`` write reports the submission's *contribution*
+(clip count, gold outcome and the QA metrics it carries) with
+:meth:`QARollupStore.record`. The store keeps running sums and counts in
+``totals.json`` so averages can be served without touching the corpus. The
+last contribution of each submission is kept in its own small file and
+subtracted before the new one is added, so rewriting a ``qa_result.json``
+(for example when derived metrics are filled in) replaces its numbers
+instead of counting them twice. ``scripts/rebuild_qa_rollup.py`` recomputes
+the store from the output tree if it is lost or out of step.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+CACHE_VERSION = 1
+DIMENSIONS = ("annotator", "cell", "day")
+# qa_result.json field -> name used in the export QA report.
+METRIC_FIELDS = {
+    "codeswitch_f1": "averageCodeSwitchF1",
+    "diarization_mae": "averageDiarizationMAE",
+    "cue_diff_sec": "averageCueDiffSec",
+    "translation_completeness": "translationCompletenessAvg",
+    "translation_correctness": "translationCorrectnessAvg",
+    "translation_char_ratio": "translationCharRatioAvg",
+    "time_spent_sec": "averageTimeSpentSec",
+}
+COUNTERS = ("clips", "gold_targets", "gold_pass", "gold_fail")
+# Fields the server derives from the submitted files, used only when the
+# client did not report them.
+DERIVED_FIELDS = ("cue_diff_sec", "translation_completeness", "translation_char_ratio")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def contribution_from_qa(
+    qa: Dict[str, Any],
+    annotator_id: str,
+    cell: Optional[str],
+    submitted_at: Optional[str],
+) -> Dict[str, Any]:
+    """Turn a ``qa_result.json`` record into a rollup contribution."""
+
+    metrics = qa.get("metrics") if isinstance(qa.get("metrics"), dict) else {}
+    cues = metrics.get("cues") if isinstance(metrics.get("cues"), dict) else {}
+    derived = qa.get("derived") if isinstance(qa.get("derived"), dict) else {}
+    values = {field: _number(qa.get(field)) for field in METRIC_FIELDS}
+    # Same fallbacks as the per-asset QA report: client values first, then
+    # the server-derived ones.
+    if values["cue_diff_sec"] is None:
+        values["cue_diff_sec"] = _number(cues.get("targetDiffSec"))
+    if values["translation_char_ratio"] is None:
+        values["translation_char_ratio"] = _number(cues.get("translationCompleteness"))
+    for field in DERIVED_FIELDS:
+        if values[field] is None:
+            values[field] = _number(derived.get(field))
+    day = str(submitted_at or qa.get("submitted_at") or "")[:10] or "unknown"
+    return {
+        "groups": {
+            "annotator": str(qa.get("annotator_id") or annotator_id or "anonymous"),
+            "cell": str(cell or "unknown"),
+            "day": day,
+        },
+        "clips": 1,
+        "gold_targets": 1 if qa.get("gold_target") else 0,
+        "gold_pass": 1 if qa.get("gold_check") == "pass" else 0,
+        "gold_fail": 1 if qa.get("gold_check") == "fail" else 0,
+        "metrics": {field: value for field, value in values.items() if value is not None},
+    }
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {**{counter: 0 for counter in COUNTERS}, "sums": {}, "counts": {}}
+
+
+def _apply(bucket: Dict[str, Any], contribution: Dict[str, Any], sign: int) -> None:
+    for counter in COUNTERS:
+        bucket[counter] = bucket.get(counter, 0) + sign * int(contribution.get(counter) or 0)
+    for field, value in (contribution.get("metrics") or {}).items():
+        bucket["sums"][field] = bucket["sums"].get(field, 0.0) + sign * value
+        bucket["counts"][field] = bucket["counts"].get(field, 0) + sign
+        if bucket["counts"][field] <= 0:
+            bucket["sums"].pop(field, None)
+            bucket["counts"].pop(field, None)
+
+
+def summarize_bucket(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    clips = bucket.get("clips", 0)
+    summary: Dict[str, Any] = {
+        "clips": clips,
+        "goldTargets": bucket.get("gold_targets", 0),
+        "passCount": bucket.get("gold_pass", 0),
+        "failCount": bucket.get("gold_fail", 0),
+        "passRate": bucket.get("gold_pass", 0) / clips if clips else 0,
+    }
+    for field, name in METRIC_FIELDS.items():
+        count = bucket.get("counts", {}).get(field, 0)
+        summary[name] = bucket["sums"][field] / count if count else 0
+        summary[f"{name}Count"] = count
+    return summary
+
+
+class QARollupStore:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / ".lock").open("a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _contribution_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / "contributions" / digest[:2] / f"{digest}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    def _write(path: Path, payload: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=str(path.parent), prefix=f".{path.name}.", delete=False
+        ) as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+            temp_name = handle.name
+        os.replace(temp_name, path)
+
+    def load_totals(self) -> Dict[str, Any]:
+        totals = self._read(self.directory / "totals.json")
+        if totals is None or totals.get("version") != CACHE_VERSION:
+            totals = {"version": CACHE_VERSION, "generation": 0, "overall": _empty_bucket()}
+        for dimension in DIMENSIONS:
+            totals.setdefault(dimension, {})
+        return totals
+
+    def rebuild(self, contributions: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Replace the whole store with ``(key, contribution)`` pairs."""
+
+        totals = {"version": CACHE_VERSION, "generation": 0, "overall": _empty_bucket()}
+        for dimension in DIMENSIONS:
+            totals[dimension] = {}
+        with self._lock():
+            previous = self._read(self.directory / "totals.json") or {}
+            shutil.rmtree(self.directory / "contributions", ignore_errors=True)
+            for key, contribution in contributions:
+                _apply(totals["overall"], contribution, 1)
+                for dimension in DIMENSIONS:
+                    name = contribution["groups"][dimension]
+                    _apply(totals[dimension].setdefault(name, _empty_bucket()), contribution, 1)
+                self._write(self._contribution_path(key), contribution)
+            totals["generation"] = int(previous.get("generation") or 0) + 1
+            totals["updated_at"] = time.time()
+            self._write(self.directory / "totals.json", totals)
+        return totals
+
+    def record(self, key: str, contribution: Optional[Dict[str, Any]]) -> None:
+        """Replace the contribution stored under ``key`` (``None`` removes it)."""
+
+        with self._lock():
+            path = self._contribution_path(key)
+            previous = self._read(path)
+            if previous == contribution:
+                return
+            totals = self.load_totals()
+            for item, sign in ((previous, -1), (contribution, 1)):
+                if not item:
+                    continue
+                _apply(totals["overall"], item, sign)
+                for dimension in DIMENSIONS:
+                    name = item["groups"][dimension]
+                    bucket = totals[dimension].setdefault(name, _empty_bucket())
+                    _apply(bucket, item, sign)
+                    if bucket["clips"] <= 0:
+                        del totals[dimension][name]
+            totals["generation"] = int(totals.get("generation") or 0) + 1
+            totals["updated_at"] = time.time()
+            if contribution is None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            else:
+                self._write(path, contribution)
+            self._write(self.directory / "totals.json", totals)
+
+
+__all__ = ["DIMENSIONS", "QARollupStore", "contribution_from_qa", "summarize_bucket"]
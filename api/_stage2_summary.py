@@ -0,0 +1,279 @@
+"""Incrementally maintained clip counts for ``/api/export/summary``.
+
+Walking every clip directory on each summary request grows with the corpus,
+so the counts are kept in two small files in a cache directory next to the
+stage2 output tree instead:
+
+* ``clips/<clip>.json`` holds one clip's contribution together with the
+  mtimes it was computed from;
+* ``totals.json`` holds just the totals, which is all a summary request
+  reads.
+
+Submit and promote call :meth:`SummaryCache.note_clip` for the clip they
+touched, which rewrites that clip's file and applies the difference to the
+totals, so its cost does not depend on the corpus size. Anything that changes the tree without going through them (new
+clip directories, Node jobs writing pass folders) is picked up by
+:meth:`SummaryCache.refresh`, which runs when the root directory's mtime
+moves or the totals are older than ``revalidate_seconds``. It only
+re-examines clips whose signatures changed since they were last counted.
+Signatures are built from ``stat`` results alone, so an unchanged clip
+costs a few ``stat`` calls and no file reads.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from api._artifact_io import load_artifact_json, logical_path
+from api._pass_index import assigned_pass_dirs, indexed_passes
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+CLIPS_DIRNAME = "clips"
+# Single-file layout from cache version 1, removed on the next rescan.
+LEGACY_CLIPS_FILENAME = "clips.json"
+TOTALS_FILENAME = "totals.json"
+LOCK_FILENAME = ".lock"
+CACHE_VERSION = 3
+COUNTED_FIELDS = {"clip": "clips", "double": "double_passes"}
+ARTIFACT_SUFFIXES = {".vtt", ".json"}
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _read_item_meta(clip_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = load_artifact_json(clip_dir / "item_meta.json")
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _pass_dirs(clip_dir: Path) -> List[Path]:
+    return sorted(
+        child for child in clip_dir.iterdir() if child.is_dir() and child.name.lower().startswith("pass_")
+    )
+
+
+def clip_signature(clip_dir: Path, indexed: bool = False) -> List[int]:
+    """Stat values that change whenever the clip's contribution can change.
+
+    Clips with a pass index only need the directory mtime and the mtime and
+    size of ``item_meta.json``; older clips are judged by their ``pass_*``
+    folders, so those mtimes count too. ``indexed`` comes from the clip's
+    cached entry, so ``item_meta.json`` is never parsed here.
+    """
+
+    try:
+        meta = (clip_dir / "item_meta.json").stat()
+        meta_stat = [meta.st_mtime_ns, meta.st_size]
+    except OSError:
+        meta_stat = [0, 0]
+    signature = [_mtime_ns(clip_dir), *meta_stat]
+    if not indexed:
+        signature.extend(_mtime_ns(path) for path in _pass_dirs(clip_dir))
+    return signature
+
+
+def summarize_clip(clip_dir: Path) -> Dict[str, bool]:
+    """Return whether ``clip_dir`` counts as a clip and as a double pass."""
+
+    return _summarize(clip_dir, _read_item_meta(clip_dir))
+
+
+def _clip_entry(clip_dir: Path) -> Dict[str, Any]:
+    """Summarize ``clip_dir`` into a cache entry along with its signature."""
+
+    meta = _read_item_meta(clip_dir)
+    indexed = indexed_passes(meta) is not None
+    return {
+        "version": CACHE_VERSION,
+        **_summarize(clip_dir, meta),
+        "indexed": indexed,
+        "signature": clip_signature(clip_dir, indexed),
+    }
+
+
+def _summarize(clip_dir: Path, meta: Optional[Dict[str, Any]]) -> Dict[str, bool]:
+    passes = indexed_passes(meta)
+    if passes is not None:
+        # Indexed passes were recorded at submit time alongside their
+        # artifacts, so the pass directories need not be walked.
+        return {
+            "clip": bool(passes),
+            "double": any(entry["pass_number"] != 1 for entry in passes),
+        }
+
+    # API submissions made before the index existed: each assigned
+    # ``<annotator>/`` directory is a pass, as it is once indexed.
+    assigned = assigned_pass_dirs(clip_dir, meta)
+    has_artifacts = bool(assigned)
+    passes_found = {f"pass_{entry['pass_number']}" for entry in assigned}
+
+    for child in clip_dir.iterdir():
+        if child.is_dir() and child.name.lower().startswith("pass_"):
+            passes_found.add(child.name.lower())
+            if not has_artifacts:
+                for artifact in child.rglob("*"):
+                    if artifact.is_file() and logical_path(artifact).suffix.lower() in ARTIFACT_SUFFIXES:
+                        has_artifacts = True
+                        break
+        elif child.is_file() and logical_path(child).suffix.lower() in ARTIFACT_SUFFIXES:
+            has_artifacts = True
+
+        if has_artifacts and any(name != "pass_1" for name in passes_found):
+            # Enough information gathered; stop scanning this clip.
+            break
+
+    return {"clip": has_artifacts, "double": any(name != "pass_1" for name in passes_found)}
+
+
+def _totals(clips: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    totals = {name: 0 for name in COUNTED_FIELDS.values()}
+    for entry in clips:
+        for field, name in COUNTED_FIELDS.items():
+            totals[name] += 1 if entry.get(field) else 0
+    return totals
+
+
+class SummaryCache:
+    def __init__(self, root: Path, directory: Path, revalidate_seconds: float = 300.0) -> None:
+        # ``directory`` must live outside ``root`` so cache writes do not
+        # move the root's mtime or show up as a clip.
+        self.root = root
+        self.directory = directory
+        self.revalidate_seconds = revalidate_seconds
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / LOCK_FILENAME).open("a+") as handle:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, filename: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads((self.directory / filename).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return None
+        return data
+
+    def _write(self, filename: str, payload: Dict[str, Any]) -> None:
+        target = self.directory / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=str(target.parent), prefix=f".{target.name}.", delete=False
+        ) as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+            temp_name = handle.name
+        os.replace(temp_name, target)
+
+    def _clip_filename(self, name: str) -> str:
+        return f"{CLIPS_DIRNAME}/{name}.json"
+
+    def _save_totals(
+        self,
+        counts: Dict[str, int],
+        root_mtime_ns: int,
+        previous: Optional[Dict[str, Any]],
+        validated_at: float,
+    ) -> Dict[str, Any]:
+        totals = {
+            "version": CACHE_VERSION,
+            **counts,
+            "generation": int((previous or {}).get("generation") or 0) + 1,
+            "root_mtime_ns": root_mtime_ns,
+            "validated_at": validated_at,
+        }
+        self._write(TOTALS_FILENAME, totals)
+        return totals
+
+    def note_clip(self, clip_dir: Path) -> None:
+        """Recount one clip after it was written and adjust the totals."""
+
+        if not self.root.is_dir():
+            return
+        with self._lock():
+            previous = self._read(TOTALS_FILENAME)
+            if previous is None:
+                # Nothing to update incrementally; the next summary rescans.
+                return
+            filename = self._clip_filename(clip_dir.name)
+            old = self._read(filename)
+            root_mtime_ns = int(previous.get("root_mtime_ns") or 0)
+            if old is None:
+                # Creating this clip's directory moved the root mtime; it is
+                # counted here, so do not let that alone force a rescan.
+                root_mtime_ns = _mtime_ns(self.root)
+            new: Optional[Dict[str, Any]] = None
+            if clip_dir.is_dir():
+                new = _clip_entry(clip_dir)
+                self._write(filename, new)
+            else:
+                (self.directory / filename).unlink(missing_ok=True)
+            before, after = _totals([old] if old else []), _totals([new] if new else [])
+            counts = {name: int(previous.get(name) or 0) + after[name] - before[name] for name in after}
+            self._save_totals(counts, root_mtime_ns, previous, float(previous.get("validated_at") or 0))
+
+    def refresh(self) -> Dict[str, Any]:
+        """Re-examine clips whose signatures changed and rebuild the totals."""
+
+        with self._lock():
+            previous = self._read(TOTALS_FILENAME)
+            root_mtime_ns = _mtime_ns(self.root)
+            clips: Dict[str, Dict[str, Any]] = {}
+            for clip_dir in self.root.iterdir():
+                if not clip_dir.is_dir():
+                    continue
+                filename = self._clip_filename(clip_dir.name)
+                entry = self._read(filename)
+                if entry is None or entry.get("signature") != clip_signature(clip_dir, bool(entry.get("indexed"))):
+                    entry = _clip_entry(clip_dir)
+                    self._write(filename, entry)
+                clips[clip_dir.name] = entry
+            clips_dir = self.directory / CLIPS_DIRNAME
+            for path in clips_dir.glob("*.json") if clips_dir.is_dir() else []:
+                if path.stem not in clips:
+                    path.unlink(missing_ok=True)
+            (self.directory / LEGACY_CLIPS_FILENAME).unlink(missing_ok=True)
+            return self._save_totals(_totals(clips.values()), root_mtime_ns, previous, time.time())
+
+    def summary(self) -> Dict[str, Any]:
+        """Return ``{"clips", "double_passes", "generation"}``."""
+
+        if not self.root.is_dir():
+            return {"clips": 0, "double_passes": 0, "generation": 0}
+        totals = self._read(TOTALS_FILENAME)
+        stale = (
+            totals is None
+            or totals.get("root_mtime_ns") != _mtime_ns(self.root)
+            or time.time() - float(totals.get("validated_at") or 0) >= self.revalidate_seconds
+        )
+        if stale:
+            totals = self.refresh()
+        return {key: totals[key] for key in ("clips", "double_passes", "generation")}
+
+
+__all__ = ["SummaryCache", "clip_signature", "summarize_clip"]
@@ -0,0 +1,277 @@
+"""Write ZIP archives as a stream of chunks.
+
+:func:`stream_zip` yields archive bytes as each entry is compressed instead
+of building the whole archive in memory first. The output is not seekable,
+so every entry is written with a data descriptor (sizes and CRC after the
+data). Compression is chosen per entry from its file suffix: media and
+other already-compressed formats are stored, everything else is deflated
+at ``EXPORT_ZIP_LEVEL``.
+
+:func:`stream_zip_parallel` produces the same kind of archive but compresses
+entries ahead of time on an executor, a bounded number at once, and writes
+them with sizes known up front. It suits archives of many small to medium
+entries; each entry is held in memory while it is in flight.
+
+Both go through :class:`_RawZipWriter`, so the two kinds of entry share one
+central directory format.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_STORED_SUFFIXES = (
+    ".mp3,.wav,.flac,.m4a,.aac,.ogg,.opus,.mp4,.webm,.png,.jpg,.jpeg,.zip,.gz,.zst"
+)
+EXPORT_ZIP_LEVEL = min(9, max(0, int(os.environ.get("EXPORT_ZIP_LEVEL", "6") or 6)))
+STORED_SUFFIXES = frozenset(
+    suffix.strip().lower()
+    for suffix in (os.environ.get("EXPORT_ZIP_STORED_SUFFIXES") or DEFAULT_STORED_SUFFIXES).split(",")
+    if suffix.strip()
+)
+
+EntryData = Union[bytes, str, Path, Iterable[bytes]]
+
+
+def compression_for(name: str) -> int:
+    if Path(name).suffix.lower() in STORED_SUFFIXES or EXPORT_ZIP_LEVEL == 0:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _iter_chunks(data: EntryData) -> Iterator[bytes]:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if isinstance(data, bytes):
+        for start in range(0, len(data), CHUNK_SIZE):
+            yield data[start : start + CHUNK_SIZE]
+    elif isinstance(data, Path):
+        with data.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                yield chunk
+    else:
+        yield from data
+
+
+def _size_hint(data: EntryData) -> int:
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, Path):
+        return data.stat().st_size
+    return 0
+
+
+class _CompressedEntry(NamedTuple):
+    name: bytes
+    method: int
+    crc: int
+    size: int
+    payload: bytes
+
+
+def _compress_entry(name: str, data: EntryData) -> _CompressedEntry:
+    raw = b"".join(_iter_chunks(data))
+    method = compression_for(name)
+    if method == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(EXPORT_ZIP_LEVEL, zlib.DEFLATED, -15)
+        payload = compressor.compress(raw) + compressor.flush()
+    else:
+        payload = raw
+    return _CompressedEntry(name.encode("utf-8"), method, zlib.crc32(raw), len(raw), payload)
+
+
+_ZIP32_LIMIT = 0xFFFFFFFF
+_UTF8_FLAG = 0x800
+_DESCRIPTOR_FLAG = 0x8
+
+
+class _RawZipWriter:
+    """Minimal ZIP writer for precompressed and streamed entries."""
+
+    def __init__(self) -> None:
+        self.offset = 0
+        now = time.localtime(time.time())
+        self.dos_time = (now.tm_hour << 11) | (now.tm_min << 5) | (now.tm_sec // 2)
+        self.dos_date = ((now.tm_year - 1980) << 9) | (now.tm_mon << 5) | now.tm_mday
+        self.central: List[bytes] = []
+
+    def _local_header(
+        self, name: bytes, method: int, flags: int, crc: int, sizes: Tuple[int, int], extra: bytes
+    ) -> bytes:
+        header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            45 if extra else 20,
+            flags,
+            method,
+            self.dos_time,
+            self.dos_date,
+            crc,
+            sizes[0],
+            sizes[1],
+            len(name),
+            len(extra),
+        )
+        return header + name + extra
+
+    def _add_central(
+        self, name: bytes, method: int, flags: int, crc: int, size: int, compressed: int, offset: int, zip64: bool
+    ) -> None:
+        sizes = (_ZIP32_LIMIT, _ZIP32_LIMIT) if zip64 else (compressed, size)
+        central_values = [size, compressed] if zip64 else []
+        if offset >= _ZIP32_LIMIT:
+            central_values.append(offset)
+        central_extra = (
+            struct.pack(f"<HH{len(central_values)}Q", 1, 8 * len(central_values), *central_values)
+            if central_values
+            else b""
+        )
+        version = 45 if central_extra else 20
+        self.central.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                (3 << 8) | version,
+                version,
+                flags,
+                method,
+                self.dos_time,
+                self.dos_date,
+                crc,
+                sizes[0],
+                sizes[1],
+                len(name),
+                len(central_extra),
+                0,
+                0,
+                0,
+                0o644 << 16,
+                min(offset, _ZIP32_LIMIT),
+            )
+            + name
+            + central_extra
+        )
+
+    def entry(self, item: _CompressedEntry) -> bytes:
+        offset = self.offset
+        zip64 = max(item.size, len(item.payload)) >= _ZIP32_LIMIT
+        sizes = (_ZIP32_LIMIT, _ZIP32_LIMIT) if zip64 else (len(item.payload), item.size)
+        local_extra = struct.pack("<HHQQ", 1, 16, item.size, len(item.payload)) if zip64 else b""
+        header = self._local_header(item.name, item.method, _UTF8_FLAG, item.crc, sizes, local_extra)
+        self._add_central(item.name, item.method, _UTF8_FLAG, item.crc, item.size, len(item.payload), offset, zip64)
+        data = header + item.payload
+        self.offset += len(data)
+        return data
+
+    def stream_entry(self, name: str, data: EntryData) -> Iterator[bytes]:
+        """Yield one entry whose sizes and CRC follow it in a data descriptor."""
+
+        encoded = name.encode("utf-8")
+        method = compression_for(name)
+        flags = _UTF8_FLAG | _DESCRIPTOR_FLAG
+        # Deflate can grow incompressible data slightly, hence the margin.
+        zip64 = _size_hint(data) * 1.05 > _ZIP32_LIMIT
+        offset = self.offset
+        if zip64:
+            header = self._local_header(
+                encoded, method, flags, 0, (_ZIP32_LIMIT, _ZIP32_LIMIT), struct.pack("<HHQQ", 1, 16, 0, 0)
+            )
+        else:
+            header = self._local_header(encoded, method, flags, 0, (0, 0), b"")
+        self.offset += len(header)
+        yield header
+
+        compressor = (
+            zlib.compressobj(EXPORT_ZIP_LEVEL, zlib.DEFLATED, -15) if method == zipfile.ZIP_DEFLATED else None
+        )
+        crc = size = compressed = 0
+        for chunk in _iter_chunks(data):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out = compressor.compress(chunk) if compressor else chunk
+            if out:
+                compressed += len(out)
+                self.offset += len(out)
+                yield out
+        out = compressor.flush() if compressor else b""
+        if out:
+            compressed += len(out)
+            self.offset += len(out)
+            yield out
+        if not zip64 and max(size, compressed) >= _ZIP32_LIMIT:
+            raise zipfile.LargeZipFile(f"{name} outgrew its size hint and needs zip64 headers")
+
+        descriptor = struct.pack("<IIQQ" if zip64 else "<IIII", 0x08074B50, crc, compressed, size)
+        self.offset += len(descriptor)
+        yield descriptor
+        self._add_central(encoded, method, flags, crc, size, compressed, offset, zip64)
+
+    def finish(self) -> bytes:
+        directory = b"".join(self.central)
+        start, count = self.offset, len(self.central)
+        tail = b""
+        if count >= 0xFFFF or start >= _ZIP32_LIMIT or len(directory) >= _ZIP32_LIMIT:
+            end64 = start + len(directory)
+            tail = struct.pack(
+                "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, len(directory), start
+            ) + struct.pack("<IIQI", 0x07064B50, 0, end64, 1)
+        tail += struct.pack(
+            "<IHHHHIIH",
+            0x06054B50,
+            0,
+            0,
+            min(count, 0xFFFF),
+            min(count, 0xFFFF),
+            min(len(directory), _ZIP32_LIMIT),
+            min(start, _ZIP32_LIMIT),
+            0,
+        )
+        return directory + tail
+
+
+def stream_zip(entries: Iterable[Tuple[str, EntryData]]) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``(name, data)`` entries chunk by chunk.
+
+    ``data`` may be text, bytes, a :class:`~pathlib.Path` to read from or an
+    iterable of byte chunks; entries are consumed lazily, one at a time.
+    """
+
+    writer = _RawZipWriter()
+    for name, data in entries:
+        yield from writer.stream_entry(name, data)
+    yield writer.finish()
+
+
+def stream_zip_parallel(
+    entries: Iterable[Tuple[str, EntryData]],
+    executor: Executor,
+    lookahead: int = 8,
+) -> Iterator[bytes]:
+    """Like :func:`stream_zip`, compressing up to ``lookahead`` entries at once.
+
+    Entries keep their input order in the archive.
+    """
+
+    writer = _RawZipWriter()
+    pending: Deque = deque()
+    for name, data in entries:
+        pending.append(executor.submit(_compress_entry, name, data))
+        while len(pending) >= max(1, lookahead):
+            yield writer.entry(pending.popleft().result())
+    while pending:
+        yield writer.entry(pending.popleft().result())
+    yield writer.finish()
+
+
+__all__ = ["compression_for", "stream_zip", "stream_zip_parallel"]
@@ -8,20 +8,35 @@ loss when multiple reviewers act concurrently.
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
 import json
 import logging
 import os
 import shutil
 import tempfile
-from contextlib import contextmanager
-from dataclasses import dataclass
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
+from api._artifact_io import read_artifact_text
+from api._asset_lock import asset_lock
+from api._pass_index import PASS_INDEX_KEY, discover_passes, indexed_passes, latest_pass_dir
+from api._paths import data_dir
+from api._stage2_summary import SummaryCache
+
 
 LOGGER = logging.getLogger("adjudication_api")
 if not LOGGER.handlers:
@@ -42,7 +57,42 @@ def _env_path(key: str, default: Path) -> Path:
 ROOT_DIR = Path(__file__).resolve().parents[1]
 REVIEW_DIR = _env_path("ADJUDICATION_OUTPUT_DIR", ROOT_DIR / "data" / "review")
 QUEUE_PATH = REVIEW_DIR / "adjudication_queue.json"
+JOURNAL_PATH = REVIEW_DIR / "adjudication_queue.journal.jsonl"
+JOURNAL_ARCHIVE_DIR = REVIEW_DIR / "logs"
+JOBS_DIR = REVIEW_DIR / "jobs"
+RECORD_LOCK_DIR = REVIEW_DIR / "locks"
+JOURNAL_COMPACT_EVERY = int(os.environ.get("ADJUDICATION_JOURNAL_COMPACT_EVERY", "200") or 200)
+# "link" stages merged files as hardlinks or reflinks and only copies when
+# neither is supported; "copy" always copies.
+MERGE_STAGING_MODE = (os.environ.get("ADJUDICATION_MERGE_STAGING") or "link").strip().lower()
+MERGE_INCREMENTAL = (os.environ.get("ADJUDICATION_MERGE_INCREMENTAL") or "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
+_FICLONE = 0x40049409  # Linux ioctl used by cp --reflink
+PROMOTE_WORKERS = max(1, int(os.environ.get("ADJUDICATION_PROMOTE_WORKERS", "4") or 4))
+# Background promotions run on an in-process thread pool, which only works
+# in a long-running server: a serverless function (Vercel sets ``VERCEL``)
+# may be frozen or torn down as soon as its response is sent. "inline" runs
+# each promotion to completion inside the request that created it instead.
+PROMOTE_MODE = (
+    os.environ.get("ADJUDICATION_PROMOTE_MODE") or ("inline" if os.environ.get("VERCEL") else "background")
+).strip().lower()
+BULK_MAX_OPERATIONS = 500
+CHANGES_MAX_ENTRIES = 1000
+CHANGES_MAX_WAIT_SECONDS = 25.0
+CHANGES_POLL_INTERVAL_SECONDS = 0.5
+# Queued or running jobs not touched for this long are assumed to belong to
+# a worker that died and are resubmitted when their status is polled.
+JOB_STALE_SECONDS = int(os.environ.get("ADJUDICATION_JOB_STALE_SECONDS", "600") or 600)
 STAGE2_OUTPUT_DIR = _env_path("STAGE2_OUTPUT_DIR", ROOT_DIR / "data" / "stage2_output")
+STAGE2_SUMMARY_DIR = data_dir("STAGE2_SUMMARY_DIR", str(STAGE2_OUTPUT_DIR.parent / "stage2_summary"))
+SUMMARY_CACHE = SummaryCache(STAGE2_OUTPUT_DIR, STAGE2_SUMMARY_DIR)
+
+QUEUE_SORT_KEYS = ("asset_id", "age", "severity")
+CHANGES_HEADERS = {"Cache-Control": "no-store"}
+QUEUE_PAGE_MAX_LIMIT = 500
 
 
 class AssignRequest(BaseModel):
@@ -60,15 +110,124 @@ class StatusRequest(BaseModel):
     status: str
 
 
+class BulkOperation(BaseModel):
+    op: str
+    asset_id: str = Field(..., alias="asset_id")
+    assignee: Optional[str] = None
+    status: Optional[str] = None
+    adjudicator_id: Optional[str] = None
+    if_match: Optional[str] = None
+
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+
+
 @dataclass
 class QueueUpdateResult:
     record: dict
-    queue: List[dict]
+    entry: dict
+    previous: dict
+
+
+@dataclass
+class QueueState:
+    """Queue snapshot with the mutation journal replayed on top.
+
+    ``offset`` is the number of journal bytes already applied so later reads
+    only parse the tail that was appended since. ``changes`` lists
+    ``(journal offset, position)`` for every record a journal entry touched,
+    so the queue index can catch up on just those records.
+    """
+
+    snapshot_signature: Tuple[int, int, int]
+    journal_inode: int
+    records: List[dict]
+    positions: Dict[str, int]
+    generation: int = 0
+    offset: int = 0
+    entries: int = 0
+    changes: List[Tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class QueueIndex:
+    """Secondary indexes over a snapshot of the adjudication queue.
+
+    Posting lists map a status, cell or reason to queue positions so filters
+    are answered without scanning every record. Sort orderings are built
+    lazily the first time a given sort key is requested. The index follows
+    one :class:`QueueState`: journal entries replayed into it later are
+    applied with :meth:`replace`, and only a new state (a compaction or a
+    rewritten snapshot) rebuilds the index from scratch.
+    """
+
+    state: QueueState
+    records: List[dict]
+    offset: int = 0
+    cursor: str = ""
+    by_status: Dict[str, List[int]] = field(default_factory=dict)
+    by_cell: Dict[str, List[int]] = field(default_factory=dict)
+    by_reason: Dict[str, List[int]] = field(default_factory=dict)
+    orderings: Dict[str, Tuple[List[tuple], List[int]]] = field(default_factory=dict)
+
+    def ordering(self, sort: str) -> Tuple[List[tuple], List[int]]:
+        cached = self.orderings.get(sort)
+        if cached is None:
+            positions = sorted(
+                range(len(self.records)),
+                key=lambda pos: _queue_sort_key(self.records[pos], sort),
+            )
+            keys = [_queue_sort_key(self.records[pos], sort) for pos in positions]
+            cached = (keys, positions)
+            self.orderings[sort] = cached
+        return cached
+
+    def replace(self, pos: int, record: dict) -> None:
+        """Swap in a new version of the record at ``pos``."""
+
+        old = self.records[pos]
+        if old is record:
+            return
+        for postings, before, after in zip(
+            (self.by_status, self.by_cell, self.by_reason), _index_terms(old), _index_terms(record)
+        ):
+            for term in before - after:
+                posting = postings[term]
+                del posting[bisect_left(posting, pos)]
+                if not posting:
+                    del postings[term]
+            for term in after - before:
+                insort(postings.setdefault(term, []), pos)
+        for sort, (keys, positions) in self.orderings.items():
+            old_key, new_key = _queue_sort_key(old, sort), _queue_sort_key(record, sort)
+            if old_key == new_key:
+                continue
+            # Sort keys end with the asset id, so each key is unique.
+            at = bisect_left(keys, old_key)
+            del keys[at], positions[at]
+            at = bisect_right(keys, new_key)
+            keys.insert(at, new_key)
+            positions.insert(at, pos)
+        self.records[pos] = record
+
+
+_QUEUE_STATE_LOCK = threading.Lock()
+_QUEUE_STATE: Optional[QueueState] = None
+_QUEUE_INDEX_LOCK = threading.Lock()
+_QUEUE_INDEX: Optional[QueueIndex] = None
+_PROMOTION_POOL = ThreadPoolExecutor(max_workers=PROMOTE_WORKERS, thread_name_prefix="adjudication-promote")
+_ACTIVE_JOBS: Set[str] = set()
+_ACTIVE_JOBS_LOCK = threading.Lock()
 
 
 @contextmanager
-def _file_lock(lock_path: Path) -> Iterable[None]:
-    """Simple advisory file lock based on ``fcntl`` (POSIX only)."""
+def _file_lock(lock_path: Path, shared: bool = False, blocking: bool = True) -> Iterable[bool]:
+    """Simple advisory file lock based on ``fcntl`` (POSIX only).
+
+    Yields ``False`` instead of waiting when ``blocking`` is off and the lock
+    is held elsewhere.
+    """
 
     lock_path.parent.mkdir(parents=True, exist_ok=True)
     fd = os.open(lock_path, os.O_RDWR | os.O_CREAT)
@@ -76,10 +235,17 @@ def _file_lock(lock_path: Path) -> Iterable[None]:
         try:
             import fcntl  # type: ignore
 
-            fcntl.flock(fd, fcntl.LOCK_EX)
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(fd, flags)
+            except BlockingIOError:
+                yield False
+                return
         except ImportError:  # pragma: no cover - non POSIX platforms
             pass
-        yield
+        yield True
     finally:
         try:
             import fcntl  # type: ignore
@@ -90,7 +256,28 @@ def _file_lock(lock_path: Path) -> Iterable[None]:
         os.close(fd)
 
 
-def _read_queue() -> List[dict]:
+def _record_lock_path(asset_id: str) -> Path:
+    digest = hashlib.sha1(asset_id.encode("utf-8")).hexdigest()
+    return RECORD_LOCK_DIR / f"{digest}.lock"
+
+
+@contextmanager
+def _record_locks(asset_ids: Iterable[str]) -> Iterable[None]:
+    """Lock individual queue records for a read-check-append cycle.
+
+    Writers share the queue lock, so reviewers working on different assets
+    proceed in parallel; only compaction takes it exclusively. Record locks
+    are taken in sorted order so overlapping bulk requests cannot deadlock.
+    """
+
+    with ExitStack() as stack:
+        stack.enter_context(_file_lock(QUEUE_PATH.with_suffix(".lock"), shared=True))
+        for asset_id in sorted(set(asset_ids)):
+            stack.enter_context(_file_lock(_record_lock_path(asset_id)))
+        yield
+
+
+def _read_snapshot() -> List[dict]:
     if not QUEUE_PATH.is_file():
         return []
     try:
@@ -112,6 +299,300 @@ def _read_queue() -> List[dict]:
     return records
 
 
+def _snapshot_signature() -> Tuple[int, int, int]:
+    try:
+        stat = QUEUE_PATH.stat()
+    except FileNotFoundError:
+        return (0, 0, 0)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _journal_stat() -> Tuple[int, int]:
+    try:
+        stat = JOURNAL_PATH.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_ino, stat.st_size)
+
+
+def _journal_header(generation: int) -> bytes:
+    header = {"journal": 1, "generation": generation, "created_at": _current_timestamp()}
+    return (json.dumps(header, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _read_journal_lines(start: int) -> Tuple[List[bytes], int]:
+    """Return complete journal lines after ``start`` and the new offset.
+
+    A trailing line without a newline is a torn append from a crashed writer;
+    it is left unread so the offset never moves past it.
+    """
+
+    try:
+        with JOURNAL_PATH.open("rb") as fh:
+            fh.seek(start)
+            data = fh.read()
+    except FileNotFoundError:
+        return [], start
+    end = data.rfind(b"\n")
+    if end < 0:
+        return [], start
+    return data[: end + 1].splitlines(), start + end + 1
+
+
+def _format_change_cursor(generation: int, offset: int) -> str:
+    return f"{generation}.{offset}"
+
+
+def _parse_change_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        generation, offset = cursor.split(".", 1)
+        return int(generation), int(offset)
+    except ValueError:
+        raise HTTPException(400, "Invalid change cursor")
+
+
+def _journal_generation() -> int:
+    """Return the generation recorded in the journal file's header line."""
+
+    try:
+        with JOURNAL_PATH.open("rb") as fh:
+            header = json.loads(fh.readline())
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(header, dict) or "journal" not in header:
+        return 0
+    return int(header.get("generation") or 0)
+
+
+def _read_journal_entries(start: int, limit: int) -> List[Tuple[int, dict]]:
+    """Return ``(end_offset, entry)`` pairs for journal entries after ``start``."""
+
+    lines, _ = _read_journal_lines(start)
+    offset = start
+    entries: List[Tuple[int, dict]] = []
+    for line in lines:
+        offset += len(line) + 1
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(entry, dict) or "journal" in entry:
+            continue
+        entries.append((offset, entry))
+        if len(entries) >= limit:
+            break
+    return entries
+
+
+def _replay_journal(state: QueueState) -> None:
+    lines, offset = _read_journal_lines(state.offset)
+    position = state.offset
+    for line in lines:
+        position += len(line) + 1
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            LOGGER.warning("Skipping unreadable journal line in %s", JOURNAL_PATH)
+            continue
+        if not isinstance(entry, dict):
+            continue
+        if "journal" in entry:
+            state.generation = int(entry.get("generation") or 0)
+            continue
+        state.entries += 1
+        pos = state.positions.get(entry.get("asset_id"))
+        changes = entry.get("set")
+        if pos is None or not isinstance(changes, dict):
+            continue
+        # Records are replaced rather than mutated so lists handed out by
+        # earlier reads keep the values they were returned with.
+        state.records[pos] = {**state.records[pos], **changes}
+        state.changes.append((position, pos))
+    state.offset = offset
+
+
+def _load_queue_state() -> QueueState:
+    """Return the replayed queue, reading only what changed since last call."""
+
+    global _QUEUE_STATE
+    with _QUEUE_STATE_LOCK:
+        snapshot_signature = _snapshot_signature()
+        journal_inode, journal_size = _journal_stat()
+        state = _QUEUE_STATE
+        if state is not None and state.journal_inode == 0 and state.offset == 0:
+            # The first append created the journal; nothing was replayed yet.
+            state.journal_inode = journal_inode
+        if (
+            state is None
+            or state.snapshot_signature != snapshot_signature
+            or state.journal_inode != journal_inode
+            or journal_size < state.offset
+        ):
+            records = _read_snapshot()
+            positions = {str(entry["asset_id"]): pos for pos, entry in enumerate(records)}
+            state = QueueState(
+                snapshot_signature=snapshot_signature,
+                journal_inode=journal_inode,
+                records=records,
+                positions=positions,
+            )
+        if journal_size > state.offset:
+            _replay_journal(state)
+        _QUEUE_STATE = state
+        return state
+
+
+def _read_queue() -> List[dict]:
+    return list(_load_queue_state().records)
+
+
+def _entry_cell(entry: dict) -> Optional[str]:
+    cell_value = entry.get("cell") or entry.get("cell_key")
+    return str(cell_value) if cell_value else None
+
+
+def _entry_severity(entry: dict) -> float:
+    value = entry.get("severity")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    reasons = entry.get("reasons")
+    return float(len(reasons)) if isinstance(reasons, list) else 0.0
+
+
+def _queue_sort_key(entry: dict, sort: str) -> tuple:
+    asset_id = str(entry.get("asset_id") or "")
+    queued_at = str(entry.get("queued_at") or "")
+    if sort == "age":
+        return (queued_at, asset_id)
+    if sort == "severity":
+        return (-_entry_severity(entry), queued_at, asset_id)
+    return (asset_id,)
+
+
+def _index_terms(entry: dict) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Return the (status, cell, reason) terms ``entry`` is indexed under."""
+
+    status = entry.get("status")
+    cell = _entry_cell(entry)
+    reasons = entry.get("reasons")
+    return (
+        {str(status)} if status is not None else set(),
+        {cell} if cell else set(),
+        {str(item) for item in reasons} if isinstance(reasons, list) else set(),
+    )
+
+
+def _build_queue_index(state: QueueState) -> QueueIndex:
+    index = QueueIndex(state=state, records=list(state.records))
+    for pos, entry in enumerate(index.records):
+        for postings, terms in zip((index.by_status, index.by_cell, index.by_reason), _index_terms(entry)):
+            for term in terms:
+                postings.setdefault(term, []).append(pos)
+    return index
+
+
+def _queue_index() -> QueueIndex:
+    """Return the queue index brought up to date with the journal.
+
+    The caller holds ``_QUEUE_INDEX_LOCK`` while it reads the index, since
+    catching up replaces records in place.
+    """
+
+    global _QUEUE_INDEX
+    state = _load_queue_state()
+    index = _QUEUE_INDEX
+    if index is None or index.state is not state:
+        index = _build_queue_index(state)
+    else:
+        start = bisect_right(state.changes, index.offset, key=lambda change: change[0])
+        for pos in dict.fromkeys(pos for _offset, pos in state.changes[start:]):
+            index.replace(pos, state.records[pos])
+    index.offset = state.offset
+    index.cursor = _format_change_cursor(state.generation, state.offset)
+    _QUEUE_INDEX = index
+    return index
+
+
+def _select_positions(
+    index: QueueIndex,
+    status: Optional[str],
+    cell: Optional[str],
+    reason: Optional[str],
+) -> Optional[Set[int]]:
+    postings: List[List[int]] = []
+    if status:
+        postings.append(index.by_status.get(status, []))
+    if cell:
+        postings.append(index.by_cell.get(cell, []))
+    if reason:
+        postings.append(index.by_reason.get(reason, []))
+    if not postings:
+        return None
+    postings.sort(key=len)
+    selected = set(postings[0])
+    for posting in postings[1:]:
+        if not selected:
+            break
+        selected.intersection_update(posting)
+    return selected
+
+
+def _encode_cursor(key: tuple) -> str:
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as exc:
+        raise HTTPException(400, f"Invalid cursor: {exc}")
+    if not isinstance(data, list):
+        raise HTTPException(400, "Invalid cursor")
+    return tuple(data)
+
+
+def _paginate_queue(
+    index: QueueIndex,
+    selected: Optional[Set[int]],
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[dict], Optional[str]]:
+    if selected is not None and len(selected) * 4 < len(index.records):
+        positions = sorted(selected, key=lambda pos: _queue_sort_key(index.records[pos], sort))
+        keys = [_queue_sort_key(index.records[pos], sort) for pos in positions]
+        selected = None
+    else:
+        keys, positions = index.ordering(sort)
+
+    start = 0
+    if cursor:
+        after = _decode_cursor(cursor)
+        try:
+            start = bisect_right(keys, after)
+        except TypeError:
+            raise HTTPException(400, "Cursor does not match the requested sort order")
+
+    page: List[dict] = []
+    last_key: Optional[tuple] = None
+    has_more = False
+    for offset in range(start, len(positions)):
+        pos = positions[offset]
+        if selected is not None and pos not in selected:
+            continue
+        if len(page) == limit:
+            has_more = True
+            break
+        page.append(index.records[pos])
+        last_key = keys[offset]
+    next_cursor = _encode_cursor(last_key) if has_more and last_key is not None else None
+    return page, next_cursor
+
+
 def _atomic_write_json(path: Path, payload: object) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with tempfile.NamedTemporaryFile(
@@ -119,10 +600,88 @@ def _atomic_write_json(path: Path, payload: object) -> None:
     ) as handle:
         json.dump(payload, handle, ensure_ascii=False, indent=2)
         handle.write("\n")
+        handle.flush()
+        os.fsync(handle.fileno())
         temp_name = handle.name
     os.replace(temp_name, path)
 
 
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=str(path.parent), delete=False) as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+        temp_name = handle.name
+    os.replace(temp_name, path)
+
+
+def _append_journal(entries: List[dict]) -> None:
+    """Append ``entries`` with a single write and fsync."""
+
+    if not entries:
+        return
+    line = b"".join(
+        (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        for entry in entries
+    )
+    JOURNAL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(JOURNAL_PATH, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        prefix = b""
+        if size == 0:
+            prefix = _journal_header(0)
+        else:
+            os.lseek(fd, size - 1, os.SEEK_SET)
+            if os.read(fd, 1) != b"\n":
+                # Terminate a torn line left by a crashed writer so this
+                # entry is not glued onto it.
+                prefix = b"\n"
+        os.write(fd, prefix + line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _compact_journal(state: QueueState) -> None:
+    """Fold the journal into the snapshot.
+
+    The caller holds the queue lock exclusively, so no writer is appending.
+
+    Journal entries only ever set absolute field values, so a crash between
+    any two steps is harmless: replaying entries that already reached the
+    snapshot leaves the records unchanged.
+    """
+
+    global _QUEUE_STATE
+    lines, _ = _read_journal_lines(0)
+    entries: List[bytes] = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(entry, dict) and "journal" not in entry:
+            entries.append(line)
+    if entries:
+        archive_path = JOURNAL_ARCHIVE_DIR / f"adjudication_journal_{datetime.now(timezone.utc):%Y-%m-%d}.jsonl"
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        with archive_path.open("ab") as handle:
+            handle.write(b"\n".join(entries) + b"\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+    _atomic_write_json(QUEUE_PATH, state.records)
+    _atomic_write_bytes(JOURNAL_PATH, _journal_header(state.generation + 1))
+    with _QUEUE_STATE_LOCK:
+        _QUEUE_STATE = None
+    LOGGER.info(
+        "Compacted adjudication journal entries=%s generation=%s",
+        len(entries),
+        state.generation + 1,
+    )
+
+
 def _current_timestamp() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -144,26 +703,155 @@ def _get_actor(request: Request, fallback: Optional[str] = None) -> str:
     return "anonymous"
 
 
+def _journal_entry(op: str, asset_id: str, actor: str, before: dict, after: dict) -> dict:
+    return {
+        "ts": _current_timestamp(),
+        "op": op,
+        "asset_id": asset_id,
+        "actor": actor,
+        "set": {key: value for key, value in after.items() if before.get(key) != value},
+    }
+
+
+def _maybe_compact_journal() -> None:
+    """Compact once enough entries accumulated, unless writers are active.
+
+    Called after record locks are released. Compaction needs the queue lock
+    exclusively; when it is busy the attempt is simply left to a later call.
+    """
+
+    if _load_queue_state().entries < JOURNAL_COMPACT_EVERY:
+        return
+    with _file_lock(QUEUE_PATH.with_suffix(".lock"), blocking=False) as acquired:
+        if not acquired:
+            return
+        state = _load_queue_state()
+        if state.entries >= JOURNAL_COMPACT_EVERY:
+            _compact_journal(state)
+
+
+def rebuild_queue(merge: Callable[[List[dict]], List[dict]]) -> List[dict]:
+    """Replace the queue contents via ``merge`` under the exclusive lock.
+
+    ``merge`` receives copies of the current records with the journal
+    already applied, so statuses set by reviewers since the last snapshot
+    are visible to it. The result is written as a fresh snapshot through
+    compaction, unless ``merge`` changed nothing, in which case the queue
+    and its change-feed generation are left as they are. Used by offline
+    builders such as ``scripts/build_adjudication_queue.py``.
+    """
+
+    with _file_lock(QUEUE_PATH.with_suffix(".lock")):
+        state = _load_queue_state()
+        records = merge([dict(entry) for entry in state.records])
+        if records != state.records:
+            _compact_journal(replace(state, records=records))
+    return records
+
+
+def _record_version(entry: dict) -> int:
+    try:
+        return int(entry.get("version") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _record_etag(entry: dict) -> str:
+    return f'"{_record_version(entry)}"'
+
+
+def _check_if_match(entry: dict, if_match: Optional[str]) -> None:
+    if not if_match:
+        return
+    tags = [tag.strip() for tag in if_match.split(",") if tag.strip()]
+    if "*" in tags:
+        return
+    current = _record_etag(entry)
+    for tag in tags:
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if not tag.startswith('"'):
+            tag = f'"{tag}"'
+        if tag == current:
+            return
+    raise HTTPException(
+        409,
+        f"Asset {entry.get('asset_id')} was modified concurrently (current version {_record_version(entry)})",
+        headers={"ETag": current},
+    )
+
+
+def _apply_mutation(current: dict, mutator, if_match: Optional[str]) -> dict:
+    _check_if_match(current, if_match)
+    record = mutator(dict(current))
+    record["version"] = _record_version(current) + 1
+    return record
+
+
 def _update_queue_record(
     predicate_asset_id: str,
     mutator,
+    op: str,
+    actor: str,
+    if_match: Optional[str] = None,
 ) -> QueueUpdateResult:
-    queue = _read_queue()
-    record = None
-    for idx, entry in enumerate(queue):
-        if entry.get("asset_id") == predicate_asset_id:
-            record = mutator(dict(entry))
-            queue[idx] = record
-            break
-    if record is None:
-        raise HTTPException(404, f"Asset {predicate_asset_id} is not in the adjudication queue")
-    _atomic_write_json(QUEUE_PATH, queue)
-    return QueueUpdateResult(record=record, queue=queue)
+    """Apply ``mutator`` to one record and journal the changed fields.
+
+    Takes the record lock itself. Only the fields that changed, including
+    the bumped ``version``, are appended to the journal; the snapshot is
+    rewritten by compaction once enough entries have accumulated.
+    """
+
+    with _record_locks([predicate_asset_id]):
+        state = _load_queue_state()
+        pos = state.positions.get(predicate_asset_id)
+        if pos is None:
+            raise HTTPException(404, f"Asset {predicate_asset_id} is not in the adjudication queue")
+        current = state.records[pos]
+        record = _apply_mutation(current, mutator, if_match)
+        entry = _journal_entry(op, predicate_asset_id, actor, current, record)
+        _append_journal([entry])
+    _maybe_compact_journal()
+    return QueueUpdateResult(record=record, entry=entry, previous=current)
+
+
+def _assign_mutator(assignee: str):
+    def mutator(entry: dict) -> dict:
+        if entry.get("status") != "pending":
+            raise HTTPException(409, "Asset is no longer pending adjudication")
+        entry["status"] = "assigned"
+        entry["assignee"] = assignee
+        entry["last_seen_at"] = _current_timestamp()
+        return entry
+
+    return mutator
+
+
+def _status_mutator(status: str):
+    def mutator(entry: dict) -> dict:
+        entry["status"] = status
+        entry["last_seen_at"] = _current_timestamp()
+        return entry
+
+    return mutator
+
+
+def _promote_mutator(adjudicator_id: str):
+    def mutator(entry: dict) -> dict:
+        status = (entry.get("status") or "").lower()
+        if status not in {"assigned", "in_review"}:
+            raise HTTPException(409, "Asset is not ready for promotion")
+        entry["status"] = "locked"
+        entry["last_seen_at"] = _current_timestamp()
+        entry["adjudicator_id"] = adjudicator_id
+        return entry
+
+    return mutator
 
 
 def _load_json(path: Path) -> Optional[dict]:
     try:
-        text = path.read_text(encoding="utf-8")
+        text = read_artifact_text(path)
     except FileNotFoundError:
         return None
     if not text.strip():
@@ -177,58 +865,111 @@ def _load_json(path: Path) -> Optional[dict]:
     return None
 
 
-def _copy_tree(src: Path, dst: Path) -> None:
-    if not src.exists():
-        return
-    for root, dirs, files in os.walk(src):
-        rel = Path(root).relative_to(src)
-        target_root = dst / rel
-        target_root.mkdir(parents=True, exist_ok=True)
-        for name in files:
-            src_path = Path(root) / name
-            dst_path = target_root / name
-            shutil.copy2(src_path, dst_path)
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
-def _select_latest_pass_dir(asset_dir: Path) -> Optional[Path]:
-    candidates: List[tuple[int, float, Path]] = []
-    for path in asset_dir.rglob("pass_*"):
-        if not path.is_dir():
-            continue
-        if "merged" in {segment.lower() for segment in path.parts}:
-            continue
-        segment = path.name.lower()
-        if not segment.startswith("pass"):
-            continue
-        suffix = segment.split("pass")[-1]
-        try:
-            number = int("".join(ch for ch in suffix if ch.isdigit()))
-        except ValueError:
-            continue
+def _files_identical(left: Path, right: Path) -> bool:
+    try:
+        if os.path.samefile(left, right):
+            return True
+        if left.stat().st_size != right.stat().st_size:
+            return False
+        return _file_digest(left) == _file_digest(right)
+    except OSError:
+        return False
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl  # type: ignore
+    except ImportError:  # pragma: no cover - non POSIX platforms
+        return False
+    try:
+        with src.open("rb") as source, dst.open("wb") as target:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _stage_file(src: Path, dst: Path) -> str:
+    if MERGE_STAGING_MODE != "copy":
         try:
-            mtime = path.stat().st_mtime
+            os.link(src, dst)
+            return "link"
         except OSError:
-            mtime = 0.0
-        candidates.append((number, mtime, path))
-    if not candidates:
-        return None
-    candidates.sort(key=lambda item: (item[0], item[1]), reverse=True)
-    return candidates[0][2]
+            pass
+        if _reflink(src, dst):
+            return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def _iter_tree_files(src: Path) -> Iterable[Tuple[Path, Path]]:
+    for root, _dirs, files in os.walk(src):
+        rel = Path(root).relative_to(src)
+        for name in files:
+            yield Path(root) / name, rel / name
 
 
-def _prepare_merged_directory(asset_dir: Path) -> Path:
+def _stage_tree(src: Path, dst: Path, counts: Dict[str, int]) -> None:
+    """Populate ``dst`` from ``src`` without duplicating file contents.
+
+    Staged files may share an inode with their source, so an existing target
+    is always unlinked before being replaced, never written through.
+    """
+
+    if not src.exists():
+        return
+    for src_path, rel in _iter_tree_files(src):
+        dst_path = dst / rel
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        if dst_path.exists():
+            if _files_identical(src_path, dst_path):
+                counts["unchanged"] = counts.get("unchanged", 0) + 1
+                continue
+            dst_path.unlink()
+        method = _stage_file(src_path, dst_path)
+        counts[method] = counts.get(method, 0) + 1
+
+
+def _merged_is_current(pass_dir: Path, merged_dir: Path) -> bool:
+    for src_path, rel in _iter_tree_files(pass_dir):
+        target = merged_dir / rel
+        if not target.is_file() or not _files_identical(src_path, target):
+            return False
+    return True
+
+
+def _prepare_merged_directory(asset_dir: Path, pass_dir: Optional[Path]) -> Path:
     merged_dir = asset_dir / "merged"
+    existing_dir = merged_dir if merged_dir.is_dir() else None
+
+    if MERGE_INCREMENTAL and existing_dir and pass_dir:
+        if _merged_is_current(pass_dir, existing_dir):
+            LOGGER.info("Merged directory already current asset_dir=%s", asset_dir)
+            return merged_dir
+
     temp_dir = Path(
         tempfile.mkdtemp(prefix="merged_tmp_", dir=str(asset_dir))
     )
-
-    existing_dir = merged_dir if merged_dir.is_dir() else None
-    if existing_dir:
-        _copy_tree(existing_dir, temp_dir)
-
-    latest_pass_dir = _select_latest_pass_dir(asset_dir)
-    if latest_pass_dir:
-        _copy_tree(latest_pass_dir, temp_dir)
+    counts: Dict[str, int] = {}
+    try:
+        if existing_dir:
+            _stage_tree(existing_dir, temp_dir, counts)
+        if pass_dir:
+            _stage_tree(pass_dir, temp_dir, counts)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    LOGGER.info("Staged merged directory asset_dir=%s files=%s", asset_dir, counts)
 
     backup_dir: Optional[Path] = None
     if merged_dir.exists():
@@ -257,44 +998,120 @@ app = FastAPI()
 
 
 @app.get("/api/adjudication/queue")
-async def get_queue(status: Optional[str] = None, cell: Optional[str] = None, reason: Optional[str] = None):
-    queue = _read_queue()
+async def get_queue(
+    status: Optional[str] = None,
+    cell: Optional[str] = None,
+    reason: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    count_only: bool = False,
+):
+    """Return queue records, optionally filtered, sorted and paginated.
+
+    Without ``sort``, ``cursor`` or ``limit`` the full (filtered) list is
+    returned for backwards compatibility. Otherwise the response is a page
+    object with ``items``, ``total`` and an opaque ``next_cursor``.
+    """
+
+    if sort is not None and sort not in QUEUE_SORT_KEYS:
+        raise HTTPException(400, f"sort must be one of {', '.join(QUEUE_SORT_KEYS)}")
+    if limit is not None and limit <= 0:
+        raise HTTPException(400, "limit must be positive")
+
+    with _QUEUE_INDEX_LOCK:
+        index = _queue_index()
+        selected = _select_positions(index, status, cell, reason)
+        total = len(index.records) if selected is None else len(selected)
+        # Clients pass this to /api/adjudication/changes to tail updates made
+        # after the snapshot they just loaded.
+        headers = {"X-Adjudication-Cursor": index.cursor}
+
+        if count_only:
+            return JSONResponse({"count": total}, headers=headers)
+
+        if sort is None and cursor is None and limit is None:
+            if selected is None:
+                return JSONResponse(list(index.records), headers=headers)
+            return JSONResponse([index.records[pos] for pos in sorted(selected)], headers=headers)
+
+        page_limit = min(limit or QUEUE_PAGE_MAX_LIMIT, QUEUE_PAGE_MAX_LIMIT)
+        items, next_cursor = _paginate_queue(index, selected, sort or "asset_id", cursor, page_limit)
+    return JSONResponse(
+        {"items": items, "total": total, "next_cursor": next_cursor},
+        headers=headers,
+    )
+
+
+@app.get("/api/adjudication/changes")
+async def get_changes(since: Optional[str] = None, wait: float = 0.0):
+    """Long-poll feed of queue mutations recorded after ``since``.
+
+    Each change carries the journaled field deltas for one record. Without
+    ``since`` only the current cursor is returned. When the journal has been
+    compacted past the client's cursor the response sets ``reset`` and the
+    client should reload ``/api/adjudication/queue``.
+    """
+
+    deadline = time.monotonic() + max(0.0, min(wait, CHANGES_MAX_WAIT_SECONDS))
+    while True:
+        state = _load_queue_state()
+        current = _format_change_cursor(state.generation, state.offset)
+        if since is None:
+            return JSONResponse({"changes": [], "cursor": current, "reset": False}, headers=CHANGES_HEADERS)
+        generation, offset = _parse_change_cursor(since)
+        if generation != state.generation or offset > state.offset:
+            return JSONResponse({"changes": [], "cursor": current, "reset": True}, headers=CHANGES_HEADERS)
+        if offset < state.offset or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(CHANGES_POLL_INTERVAL_SECONDS)
+
+    # Compaction replaces the journal under the exclusive queue lock; holding
+    # it shared keeps the header and the tail read from the same file.
+    with _file_lock(QUEUE_PATH.with_suffix(".lock"), shared=True):
+        if _journal_generation() != generation:
+            state = _load_queue_state()
+            current = _format_change_cursor(state.generation, state.offset)
+            return JSONResponse({"changes": [], "cursor": current, "reset": True}, headers=CHANGES_HEADERS)
+        entries = _read_journal_entries(offset, CHANGES_MAX_ENTRIES)
+
+    changes = []
+    next_offset = offset
+    for end_offset, entry in entries:
+        if end_offset > state.offset:
+            break
+        next_offset = end_offset
+        changes.append({**entry, "cursor": _format_change_cursor(generation, end_offset)})
+    return JSONResponse(
+        {
+            "changes": changes,
+            "cursor": _format_change_cursor(generation, next_offset),
+            "reset": False,
+        },
+        headers=CHANGES_HEADERS,
+    )
 
-    def matches(entry: dict) -> bool:
-        if status and entry.get("status") != status:
-            return False
-        if cell:
-            cell_value = entry.get("cell") or entry.get("cell_key")
-            if not cell_value or str(cell_value) != cell:
-                return False
-        if reason:
-            reasons = entry.get("reasons") or []
-            if isinstance(reasons, list):
-                if reason not in reasons:
-                    return False
-            else:
-                return False
-        return True
 
-    if status or cell or reason:
-        queue = [entry for entry in queue if matches(entry)]
-    return queue
+@app.get("/api/adjudication/queue/{asset_id}")
+async def get_queue_record(asset_id: str):
+    state = _load_queue_state()
+    pos = state.positions.get(asset_id)
+    if pos is None:
+        raise HTTPException(404, f"Asset {asset_id} is not in the adjudication queue")
+    record = state.records[pos]
+    return JSONResponse(record, headers={"ETag": _record_etag(record), "Cache-Control": "no-store"})
 
 
 @app.post("/api/adjudication/assign")
 async def assign(request: Request, payload: AssignRequest):
     actor = _get_actor(request, payload.assignee)
-    lock_path = QUEUE_PATH.with_suffix(".lock")
-    with _file_lock(lock_path):
-        def mutator(entry: dict) -> dict:
-            if entry.get("status") != "pending":
-                raise HTTPException(409, "Asset is no longer pending adjudication")
-            entry["status"] = "assigned"
-            entry["assignee"] = payload.assignee
-            entry["last_seen_at"] = _current_timestamp()
-            return entry
-
-        result = _update_queue_record(payload.asset_id, mutator)
+    result = _update_queue_record(
+        payload.asset_id,
+        _assign_mutator(payload.assignee),
+        "assign",
+        actor,
+        request.headers.get("if-match"),
+    )
 
     LOGGER.info(
         "Queue assign asset=%s assignee=%s actor=%s",
@@ -302,24 +1119,23 @@ async def assign(request: Request, payload: AssignRequest):
         payload.assignee,
         actor,
     )
-    return result.record
+    return JSONResponse(result.record, headers={"ETag": _record_etag(result.record)})
 
 
 @app.post("/api/adjudication/status")
 async def update_status(request: Request, payload: StatusRequest):
     actor = _get_actor(request)
-    lock_path = QUEUE_PATH.with_suffix(".lock")
     normalized_status = (payload.status or "").strip()
     if not normalized_status:
         raise HTTPException(400, "Status must be provided")
 
-    with _file_lock(lock_path):
-        def mutator(entry: dict) -> dict:
-            entry["status"] = normalized_status
-            entry["last_seen_at"] = _current_timestamp()
-            return entry
-
-        result = _update_queue_record(payload.asset_id, mutator)
+    result = _update_queue_record(
+        payload.asset_id,
+        _status_mutator(normalized_status),
+        "status",
+        actor,
+        request.headers.get("if-match"),
+    )
 
     LOGGER.info(
         "Queue status asset=%s status=%s actor=%s",
@@ -327,59 +1143,348 @@ async def update_status(request: Request, payload: StatusRequest):
         normalized_status,
         actor,
     )
-    return result.record
+    return JSONResponse(result.record, headers={"ETag": _record_etag(result.record)})
+
+
+def _finalize_promotion(asset_dir: Path, adjudicator_id: str, timestamp: str) -> dict:
+    """Build ``merged/`` from the newest pass and mark ``item_meta.json`` locked.
+
+    Returns the ``adjudication`` block written to ``item_meta.json``, which
+    names the promoted pass directory. The caller holds the queue record
+    lock; ``item_meta.json`` is rewritten under the asset lock as well, since
+    annotation submits update it outside the queue.
+    """
+
+    with asset_lock(asset_dir):
+        adjudication = _write_promotion_meta(asset_dir, adjudicator_id, timestamp)
+    try:
+        SUMMARY_CACHE.note_clip(asset_dir)
+    except OSError:
+        LOGGER.exception("Failed to update export summary counts for %s", asset_dir.name)
+    return adjudication
+
+
+def _write_promotion_meta(asset_dir: Path, adjudicator_id: str, timestamp: str) -> dict:
+    # Runs under the asset lock shared with annotation submits, which merge
+    # their passes into the same item_meta.json.
+    meta_path = asset_dir / "item_meta.json"
+    meta = _load_json(meta_path) or {}
+    passes = discover_passes(asset_dir, meta)
+    if indexed_passes(meta) is None:
+        # Asset predates the pass index: backfill what was discovered.
+        meta[PASS_INDEX_KEY] = passes
+    pass_dir = latest_pass_dir(asset_dir, passes)
+    merged_dir = _prepare_merged_directory(asset_dir, pass_dir)
+    source = next(
+        (entry for entry in passes if pass_dir is not None and asset_dir / str(entry["path"]) == pass_dir),
+        None,
+    )
+
+    adjudication = meta.get("adjudication")
+    if not isinstance(adjudication, dict):
+        adjudication = {}
+    adjudication.update(
+        {
+            "status": "locked",
+            "adjudicator_id": adjudicator_id,
+            "decision_at": timestamp,
+            "merged_path": str(merged_dir.relative_to(asset_dir)),
+            "source_pass": source["path"] if source else None,
+            "source_pass_number": source["pass_number"] if source else None,
+        }
+    )
+    meta["adjudication"] = adjudication
+    meta["review_status"] = "locked"
+    _atomic_write_json(meta_path, meta)
+    return adjudication
+
+
+def _job_path(job_id: str) -> Path:
+    return JOBS_DIR / f"{job_id}.json"
+
+
+def _save_job(job: dict) -> dict:
+    job["updated_at"] = _current_timestamp()
+    _atomic_write_json(_job_path(job["job_id"]), job)
+    return job
+
+
+def _load_job(job_id: str) -> Optional[dict]:
+    safe_id = "".join(ch for ch in job_id if ch.isalnum() or ch == "-")
+    if not safe_id or safe_id != job_id:
+        return None
+    return _load_json(_job_path(job_id))
+
+
+def _update_owned_job(job_id: str, owner: Optional[str], changes: dict) -> Optional[dict]:
+    """Apply ``changes`` to the job if ``owner`` still holds it.
+
+    Jobs are claimed and updated under their asset's record lock, so a
+    worker that lost its job to a resubmission stops writing to it.
+    """
+
+    job = _load_job(job_id)
+    if job is None:
+        return None
+    with _file_lock(_record_lock_path(job["asset_id"])):
+        job = _load_job(job_id)
+        if job is None or (owner is not None and job.get("owner") != owner):
+            return None
+        job.update(changes)
+        return _save_job(job)
+
+
+def _claim_job(job_id: str, seen: dict) -> Optional[dict]:
+    """Take over a stale job for a new owner, unless someone else did first.
+
+    The claim is a compare-and-set: it only succeeds if the job's status
+    and ``updated_at`` are still what the caller ``seen``, so of several
+    pollers, in this process or others, exactly one resubmits the job.
+    """
+
+    with _file_lock(_record_lock_path(seen["asset_id"])):
+        job = _load_job(job_id)
+        if job is None or (job.get("status"), job.get("updated_at")) != (seen.get("status"), seen.get("updated_at")):
+            return None
+        job.update({"status": "queued", "owner": uuid.uuid4().hex})
+        return _save_job(job)
+
+
+def _run_promotion_job(job_id: str, owner: Optional[str] = None) -> None:
+    job = _update_owned_job(job_id, owner, {"status": "running", "started_at": _current_timestamp()})
+    if job is None:
+        with _ACTIVE_JOBS_LOCK:
+            _ACTIVE_JOBS.discard(job_id)
+        return
+    asset_dir = STAGE2_OUTPUT_DIR / job["asset_id"]
+    try:
+        with _file_lock(asset_dir / ".adjudication.lock"):
+            adjudication = _finalize_promotion(asset_dir, job["adjudicator_id"], job["decision_at"])
+        _update_owned_job(
+            job_id,
+            owner,
+            {
+                "status": "succeeded",
+                "finished_at": _current_timestamp(),
+                "result": {
+                    key: adjudication.get(key)
+                    for key in ("merged_path", "source_pass", "source_pass_number")
+                },
+            },
+        )
+        LOGGER.info("Promotion job succeeded job=%s asset=%s", job_id, job["asset_id"])
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else repr(exc)
+        LOGGER.error("Promotion job failed job=%s asset=%s error=%s", job_id, job["asset_id"], detail)
+        # Hand the asset back to its reviewer so the promotion can be retried,
+        # unless a resubmission has taken the job over.
+        current = _load_job(job_id) or {}
+        if owner is None or current.get("owner") == owner:
+            try:
+                _update_queue_record(
+                    job["asset_id"],
+                    _status_mutator(job.get("previous_status") or "assigned"),
+                    "promote_failed",
+                    job.get("actor") or "system",
+                )
+            except HTTPException:
+                pass
+        _update_owned_job(job_id, owner, {"status": "failed", "finished_at": _current_timestamp(), "error": detail})
+    finally:
+        with _ACTIVE_JOBS_LOCK:
+            _ACTIVE_JOBS.discard(job_id)
+
+
+def _submit_job(job_id: str, owner: Optional[str] = None) -> None:
+    with _ACTIVE_JOBS_LOCK:
+        if job_id in _ACTIVE_JOBS:
+            return
+        _ACTIVE_JOBS.add(job_id)
+    if PROMOTE_MODE == "inline":
+        _run_promotion_job(job_id, owner)
+    else:
+        _PROMOTION_POOL.submit(_run_promotion_job, job_id, owner)
+
+
+def _enqueue_promotion(asset_id: str, adjudicator_id: str, actor: str, before: dict, record: dict) -> dict:
+    """Persist a queued promotion job and hand it to the worker pool.
+
+    In ``inline`` mode the job has finished by the time this returns and
+    its final state is returned. The caller has already moved the queue
+    record to ``locked``.
+    """
+
+    now = _current_timestamp()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "type": "promote",
+        "asset_id": asset_id,
+        "adjudicator_id": adjudicator_id,
+        "actor": actor,
+        "previous_status": before.get("status"),
+        "decision_at": record.get("last_seen_at") or now,
+        "status": "queued",
+        "owner": uuid.uuid4().hex,
+        "created_at": now,
+    }
+    _save_job(job)
+    _submit_job(job["job_id"], job["owner"])
+    if PROMOTE_MODE == "inline":
+        return _load_job(job["job_id"]) or job
+    return job
+
+
+def _job_is_stale(job: dict) -> bool:
+    if job.get("status") not in {"queued", "running"}:
+        return False
+    try:
+        updated = datetime.fromisoformat(str(job.get("updated_at")).replace("Z", "+00:00"))
+    except ValueError:
+        return True
+    return (datetime.now(timezone.utc) - updated).total_seconds() > JOB_STALE_SECONDS
 
 
 @app.post("/api/adjudication/promote")
 async def promote(request: Request, payload: PromoteRequest):
+    """Lock the queue record and enqueue the merge as a background job.
+
+    Responds ``202`` with the job; poll ``/api/adjudication/jobs/{job_id}``
+    for completion. The queue transition happens inline so an asset that
+    is not promotable still fails fast with ``409``.
+
+    Background jobs need a long-running server process. With
+    ``ADJUDICATION_PROMOTE_MODE=inline`` (the default on Vercel) the merge
+    runs before responding and the finished job comes back with ``200``.
+    """
+
     actor = _get_actor(request, payload.adjudicator_id)
 
     asset_dir = STAGE2_OUTPUT_DIR / payload.asset_id
     if not asset_dir.exists():
         raise HTTPException(404, f"Asset directory not found for {payload.asset_id}")
 
-    asset_lock = asset_dir / ".adjudication.lock"
-    queue_lock = QUEUE_PATH.with_suffix(".lock")
-    with _file_lock(asset_lock):
-        with _file_lock(queue_lock):
-
-            def mutator(entry: dict) -> dict:
-                status = (entry.get("status") or "").lower()
-                if status not in {"assigned", "in_review"}:
-                    raise HTTPException(409, "Asset is not ready for promotion")
-                entry["status"] = "locked"
-                entry["last_seen_at"] = _current_timestamp()
-                entry["adjudicator_id"] = payload.adjudicator_id
-                return entry
-
-            result = _update_queue_record(payload.asset_id, mutator)
-
-        merged_dir = _prepare_merged_directory(asset_dir)
-
-        meta_path = asset_dir / "item_meta.json"
-        meta = _load_json(meta_path) or {}
-        adjudication = meta.get("adjudication")
-        if not isinstance(adjudication, dict):
-            adjudication = {}
-        timestamp = result.record.get("last_seen_at") or _current_timestamp()
-        adjudication.update(
-            {
-                "status": "locked",
-                "adjudicator_id": payload.adjudicator_id,
-                "decision_at": timestamp,
-                "merged_path": str(merged_dir.relative_to(asset_dir)),
-            }
-        )
-        meta["adjudication"] = adjudication
-        meta["review_status"] = "locked"
-        _atomic_write_json(meta_path, meta)
+    result = _update_queue_record(
+        payload.asset_id,
+        _promote_mutator(payload.adjudicator_id),
+        "promote",
+        actor,
+        request.headers.get("if-match"),
+    )
+    job = _enqueue_promotion(
+        payload.asset_id, payload.adjudicator_id, actor, result.previous, result.record
+    )
 
     LOGGER.info(
-        "Queue promote asset=%s adjudicator=%s actor=%s",
+        "Queue promote asset=%s adjudicator=%s actor=%s job=%s",
         payload.asset_id,
         payload.adjudicator_id,
         actor,
+        job["job_id"],
+    )
+    return JSONResponse(
+        {"job": job, "record": result.record},
+        status_code=200 if PROMOTE_MODE == "inline" else 202,
+        headers={
+            "Location": f"/api/adjudication/jobs/{job['job_id']}",
+            "ETag": _record_etag(result.record),
+        },
     )
-    return result.record
 
 
+@app.get("/api/adjudication/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = _load_job(job_id)
+    if job is None:
+        raise HTTPException(404, f"Job {job_id} not found")
+    if _job_is_stale(job):
+        with _ACTIVE_JOBS_LOCK:
+            owned = job_id in _ACTIVE_JOBS
+        claimed = None if owned else _claim_job(job_id, job)
+        if claimed is not None:
+            LOGGER.warning("Resubmitting stale promotion job=%s", job_id)
+            _submit_job(job_id, claimed["owner"])
+            job = _load_job(job_id) or claimed
+    return JSONResponse(job, headers={"Cache-Control": "no-store"})
+
+
+def _bulk_mutator(operation: BulkOperation, actor: str):
+    op = (operation.op or "").strip().lower()
+    if op == "assign":
+        assignee = (operation.assignee or "").strip()
+        if not assignee:
+            raise HTTPException(400, "assignee must be provided")
+        return _assign_mutator(assignee)
+    if op == "status":
+        status = (operation.status or "").strip()
+        if not status:
+            raise HTTPException(400, "Status must be provided")
+        return _status_mutator(status)
+    if op == "promote":
+        if not (STAGE2_OUTPUT_DIR / operation.asset_id).exists():
+            raise HTTPException(404, f"Asset directory not found for {operation.asset_id}")
+        return _promote_mutator(operation.adjudicator_id or actor)
+    raise HTTPException(400, f"Unsupported operation {operation.op!r}")
+
+
+@app.post("/api/adjudication/bulk")
+async def bulk(request: Request, payload: BulkRequest):
+    """Apply many assign/status/promote operations in one lock acquisition.
+
+    The touched records are locked together, and queue changes for every
+    operation that passes validation (including its optional ``if_match``
+    version check) are journaled with a single append; rejected operations
+    are reported per item and do not affect the others. Promotions are enqueued as jobs
+    (run before responding in ``inline`` mode) and report their ``job_id``.
+    """
+
+    actor = _get_actor(request)
+    if len(payload.operations) > BULK_MAX_OPERATIONS:
+        raise HTTPException(400, f"At most {BULK_MAX_OPERATIONS} operations per request")
+
+    results: List[dict] = []
+    promotions: List[Tuple[int, dict, dict]] = []
+    with _record_locks(operation.asset_id for operation in payload.operations):
+        state = _load_queue_state()
+        working: Dict[str, dict] = {}
+        entries: List[dict] = []
+        for idx, operation in enumerate(payload.operations):
+            op = (operation.op or "").strip().lower()
+            result = {"index": idx, "op": op, "asset_id": operation.asset_id}
+            try:
+                mutator = _bulk_mutator(operation, actor)
+                current = working.get(operation.asset_id)
+                if current is None:
+                    pos = state.positions.get(operation.asset_id)
+                    if pos is None:
+                        raise HTTPException(
+                            404, f"Asset {operation.asset_id} is not in the adjudication queue"
+                        )
+                    current = state.records[pos]
+                record = _apply_mutation(current, mutator, operation.if_match)
+            except HTTPException as exc:
+                result.update({"ok": False, "status_code": exc.status_code, "error": exc.detail})
+                results.append(result)
+                continue
+            working[operation.asset_id] = record
+            entries.append(_journal_entry(op, operation.asset_id, actor, current, record))
+            result.update({"ok": True, "record": record, "etag": _record_etag(record)})
+            results.append(result)
+            if op == "promote":
+                promotions.append((idx, current, record))
+        _append_journal(entries)
+    _maybe_compact_journal()
+
+    for idx, before, record in promotions:
+        job = _enqueue_promotion(
+            record["asset_id"], record.get("adjudicator_id") or actor, actor, before, record
+        )
+        results[idx]["job_id"] = job["job_id"]
+
+    LOGGER.info(
+        "Queue bulk operations=%s applied=%s promotions=%s actor=%s",
+        len(payload.operations),
+        len(entries),
+        len(promotions),
+        actor,
+    )
+    return {"results": results}
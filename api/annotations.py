@@ -1,14 +1,40 @@
-from fastapi import FastAPI, Request, Query
+from fastapi import BackgroundTasks, FastAPI, Request, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import json
+import logging
 import os
+import tempfile
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from api._artifact_io import encode_for_storage, load_artifact_json, stale_variants
+from api._asset_lock import asset_lock, write_json_atomic
+from api._blob_store import BlobStore, is_blob_eligible
+from api._export_cache import ExportCache
+from api._idempotency import IdempotencyStore, request_key
+from api._ingest_wal import IngestWAL, WALRetryableError
+from api._insert_coalescer import InsertCoalescer
+from api._pass_index import indexed_passes, record_pass
+from api._paths import data_dir
+from api._qa_derive import derive_agreement, derive_submission_metrics
+from api._qa_rollup import QARollupStore, contribution_from_qa
+from api._stage2_summary import SummaryCache
+
 app = FastAPI()
 
+LOGGER = logging.getLogger("annotations_api")
+if not LOGGER.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+    handler.setFormatter(formatter)
+    LOGGER.addHandler(handler)
+LOGGER.setLevel(logging.INFO)
+
 # Supabase config (flexible names)
 SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = (
@@ -22,6 +48,89 @@ TABLE_BATCH = os.environ.get("SUPABASE_STAGE2_BATCH_TABLE", TABLE_SINGLE)
 
 STAGE2_OUTPUT_DIR = Path(os.environ.get("STAGE2_OUTPUT_DIR", "data/stage2_output"))
 
+# With content addressing on, artifact files are hardlinks into a shared
+# blob store so identical bodies across passes are stored once. Keep the
+# blob directory on the same filesystem as STAGE2_OUTPUT_DIR.
+STAGE2_CONTENT_ADDRESSED = (os.environ.get("STAGE2_CONTENT_ADDRESSED") or "").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+}
+STAGE2_BLOB_DIR = Path(os.environ.get("STAGE2_BLOB_DIR") or STAGE2_OUTPUT_DIR.parent / "stage2_blobs")
+BLOB_STORE: Optional[BlobStore] = BlobStore(STAGE2_BLOB_DIR) if STAGE2_CONTENT_ADDRESSED else None
+
+# Clip counts served by /api/export/summary; each submit recounts its asset.
+# data_dir resolves it the same way api/export.py and api/adjudication.py do.
+STAGE2_SUMMARY_DIR = data_dir("STAGE2_SUMMARY_DIR", str(STAGE2_OUTPUT_DIR.parent / "stage2_summary"))
+SUMMARY_CACHE = SummaryCache(STAGE2_OUTPUT_DIR, STAGE2_SUMMARY_DIR)
+
+# Running QA sums per annotator, cell and day behind /api/export/qa_rollup;
+# every qa_result.json write updates them.
+QA_ROLLUP_DIR = data_dir("QA_ROLLUP_DIR", "data/qa_rollup")
+QA_ROLLUP = QARollupStore(QA_ROLLUP_DIR)
+
+# Cached /api/export archives for an asset are dropped when it gets a new
+# submission; data_dir resolves it the same way api/export.py does.
+EXPORT_CACHE = ExportCache(
+    data_dir("EXPORT_CACHE_DIR", "data/export_cache"),
+    int(os.environ.get("EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)) or 0),
+)
+
+# When enabled, POST /api/annotations appends to a local write-ahead log and
+# returns 202; a background flusher inserts into Supabase and writes the
+# artifacts. Needs a persistent disk and a long-lived process, so it stays
+# off by default for serverless deployments.
+INGEST_WAL_ENABLED = (os.environ.get("ANNOTATIONS_WAL") or "").strip().lower() in {"1", "true", "yes"}
+INGEST_WAL_DIR = Path(os.environ.get("ANNOTATIONS_WAL_DIR", "data/ingest_wal"))
+INGEST_WAL_BATCH_SIZE = int(os.environ.get("ANNOTATIONS_WAL_BATCH_SIZE", "100") or 100)
+INGEST_WAL_FLUSH_INTERVAL = float(os.environ.get("ANNOTATIONS_WAL_FLUSH_INTERVAL", "0.25") or 0.25)
+
+PERSIST_WORKERS = max(1, int(os.environ.get("ANNOTATIONS_PERSIST_WORKERS", "8") or 8))
+_PERSIST_POOL = ThreadPoolExecutor(max_workers=PERSIST_WORKERS, thread_name_prefix="annotations-persist")
+
+# Retried submissions are answered from this store instead of being written
+# again. Requests are keyed by their Idempotency-Key header. Keying requests
+# without one by a hash of the body is opt-in, since it also collapses
+# deliberate resubmissions of an identical body.
+IDEMPOTENCY_DIR = Path(os.environ.get("ANNOTATIONS_IDEMPOTENCY_DIR", "data/idempotency"))
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("ANNOTATIONS_IDEMPOTENCY_TTL_SECONDS", "86400") or 86400)
+IDEMPOTENCY_MAX_ENTRIES = int(os.environ.get("ANNOTATIONS_IDEMPOTENCY_MAX_ENTRIES", "10000") or 10000)
+IDEMPOTENCY_PRUNE_SECONDS = float(os.environ.get("ANNOTATIONS_IDEMPOTENCY_PRUNE_SECONDS", "300") or 300)
+IDEMPOTENCY_CONTENT_HASH = (os.environ.get("ANNOTATIONS_IDEMPOTENCY_CONTENT_HASH") or "").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+}
+IDEMPOTENCY_STORE = IdempotencyStore(
+    IDEMPOTENCY_DIR, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_PRUNE_SECONDS
+)
+
+# Cue statistics, translation coverage and agreement with the asset's other
+# pass are computed once after the response is sent and stored under
+# "derived" in the annotator's qa_result.json plus a per-asset
+# qa_metrics.json row.
+DERIVE_QA_METRICS = (os.environ.get("ANNOTATIONS_DERIVE_QA") or "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
+
+# Batch inserts are split so no request exceeds either bound, then sent
+# with limited concurrency; each chunk is retried on its own.
+SUPABASE_CHUNK_ROWS = max(1, int(os.environ.get("SUPABASE_INSERT_CHUNK_ROWS", "200") or 200))
+SUPABASE_CHUNK_BYTES = max(1024, int(os.environ.get("SUPABASE_INSERT_CHUNK_BYTES", "1048576") or 1048576))
+SUPABASE_INSERT_CONCURRENCY = max(1, int(os.environ.get("SUPABASE_INSERT_CONCURRENCY", "4") or 4))
+SUPABASE_INSERT_RETRIES = max(0, int(os.environ.get("SUPABASE_INSERT_RETRIES", "2") or 0))
+SUPABASE_RETRY_BACKOFF_SECONDS = 0.5
+_SUPABASE_POOL = ThreadPoolExecutor(
+    max_workers=SUPABASE_INSERT_CONCURRENCY, thread_name_prefix="annotations-supabase"
+)
+
+# Concurrent single submissions that arrive within this window are sent to
+# Supabase as one bulk insert. Set to 0 to insert each one on its own.
+SUPABASE_COALESCE_WINDOW_MS = max(0.0, float(os.environ.get("SUPABASE_COALESCE_WINDOW_MS", "20") or 0))
+SUPABASE_COALESCE_MAX_ROWS = max(1, int(os.environ.get("SUPABASE_COALESCE_MAX_ROWS", "100") or 100))
+
 
 FILE_OUTPUT_MAP = {
     "transcript_vtt": "transcript.vtt",
@@ -65,14 +174,33 @@ def _asset_output_dir(asset_id: str) -> Path:
 
 
 def _write_text_file(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    target, data = encode_for_storage(path, content.encode("utf-8"))
+    if BLOB_STORE is not None and is_blob_eligible(target):
+        BLOB_STORE.write_view(target, data)
+    else:
+        # Write to a sibling temp file and rename so a file that adjudication
+        # has hardlinked into merged/ is replaced rather than rewritten in place.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=str(path.parent), prefix=f".{path.name}.", delete=False
+        ) as handle:
+            handle.write(data)
+            temp_name = handle.name
+        os.replace(temp_name, target)
+    # Drop the copy left by a write under a different compression setting.
+    for stale in stale_variants(path, target):
+        try:
+            stale.unlink()
+        except FileNotFoundError:
+            pass
 
 
-def _persist_annotation_files(
+def _write_annotation_artifacts(
     payload: Dict[str, Any],
     annotator: str,
-) -> Optional[datetime]:
+) -> Optional[Tuple[Path, str, datetime]]:
+    """Write one submission's files; return (asset_dir, annotator_id, submitted_at)."""
+
     asset_id = payload.get("asset_id")
     files = payload.get("files") if isinstance(payload.get("files"), dict) else {}
     if not asset_id or not isinstance(files, dict):
@@ -106,21 +234,108 @@ def _persist_annotation_files(
             pass
     submitted_at = datetime.utcnow()
     qa_record["submitted_at"] = submitted_at.isoformat() + "Z"
-    _write_text_file(
-        annotator_dir / "qa_result.json",
-        json.dumps(qa_record, ensure_ascii=False, indent=2),
+    # Held so a derive task for an earlier submission either finishes
+    # before this one lands or sees the new submitted_at and stands down.
+    with asset_lock(asset_dir):
+        _write_text_file(
+            annotator_dir / "qa_result.json",
+            json.dumps(qa_record, ensure_ascii=False, indent=2),
+        )
+        _record_qa_rollup(asset_dir, annotator_id, qa_record, payload)
+
+        annotation_path = annotator_dir / "annotation.json"
+        _write_text_file(
+            annotation_path,
+            json.dumps(payload, ensure_ascii=False, indent=2),
+        )
+    return asset_dir, annotator_id, submitted_at
+
+
+def _record_qa_rollup(
+    asset_dir: Path,
+    annotator_id: str,
+    qa_record: Dict[str, Any],
+    payload: Dict[str, Any],
+) -> None:
+    contribution = contribution_from_qa(
+        qa_record, annotator_id, payload.get("assigned_cell"), qa_record.get("submitted_at")
     )
+    try:
+        QA_ROLLUP.record(f"{asset_dir.name}/{annotator_id}", contribution)
+    except OSError:
+        LOGGER.exception("Failed to update QA rollup for %s/%s", asset_dir.name, annotator_id)
 
-    annotation_path = annotator_dir / "annotation.json"
-    _write_text_file(
-        annotation_path,
-        json.dumps(payload, ensure_ascii=False, indent=2),
-    )
 
-    _update_item_meta(asset_dir, asset_id, annotator_id, submitted_at, payload)
+def _persist_annotation_files(
+    payload: Dict[str, Any],
+    annotator: str,
+) -> Optional[datetime]:
+    written = _write_annotation_artifacts(payload, annotator)
+    if written is None:
+        return None
+    asset_dir, annotator_id, submitted_at = written
+    _update_item_meta(asset_dir, payload.get("asset_id"), [(annotator_id, submitted_at, payload)])
     return submitted_at
 
 
+def _persist_annotation_batch(items: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """Persist many submissions with one ``item_meta.json`` write per asset.
+
+    Artifact files are written on a thread pool, one task per
+    (asset, annotator) directory so submissions to the same directory keep
+    their order. The metadata updates for an asset are then merged and
+    written once. Returns a status dict per item, in input order.
+    """
+
+    results: List[Dict[str, Any]] = [
+        {"index": index, "asset_id": payload.get("asset_id") if isinstance(payload, dict) else None}
+        for index, (payload, _annotator) in enumerate(items)
+    ]
+    dir_groups: Dict[Tuple[str, str], List[int]] = {}
+    for index, (payload, annotator) in enumerate(items):
+        if not isinstance(payload, dict) or not payload.get("asset_id") or not isinstance(
+            payload.get("files"), dict
+        ):
+            results[index].update(status="skipped", error="asset_id and files are required")
+            continue
+        key = (_safe_asset_dirname(payload["asset_id"]), _sanitize_annotator_id(annotator))
+        dir_groups.setdefault(key, []).append(index)
+
+    written: Dict[int, Tuple[Path, str, datetime]] = {}
+
+    def write_group(indices: List[int]) -> None:
+        for index in indices:
+            payload, annotator = items[index]
+            try:
+                outcome = _write_annotation_artifacts(payload, annotator)
+            except Exception as exc:
+                results[index].update(status="error", error=f"file_persist_error={exc!r}")
+                continue
+            if outcome is not None:
+                written[index] = outcome
+
+    list(_PERSIST_POOL.map(write_group, dir_groups.values()))
+
+    meta_groups: Dict[Path, List[int]] = {}
+    for index in sorted(written):
+        meta_groups.setdefault(written[index][0], []).append(index)
+
+    def update_meta(asset_dir: Path) -> None:
+        indices = meta_groups[asset_dir]
+        updates = [(written[i][1], written[i][2], items[i][0]) for i in indices]
+        try:
+            _update_item_meta(asset_dir, items[indices[-1]][0].get("asset_id"), updates)
+        except Exception as exc:
+            for index in indices:
+                results[index].update(status="error", error=f"item_meta_error={exc!r}")
+            return
+        for index in indices:
+            results[index].update(status="ok", submitted_at=written[index][2].isoformat() + "Z")
+
+    list(_PERSIST_POOL.map(update_meta, list(meta_groups)))
+    return results
+
+
 def _load_item_meta(meta_path: Path) -> Dict[str, Any]:
     if not meta_path.is_file():
         return {}
@@ -130,16 +345,13 @@ def _load_item_meta(meta_path: Path) -> Dict[str, Any]:
         return {}
 
 
-def _update_item_meta(
-    asset_dir: Path,
+def _merge_item_meta(
+    meta: Dict[str, Any],
     asset_id: str,
     annotator_id: str,
     submitted_at: datetime,
     payload: Dict[str, Any],
 ) -> None:
-    meta_path = asset_dir / "item_meta.json"
-    meta = _load_item_meta(meta_path)
-
     meta["asset_id"] = asset_id
     if "double_pass_target" in payload:
         meta["double_pass_target"] = bool(payload.get("double_pass_target"))
@@ -180,9 +392,125 @@ def _update_item_meta(
         }
     )
     meta["assignments"] = assignments
+    record_pass(meta, pass_number, annotator_id, submitted_at.isoformat() + "Z")
 
-    meta_path.parent.mkdir(parents=True, exist_ok=True)
-    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def _update_item_meta(
+    asset_dir: Path,
+    asset_id: str,
+    updates: List[Tuple[str, datetime, Dict[str, Any]]],
+) -> None:
+    """Apply ``(annotator_id, submitted_at, payload)`` updates in one write."""
+
+    meta_path = asset_dir / "item_meta.json"
+    # Submits for one asset can run at once, here and in other workers, and
+    # promotes rewrite the same file; merge under the asset lock so none of
+    # them is lost.
+    with asset_lock(asset_dir):
+        meta = _load_item_meta(meta_path)
+        for annotator_id, submitted_at, payload in updates:
+            _merge_item_meta(meta, asset_id, annotator_id, submitted_at, payload)
+        write_json_atomic(meta_path, meta)
+    try:
+        SUMMARY_CACHE.note_clip(asset_dir)
+    except OSError:
+        LOGGER.exception("Failed to update export summary counts for %s", asset_id)
+    EXPORT_CACHE.invalidate(asset_id)
+
+
+def _load_artifact_dict(path: Path) -> Dict[str, Any]:
+    try:
+        data = load_artifact_json(path)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _reference_pass(meta: Dict[str, Any], annotator_id: str) -> Optional[str]:
+    """Return the newest other pass directory recorded for the asset."""
+
+    entries = [entry for entry in indexed_passes(meta) or [] if entry["path"] != annotator_id]
+    return str(entries[-1]["path"]) if entries else None
+
+
+def _derive_qa_metrics(asset_id: str, annotator: str, submitted_at: Optional[str] = None) -> None:
+    """Compute derived QA metrics for a stored submission and record them.
+
+    ``submitted_at`` is the value the submission wrote to its
+    ``qa_result.json``; if the annotator has submitted again since the task
+    was queued, the newer submission's own task does the work instead.
+    """
+
+    annotator_id = _sanitize_annotator_id(annotator)
+    asset_dir = _asset_output_dir(asset_id)
+    with asset_lock(asset_dir):
+        qa_path = asset_dir / annotator_id / "qa_result.json"
+        qa_record = _load_artifact_dict(qa_path)
+        if submitted_at is not None and qa_record.get("submitted_at") != submitted_at:
+            LOGGER.info(
+                "Skipping stale QA derivation asset_id=%s annotator=%s submitted_at=%s",
+                asset_id,
+                annotator_id,
+                submitted_at,
+            )
+            return
+        payload = _load_artifact_dict(asset_dir / annotator_id / "annotation.json")
+        files = payload.get("files") if isinstance(payload.get("files"), dict) else None
+        if files is None:
+            return
+        derived = derive_submission_metrics(files)
+        meta = _load_item_meta(asset_dir / "item_meta.json")
+        reference_id = _reference_pass(meta, annotator_id)
+        reference = _load_artifact_dict(asset_dir / reference_id / "annotation.json") if reference_id else {}
+        if isinstance(reference.get("files"), dict):
+            derived["agreement"] = {"reference": reference_id, **derive_agreement(files, reference["files"])}
+        computed_at = datetime.utcnow().isoformat() + "Z"
+        derived["computed_at"] = computed_at
+
+        # Kept apart from the client's own fields: readers fall back to
+        # ``derived`` only when the client reported nothing, and pass-vs-pass
+        # agreement never stands in for the gold-based codeswitch_f1 or
+        # diarization_mae.
+        qa_record["derived"] = derived
+        agreement = derived.get("agreement")
+        _write_text_file(qa_path, json.dumps(qa_record, ensure_ascii=False, indent=2))
+        _record_qa_rollup(asset_dir, annotator_id, qa_record, payload)
+
+        row_path = asset_dir / "qa_metrics.json"
+        row = _load_artifact_dict(row_path)
+        passes = row.get("passes") if isinstance(row.get("passes"), dict) else {}
+        passes[annotator_id] = {
+            "pass_number": payload.get("pass_number"),
+            "cue_count": derived["cues"]["cue_count"],
+            "cue_diff_sec": derived["cue_diff_sec"],
+            "translation_completeness": derived["translation_completeness"],
+            "translation_char_ratio": derived["translation_char_ratio"],
+            "computed_at": computed_at,
+        }
+        row.update(asset_id=asset_id, passes=passes, updated_at=computed_at)
+        if agreement:
+            alignment = agreement["cue_alignment"]
+            row["agreement"] = {
+                "passes": sorted([annotator_id, reference_id]),
+                "codeswitch_f1": agreement["codeswitch_f1"],
+                "diarization_mae": agreement["diarization_mae"],
+                "cue_pairs": alignment["pairs"],
+                "voice_tag_agreement": alignment["voice_tag_agreement"],
+                "overlap_ratio": alignment["overlap_ratio"],
+                "start_deviation_mean": alignment["start_deviation"]["mean"],
+                "computed_at": computed_at,
+            }
+        _write_text_file(row_path, json.dumps(row, ensure_ascii=False, indent=2))
+
+
+def _derive_qa_metrics_safely(targets: List[Tuple[str, str, Optional[str]]]) -> None:
+    """Run :func:`_derive_qa_metrics` for distinct ``(asset_id, annotator, submitted_at)`` targets."""
+
+    for asset_id, annotator, submitted_at in dict.fromkeys(targets):
+        try:
+            _derive_qa_metrics(asset_id, annotator, submitted_at)
+        except Exception:
+            LOGGER.exception("Failed to derive QA metrics asset_id=%s annotator=%s", asset_id, annotator)
 
 
 def _supabase_headers() -> Dict[str, str]:
@@ -194,9 +522,208 @@ def _supabase_headers() -> Dict[str, str]:
     }
 
 
-@app.post("/api/annotations")
-async def post_annotation(req: Request, annotator: str = Query("anonymous")):
-    payload = await req.json()
+def _wal_supabase_sink(entries: List[Dict[str, Any]]) -> None:
+    """Insert WAL records, dropping only rows Supabase rejects as bad data.
+
+    Anything else (an outage, rate limiting, or an auth, table or schema
+    error that would hit every row) stalls the sink at the first such
+    chunk, so the records stay in the log until it is fixed. Chunks after
+    that point are sent again on the retry, as with any WAL replay.
+    """
+
+    if not (SUPABASE_URL and SUPABASE_KEY):
+        return
+    records = [entry["record"] for entry in entries]
+    delivered = len(entries)
+    errors = []
+    for chunk in sorted(_insert_supabase_batch(TABLE_SINGLE, records), key=lambda chunk: chunk["start"]):
+        if chunk["saved"]:
+            continue
+        ids = [entry["id"] for entry in entries[chunk["start"] : chunk["start"] + chunk["count"]]]
+        if chunk.get("row_error"):
+            LOGGER.warning("Dropping WAL records rejected by Supabase error=%s ids=%s", chunk["error"], ids)
+        else:
+            delivered = min(delivered, chunk["start"])
+            errors.append(chunk["error"])
+    if errors:
+        raise WALRetryableError(f"Supabase insert failed: {errors[0]}", delivered=delivered)
+
+
+def _wal_files_sink(entries: List[Dict[str, Any]]) -> None:
+    items = [
+        (entry["record"].get("data") or {}, entry["record"].get("annotator") or "anonymous")
+        for entry in entries
+    ]
+    derive: List[Tuple[str, str, Optional[str]]] = []
+    for entry, result, (payload, annotator) in zip(entries, _persist_annotation_batch(items), items):
+        if result.get("status") == "error":
+            LOGGER.warning("Failed to persist WAL record id=%s error=%s", entry["id"], result["error"])
+        elif result.get("status") == "ok":
+            derive.append((payload["asset_id"], annotator, result.get("submitted_at")))
+    if DERIVE_QA_METRICS:
+        _derive_qa_metrics_safely(derive)
+
+
+INGEST_WAL: Optional[IngestWAL] = (
+    IngestWAL(
+        INGEST_WAL_DIR,
+        {"supabase": _wal_supabase_sink, "files": _wal_files_sink},
+        batch_size=INGEST_WAL_BATCH_SIZE,
+        flush_interval=INGEST_WAL_FLUSH_INTERVAL,
+    )
+    if INGEST_WAL_ENABLED
+    else None
+)
+
+
+@app.on_event("startup")
+def _start_ingest_wal() -> None:
+    # Replays anything left in the log by a previous process.
+    if INGEST_WAL is not None:
+        INGEST_WAL.start()
+
+
+@app.get("/api/annotations/wal")
+def get_ingest_wal_stats():
+    if INGEST_WAL is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **INGEST_WAL.stats()})
+
+
+def _idempotency_key(scope: str, client_key: Optional[str], body: Any) -> Optional[str]:
+    if not (client_key and client_key.strip()) and not IDEMPOTENCY_CONTENT_HASH:
+        return None
+    return request_key(scope, client_key, body)
+
+
+# SQLSTATE classes PostgREST passes through when individual rows are bad:
+# data exceptions (22, e.g. an invalid value) and integrity constraint
+# violations (23, e.g. a duplicate key or a failed check).
+_ROW_ERROR_SQLSTATE_CLASSES = ("22", "23")
+
+
+def _chunk_records(records: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """Split ``records`` into ``(start, stop)`` ranges bounded by rows and bytes."""
+
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    size = 0
+    for index, record in enumerate(records):
+        record_size = len(json.dumps(record, ensure_ascii=False).encode("utf-8")) + 1
+        full = index - start >= SUPABASE_CHUNK_ROWS or size + record_size > SUPABASE_CHUNK_BYTES
+        if index > start and full:
+            chunks.append((start, index))
+            start, size = index, 0
+        size += record_size
+    if start < len(records):
+        chunks.append((start, len(records)))
+    return chunks
+
+
+def _is_row_error(resp: requests.Response) -> bool:
+    """Whether a failed insert blames particular rows rather than the request."""
+
+    if resp.status_code == 413:
+        return True
+    if not 400 <= resp.status_code < 500:
+        return False
+    try:
+        body = resp.json()
+    except ValueError:
+        return False
+    code = str(body.get("code") or "") if isinstance(body, dict) else ""
+    return code[:2] in _ROW_ERROR_SQLSTATE_CLASSES
+
+
+def _insert_chunk(endpoint: str, records: List[Dict[str, Any]], start: int, stop: int) -> List[Dict[str, Any]]:
+    """Insert ``records[start:stop]``; returns one result per chunk actually sent.
+
+    Transient failures are retried with backoff. A 413, or a 4xx whose
+    error code points at row data (see :func:`_is_row_error`), splits the
+    chunk in half and inserts both halves, so a bad row only fails itself
+    and every other row gets its own result. Errors that hit every row the
+    same way (auth, a missing table or column, RLS) fail the chunk once.
+    Failed results carry ``row_error`` so callers can tell the two apart.
+    """
+
+    attempts = 0
+    while True:
+        attempts += 1
+        status: Optional[int] = None
+        row_error = False
+        try:
+            resp = requests.post(endpoint, headers=_supabase_headers(), json=records[start:stop], timeout=30)
+            status = resp.status_code
+            error = None if status // 100 == 2 else f"Supabase batch insert failed: {status}"
+            row_error = error is not None and _is_row_error(resp)
+        except requests.RequestException as exc:
+            error = f"Supabase exception: {exc!r}"
+        if error is None:
+            return [{"start": start, "count": stop - start, "saved": True, "attempts": attempts}]
+        if row_error and stop - start > 1:
+            middle = (start + stop) // 2
+            return _insert_chunk(endpoint, records, start, middle) + _insert_chunk(
+                endpoint, records, middle, stop
+            )
+        retryable = status is None or status >= 500 or status in {408, 429}
+        if not retryable or attempts > SUPABASE_INSERT_RETRIES:
+            return [
+                {
+                    "start": start,
+                    "count": stop - start,
+                    "saved": False,
+                    "attempts": attempts,
+                    "error": error,
+                    "row_error": row_error,
+                }
+            ]
+        time.sleep(SUPABASE_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1)))
+
+
+def _insert_supabase_batch(table: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    endpoint = f"{SUPABASE_URL}/rest/v1/{table}"
+    futures = [
+        _SUPABASE_POOL.submit(_insert_chunk, endpoint, records, start, stop)
+        for start, stop in _chunk_records(records)
+    ]
+    chunks: List[Dict[str, Any]] = []
+    for future in futures:
+        chunks.extend(future.result())
+    return chunks
+
+
+def _send_coalesced(records: List[Dict[str, Any]]) -> List[Optional[str]]:
+    outcomes: List[Optional[str]] = [None] * len(records)
+    for chunk in _insert_supabase_batch(TABLE_SINGLE, records):
+        if not chunk["saved"]:
+            for index in range(chunk["start"], chunk["start"] + chunk["count"]):
+                outcomes[index] = chunk["error"]
+    return outcomes
+
+
+INSERT_COALESCER: Optional[InsertCoalescer] = (
+    InsertCoalescer(
+        _send_coalesced,
+        window_seconds=SUPABASE_COALESCE_WINDOW_MS / 1000.0,
+        max_rows=SUPABASE_COALESCE_MAX_ROWS,
+        max_in_flight=SUPABASE_INSERT_CONCURRENCY,
+    )
+    if SUPABASE_COALESCE_WINDOW_MS > 0
+    else None
+)
+
+
+def _ingest_annotation(
+    payload: Any,
+    annotator: str,
+    background: Optional[BackgroundTasks] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """Validate, log and persist one submission; returns (body, status_code).
+
+    Derived QA metrics for a persisted submission are scheduled on
+    ``background`` so they run after the response is sent.
+    """
+
     # Minimal validation
     errors = []
     if not isinstance(payload, dict):
@@ -238,9 +765,29 @@ async def post_annotation(req: Request, annotator: str = Query("anonymous")):
         "received_at": datetime.utcnow().isoformat(),
         "annotator": annotator,
     }
+    if INGEST_WAL is not None and isinstance(payload, dict):
+        try:
+            wal_id = INGEST_WAL.append(record)
+        except OSError:
+            LOGGER.exception("Ingest WAL append failed; writing synchronously")
+        else:
+            return (
+                {
+                    "status": "ok",
+                    "saved": False,
+                    "queued": True,
+                    "wal_id": wal_id,
+                    "warning": None,
+                    "validation_errors": errors,
+                },
+                202,
+            )
     saved = False
     warn = None
-    if SUPABASE_URL and SUPABASE_KEY:
+    if SUPABASE_URL and SUPABASE_KEY and INSERT_COALESCER is not None:
+        warn = INSERT_COALESCER.insert(record)
+        saved = warn is None
+    elif SUPABASE_URL and SUPABASE_KEY:
         try:
             endpoint = f"{SUPABASE_URL}/rest/v1/{TABLE_SINGLE}"
             resp = requests.post(endpoint, headers=_supabase_headers(), json=record, timeout=15)
@@ -250,38 +797,159 @@ async def post_annotation(req: Request, annotator: str = Query("anonymous")):
         except Exception as e:
             warn = f"Supabase exception: {repr(e)}"
     try:
-        _persist_annotation_files(payload, annotator)
+        persisted = _persist_annotation_files(payload, annotator)
     except Exception as exc:
         if warn:
             warn = f"{warn}; file_persist_error={repr(exc)}"
         else:
             warn = f"file_persist_error={repr(exc)}"
-    return JSONResponse({"status": "ok", "saved": saved, "warning": warn, "validation_errors": errors})
+    else:
+        if persisted is not None and background is not None and DERIVE_QA_METRICS:
+            background.add_task(
+                _derive_qa_metrics_safely,
+                [(payload["asset_id"], annotator, persisted.isoformat() + "Z")],
+            )
+    return {"status": "ok", "saved": saved, "warning": warn, "validation_errors": errors}, 200
 
 
-@app.post("/api/annotations/batch")
-async def post_annotations_batch(req: Request, annotator: str = Query("anonymous")):
-    body = await req.json()
-    items: List[Dict[str, Any]] = body if isinstance(body, list) else body.get("items") or []
+def _submit_annotation(
+    payload: Any,
+    annotator: str,
+    client_key: Optional[str],
+    background: BackgroundTasks,
+) -> JSONResponse:
+    key = _idempotency_key(f"annotations:{annotator}", client_key, payload)
+    if key is None:
+        body, status_code = _ingest_annotation(payload, annotator, background)
+        return JSONResponse(body, status_code=status_code)
+    with IDEMPOTENCY_STORE.claim(key) as previous:
+        if previous is not None:
+            return JSONResponse(
+                previous["body"],
+                status_code=previous["status_code"],
+                headers={"Idempotent-Replayed": "true"},
+            )
+        body, status_code = _ingest_annotation(payload, annotator, background)
+        # Failed attempts are not remembered so the client's retry runs again.
+        if not body.get("warning"):
+            IDEMPOTENCY_STORE.put(key, {"body": body, "status_code": status_code})
+    return JSONResponse(body, status_code=status_code)
+
+
+@app.post("/api/annotations")
+async def post_annotation(
+    req: Request,
+    background: BackgroundTasks,
+    annotator: str = Query("anonymous"),
+):
+    payload = await req.json()
+    # Runs off the event loop so concurrent submissions can share one
+    # coalesced Supabase insert instead of queueing behind each other.
+    return await run_in_threadpool(
+        _submit_annotation, payload, annotator, req.headers.get("Idempotency-Key"), background
+    )
+
+
+def _ingest_batch(
+    items: List[Dict[str, Any]],
+    annotator: str,
+    background: Optional[BackgroundTasks] = None,
+) -> Dict[str, Any]:
+    scope = f"annotations:{annotator}"
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    keys: List[Optional[str]] = []
+    first_by_key: Dict[str, int] = {}
+    repeats: Dict[int, int] = {}
+    fresh: List[int] = []
+    for index, item in enumerate(items):
+        client_key = item.get("idempotency_key") if isinstance(item, dict) else None
+        key = _idempotency_key(scope, client_key, item) if isinstance(item, dict) else None
+        keys.append(key)
+        if key is not None and key in first_by_key:
+            repeats[index] = first_by_key[key]
+            continue
+        previous = IDEMPOTENCY_STORE.get(key) if key is not None else None
+        if previous is not None:
+            results[index] = {**previous, "index": index, "duplicate": True}
+            continue
+        if key is not None:
+            first_by_key[key] = index
+        fresh.append(index)
+
+    fresh_items = [items[index] for index in fresh]
     saved = False
     warn = None
-    if SUPABASE_URL and SUPABASE_KEY and items:
+    chunks: List[Dict[str, Any]] = []
+    insert_future = None
+    if SUPABASE_URL and SUPABASE_KEY and fresh_items:
+        received_at = datetime.utcnow().isoformat()
+        records = [{"data": it, "received_at": received_at, "annotator": annotator} for it in fresh_items]
+        # Artifacts are written while the inserts are in flight.
+        insert_future = _PERSIST_POOL.submit(_insert_supabase_batch, TABLE_BATCH, records)
+    fresh_results = _persist_annotation_batch([(item, annotator) for item in fresh_items])
+    if insert_future is not None:
         try:
-            endpoint = f"{SUPABASE_URL}/rest/v1/{TABLE_BATCH}"
-            records = [
-                {"data": it, "received_at": datetime.utcnow().isoformat(), "annotator": annotator}
-                for it in items
-            ]
-            resp = requests.post(endpoint, headers=_supabase_headers(), json=records, timeout=30)
-            saved = resp.status_code // 100 == 2
-            if not saved:
-                warn = f"Supabase batch insert failed: {resp.status_code}"
+            chunks = insert_future.result()
         except Exception as e:
             warn = f"Supabase exception: {repr(e)}"
-    for item in items:
-        try:
-            _persist_annotation_files(item, annotator)
-        except Exception as exc:
-            note = f"file_persist_error={repr(exc)}"
-            warn = f"{warn}; {note}" if warn else note
-    return JSONResponse({"status": "ok", "saved": saved, "count": len(items), "warning": warn})
+        else:
+            saved = all(chunk["saved"] for chunk in chunks)
+            failed = [chunk for chunk in chunks if not chunk["saved"]]
+            if failed:
+                warn = "; ".join(sorted({chunk["error"] for chunk in failed}))
+            for chunk in chunks:
+                for position in range(chunk["start"], chunk["start"] + chunk["count"]):
+                    fresh_results[position]["saved"] = chunk["saved"]
+    elif SUPABASE_URL and SUPABASE_KEY:
+        # Every item was a duplicate of one already inserted.
+        saved = True
+    for position, result in enumerate(fresh_results):
+        index = fresh[position]
+        result["index"] = index
+        results[index] = result
+        if result.get("status") == "error":
+            warn = f"{warn}; {result['error']}" if warn else result["error"]
+        elif result.get("status") == "ok" and result.get("saved") is not False and keys[index]:
+            IDEMPOTENCY_STORE.put(keys[index], {k: v for k, v in result.items() if k != "index"})
+    if background is not None and DERIVE_QA_METRICS:
+        derive = [
+            (fresh_items[position]["asset_id"], annotator, result.get("submitted_at"))
+            for position, result in enumerate(fresh_results)
+            if result.get("status") == "ok"
+        ]
+        if derive:
+            background.add_task(_derive_qa_metrics_safely, derive)
+    for index, original in repeats.items():
+        results[index] = {**(results[original] or {}), "index": index, "duplicate": True}
+    return {
+        "status": "ok",
+        "saved": saved,
+        "saved_count": sum(chunk["count"] for chunk in chunks if chunk["saved"]),
+        "count": len(items),
+        "duplicates": len(items) - len(fresh),
+        "warning": warn,
+        # Chunk ranges index the rows actually sent, i.e. excluding duplicates.
+        "chunks": chunks,
+        "results": results,
+    }
+
+
+@app.post("/api/annotations/batch")
+async def post_annotations_batch(
+    req: Request,
+    background: BackgroundTasks,
+    annotator: str = Query("anonymous"),
+):
+    body = await req.json()
+    items: List[Dict[str, Any]] = body if isinstance(body, list) else body.get("items") or []
+    client_key = req.headers.get("Idempotency-Key")
+    if not (client_key and client_key.strip()):
+        return JSONResponse(_ingest_batch(items, annotator, background))
+    key = request_key(f"annotations_batch:{annotator}", client_key, None)
+    with IDEMPOTENCY_STORE.claim(key) as previous:
+        if previous is not None:
+            return JSONResponse(previous, headers={"Idempotent-Replayed": "true"})
+        response = _ingest_batch(items, annotator, background)
+        if not response.get("warning"):
+            IDEMPOTENCY_STORE.put(key, response)
+    return JSONResponse(response)
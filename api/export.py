@@ -1,9 +1,19 @@
-from fastapi import FastAPI, Query
-from fastapi.responses import StreamingResponse, JSONResponse
-import io, json, zipfile, os, requests
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse, JSONResponse
+import json, os, re, requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
+from typing import Optional
+
+from api._artifact_io import load_artifact_json, read_artifact_text
+from api._export_cache import ExportCache
+from api._pass_index import discover_passes, latest_pass_dir
+from api._paths import data_dir
+from api._qa_rollup import DIMENSIONS, QARollupStore, summarize_bucket
+from api._stage2_summary import SummaryCache
+from api._zip_stream import stream_zip, stream_zip_parallel
 
 app = FastAPI()
 
@@ -17,40 +27,38 @@ STAGE2_TABLE = os.environ.get("SUPABASE_STAGE2_TABLE", "annotations_stage2")
 STAGE2_OUTPUT_DIR = Path(os.environ.get("STAGE2_OUTPUT_DIR", "data/stage2_output"))
 if not STAGE2_OUTPUT_DIR.is_absolute():
     STAGE2_OUTPUT_DIR = Path(__file__).resolve().parent.parent / STAGE2_OUTPUT_DIR
+# Clip counts for /api/export/summary, updated by submit and promote and
+# rechecked against the tree when the root changes or they get this old.
+STAGE2_SUMMARY_DIR = data_dir("STAGE2_SUMMARY_DIR", str(STAGE2_OUTPUT_DIR.parent / "stage2_summary"))
+SUMMARY_REVALIDATE_SECONDS = float(os.environ.get("EXPORT_SUMMARY_REVALIDATE_SECONDS", "300") or 300)
+SUMMARY_CACHE = SummaryCache(STAGE2_OUTPUT_DIR, STAGE2_SUMMARY_DIR, SUMMARY_REVALIDATE_SECONDS)
 
-def _compute_stage2_summary(root: Path) -> Dict[str, int]:
-    clips = 0
-    double_passes = 0
-    if not root.exists():
-        return {"clips": clips, "double_passes": double_passes}
-
-    for clip_dir in root.iterdir():
-        if not clip_dir.is_dir():
-            continue
-        has_artifacts = False
-        passes_found = set()
-
-        for child in clip_dir.iterdir():
-            if child.is_dir() and child.name.lower().startswith("pass_"):
-                passes_found.add(child.name.lower())
-                if not has_artifacts:
-                    for artifact in child.rglob("*"):
-                        if artifact.is_file() and artifact.suffix.lower() in {".vtt", ".json"}:
-                            has_artifacts = True
-                            break
-            elif child.is_file() and child.suffix.lower() in {".vtt", ".json"}:
-                has_artifacts = True
+# /api/export/bulk: asset ids per PostgREST in.(...) query, rows per page
+# for its Supabase queries, and the pool shared by lookups and entry
+# compression.
+EXPORT_BULK_MAX_ASSETS = max(1, int(os.environ.get("EXPORT_BULK_MAX_ASSETS", "5000") or 5000))
+EXPORT_BULK_QUERY_BATCH = max(1, int(os.environ.get("EXPORT_BULK_QUERY_BATCH", "100") or 100))
+EXPORT_BULK_PAGE_ROWS = max(1, int(os.environ.get("EXPORT_BULK_PAGE_ROWS", "500") or 500))
+EXPORT_BULK_WORKERS = max(1, int(os.environ.get("EXPORT_BULK_WORKERS", "4") or 4))
+_BULK_POOL = ThreadPoolExecutor(max_workers=EXPORT_BULK_WORKERS, thread_name_prefix="export-bulk")
 
-            if has_artifacts and any(name != "pass_1" for name in passes_found):
-                # Enough information gathered; stop scanning this clip.
-                break
+# Finished GET /api/export archives, keyed by row id and content hash.
+# Annotation submits drop an asset's entries; 0 disables the cache.
+EXPORT_CACHE_DIR = data_dir("EXPORT_CACHE_DIR", "data/export_cache")
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get("EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)) or 0)
+EXPORT_CACHE = ExportCache(EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES)
 
-        if has_artifacts:
-            clips += 1
-        if any(name != "pass_1" for name in passes_found):
-            double_passes += 1
+# Running QA sums kept up to date by annotation submits.
+QA_ROLLUP_DIR = data_dir("QA_ROLLUP_DIR", "data/qa_rollup")
+QA_ROLLUP = QARollupStore(QA_ROLLUP_DIR)
 
-    return {"clips": clips, "double_passes": double_passes}
+# Where GET /api/export reads an asset from: "auto" tries the artifacts
+# under STAGE2_OUTPUT_DIR first and falls back to Supabase, "local" and
+# "supabase" use only one of them. ?source= overrides it per request.
+EXPORT_SOURCES = {"auto", "local", "supabase"}
+EXPORT_SOURCE = (os.environ.get("EXPORT_SOURCE") or "auto").strip().lower()
+if EXPORT_SOURCE not in EXPORT_SOURCES:
+    EXPORT_SOURCE = "auto"
 
 
 def _headers():
@@ -68,6 +76,10 @@ def _average(values):
     return sum(vals) / len(vals)
 
 
+def _unless_none(value, fallback):
+    return fallback if value is None else value
+
+
 def _build_qa_report(data):
     qa_payload = data.get("qa") if isinstance(data, dict) else None
     if not qa_payload:
@@ -93,6 +105,8 @@ def _build_qa_report(data):
         if not isinstance(metrics, dict):
             metrics = {}
         cues_metrics = metrics.get("cues") if isinstance(metrics.get("cues"), dict) else {}
+        # Server-derived values only fill in what the client did not report.
+        derived = entry.get("derived") if isinstance(entry.get("derived"), dict) else {}
         review_payload = entry.get("review") if isinstance(entry.get("review"), dict) else {}
         review_status = entry.get("review_status") or review_payload.get("status") or review_payload.get("review_status")
         locked_flag = entry.get("locked")
@@ -108,9 +122,16 @@ def _build_qa_report(data):
             "time_spent_sec": entry.get("time_spent_sec"),
             "codeswitch_f1": entry.get("codeswitch_f1"),
             "diarization_mae": entry.get("diarization_mae"),
-            "cue_diff_sec": entry.get("cue_diff_sec") or cues_metrics.get("targetDiffSec"),
-            "translation_completeness": entry.get("translation_completeness"),
-            "translation_char_ratio": entry.get("translation_char_ratio") or cues_metrics.get("translationCompleteness"),
+            "cue_diff_sec": _unless_none(
+                entry.get("cue_diff_sec") or cues_metrics.get("targetDiffSec"), derived.get("cue_diff_sec")
+            ),
+            "translation_completeness": _unless_none(
+                entry.get("translation_completeness"), derived.get("translation_completeness")
+            ),
+            "translation_char_ratio": _unless_none(
+                entry.get("translation_char_ratio") or cues_metrics.get("translationCompleteness"),
+                derived.get("translation_char_ratio"),
+            ),
             "translation_correctness": entry.get("translation_correctness"),
             "review_status": review_status,
             "locked": bool(locked_flag),
@@ -178,53 +199,383 @@ def _build_qa_report(data):
 
 
 @app.get("/api/export/summary")
-async def export_summary():
-    summary = _compute_stage2_summary(STAGE2_OUTPUT_DIR)
-    return JSONResponse(summary, headers={"Cache-Control": "no-store"})
+def export_summary(request: Request):
+    totals = SUMMARY_CACHE.summary()
+    summary = {"clips": totals["clips"], "double_passes": totals["double_passes"]}
+    etag = f'"{summary["clips"]}-{summary["double_passes"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in (request.headers.get("if-none-match") or "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(summary, headers=headers)
 
 
-@app.get("/api/export")
-async def export_asset(asset_id: str = Query(...)):
+@app.get("/api/export/qa_rollup")
+def export_qa_rollup(
+    request: Request,
+    by: Optional[str] = Query(None),
+    since: Optional[str] = Query(None),
+    until: Optional[str] = Query(None),
+):
+    """Corpus-wide QA averages, overall and per annotator, cell and day.
+
+    ``by`` limits the groups to one dimension; ``since``/``until``
+    (``YYYY-MM-DD``, inclusive) limit the per-day groups.
+    """
+
+    if by is not None and by not in DIMENSIONS:
+        return JSONResponse({"error": f"by must be one of {list(DIMENSIONS)}"}, status_code=400)
+    totals = QA_ROLLUP.load_totals()
+    etag = f'"{totals["generation"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    updated_at = totals.get("updated_at")
+    body = {
+        "generation": totals["generation"],
+        "updatedAt": datetime.utcfromtimestamp(updated_at).isoformat() + "Z" if updated_at else None,
+        "overall": summarize_bucket(totals["overall"]),
+    }
+    for dimension in [by] if by else DIMENSIONS:
+        groups = totals[dimension]
+        if dimension == "day":
+            groups = {
+                day: bucket
+                for day, bucket in groups.items()
+                if (not since or day >= since) and (not until or day <= until)
+            }
+        body[dimension] = {name: summarize_bucket(groups[name]) for name in sorted(groups)}
+    return JSONResponse(body, headers=headers)
+
+
+EXPORT_FILE_ENTRIES = (
+    ("transcript.vtt", "transcript_vtt"),
+    ("translation.vtt", "translation_vtt"),
+    ("code_switch.vtt", "code_switch_vtt"),
+    ("events.vtt", "events_vtt"),
+    ("diarization.rttm", "diarization_rttm"),
+    ("code_switch_spans.json", "code_switch_spans_json"),
+)
+
+
+def _export_entries(data, files):
+    """Yield ``(name, text)`` archive entries lazily, in archive order."""
+
+    yield "annotation.json", json.dumps(data, ensure_ascii=False, indent=2)
+    for name, key in EXPORT_FILE_ENTRIES:
+        if files.get(key):
+            yield name, files.get(key)
+    qa_report = _build_qa_report(data)
+    if qa_report:
+        yield "qa_report.json", json.dumps(qa_report, ensure_ascii=False, indent=2)
+
+
+def _postgrest_in(values):
+    quoted = []
+    for value in values:
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        quoted.append(f'"{text}"')
+    return f"in.({','.join(quoted)})"
+
+
+def _fetch_rows(params):
+    resp = requests.get(
+        f"{SUPABASE_URL}/rest/v1/{STAGE2_TABLE}", params=params, headers=_headers(), timeout=60
+    )
+    resp.raise_for_status()
+    rows = resp.json()
+    if not isinstance(rows, list):
+        raise ValueError(f"expected a list of rows, got {type(rows).__name__}")
+    return rows
+
+
+def _iter_pages(params):
+    """Yield pages of ``params`` rows, ``EXPORT_BULK_PAGE_ROWS`` at a time.
+
+    PostgREST's max-rows setting can cap a page below the size asked for,
+    so a short page is not taken as the end; paging stops at an empty one.
+    """
+
+    offset = 0
+    while True:
+        rows = _fetch_rows({**params, "limit": str(EXPORT_BULK_PAGE_ROWS), "offset": str(offset)})
+        if not rows:
+            return
+        yield rows
+        offset += len(rows)
+
+
+def _fetch_latest_batch(asset_ids):
+    """Return ``{asset_id: data}`` for the newest row of each id.
+
+    Pages newest first until every id has been seen or the rows run out;
+    a failed page raises, so its ids are reported as errors rather than
+    as missing.
+    """
+
+    params = {"select": "id,data", "data->>asset_id": _postgrest_in(asset_ids), "order": "id.desc"}
+    wanted = {str(asset_id) for asset_id in asset_ids}
+    latest = {}
+    for rows in _iter_pages(params):
+        for row in rows:
+            data = row.get("data") or {}
+            asset_id = data.get("asset_id")
+            if asset_id is not None and str(asset_id) not in latest:
+                latest[str(asset_id)] = data
+        if wanted <= latest.keys():
+            break
+    return latest
+
+
+def _iter_requested_rows(asset_ids):
+    """Yield ``(asset_id, data_or_None, error)`` in request order."""
+
+    batches = [
+        asset_ids[start : start + EXPORT_BULK_QUERY_BATCH]
+        for start in range(0, len(asset_ids), EXPORT_BULK_QUERY_BATCH)
+    ]
+    futures = [_BULK_POOL.submit(_fetch_latest_batch, batch) for batch in batches]
+    for batch, future in zip(batches, futures):
+        try:
+            latest = future.result()
+        except Exception as e:
+            for asset_id in batch:
+                yield asset_id, None, f"fetch failed: {repr(e)}"
+            continue
+        for asset_id in batch:
+            yield asset_id, latest.get(asset_id), None
+
+
+def _iter_filtered_rows(filters, limit):
+    """Yield the newest matching row per asset for a filter, newest first."""
+
+    params = {"select": "id,data", "order": "id.desc"}
+    if filters.get("annotator"):
+        params["annotator"] = f"eq.{filters['annotator']}"
+    received = []
+    if filters.get("received_after"):
+        received.append(f"received_at.gte.{filters['received_after']}")
+    if filters.get("received_before"):
+        received.append(f"received_at.lt.{filters['received_before']}")
+    if received:
+        params["and"] = f"({','.join(received)})"
+    if filters.get("review_status"):
+        params["data->>review_status"] = f"eq.{filters['review_status']}"
+    seen = set()
+    pages = _iter_pages(params)
+    while True:
+        try:
+            rows = next(pages, None)
+        except Exception as e:
+            yield None, None, f"fetch failed: {repr(e)}"
+            return
+        if rows is None:
+            return
+        for row in rows:
+            data = row.get("data") or {}
+            asset_id = data.get("asset_id")
+            if asset_id is None or str(asset_id) in seen:
+                continue
+            seen.add(str(asset_id))
+            yield str(asset_id), data, None
+            if len(seen) >= limit:
+                return
+
+
+def _bulk_folder(asset_id, used):
+    folder = re.sub(r"[^A-Za-z0-9._-]+", "_", asset_id).strip("._") or "asset"
+    candidate, suffix = folder, 2
+    while candidate in used:
+        candidate, suffix = f"{folder}_{suffix}", suffix + 1
+    used.add(candidate)
+    return candidate
+
+
+def _bulk_entries(rows, manifest):
+    used = set()
+    for asset_id, data, error in rows:
+        if asset_id is None:
+            manifest["errors"].append(error)
+            continue
+        if error or data is None:
+            manifest["assets"].append(
+                {"asset_id": asset_id, "status": "error" if error else "not_found", "error": error}
+            )
+            continue
+        folder = _bulk_folder(asset_id, used)
+        names = []
+        for name, content in _export_entries(data, data.get("files") or {}):
+            names.append(f"{folder}/{name}")
+            yield f"{folder}/{name}", content
+        manifest["assets"].append({"asset_id": asset_id, "status": "ok", "folder": folder, "files": names})
+    manifest["exported"] = sum(1 for entry in manifest["assets"] if entry["status"] == "ok")
+    manifest["missing"] = len(manifest["assets"]) - manifest["exported"]
+    yield "manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2)
+
+
+@app.post("/api/export/bulk")
+async def export_bulk(req: Request):
     if not (SUPABASE_URL and SUPABASE_KEY):
         return JSONResponse({"error": "Supabase not configured"}, status_code=500)
+    try:
+        body = await req.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        return JSONResponse({"error": "expected a JSON object"}, status_code=400)
+
+    asset_ids = body.get("asset_ids")
+    filters = body.get("filter")
+    if isinstance(asset_ids, list) and asset_ids:
+        asset_ids = list(dict.fromkeys(str(asset_id) for asset_id in asset_ids if asset_id))
+        if len(asset_ids) > EXPORT_BULK_MAX_ASSETS:
+            return JSONResponse(
+                {"error": f"at most {EXPORT_BULK_MAX_ASSETS} assets per export"}, status_code=400
+            )
+        rows = _iter_requested_rows(asset_ids)
+    elif isinstance(filters, dict) and filters:
+        try:
+            limit = min(EXPORT_BULK_MAX_ASSETS, int(filters.get("limit") or EXPORT_BULK_MAX_ASSETS))
+        except (TypeError, ValueError):
+            return JSONResponse({"error": "filter.limit must be an integer"}, status_code=400)
+        rows = _iter_filtered_rows(filters, max(1, limit))
+    else:
+        return JSONResponse({"error": "asset_ids or filter required"}, status_code=400)
+
+    exported_at = datetime.utcnow()
+    manifest = {
+        "exported_at": exported_at.isoformat() + "Z",
+        "request": {"asset_ids": asset_ids} if isinstance(asset_ids, list) else {"filter": filters},
+        "assets": [],
+        "errors": [],
+    }
+    fname = f"export_bulk_{exported_at.strftime('%Y%m%dT%H%M%SZ')}.zip"
+    return StreamingResponse(
+        stream_zip_parallel(_bulk_entries(rows, manifest), _BULK_POOL, lookahead=EXPORT_BULK_WORKERS * 2),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={fname}", "Cache-Control": "no-store"},
+    )
+
+
+def _safe_asset_dirname(asset_id: str) -> str:
+    text = str(asset_id or "asset").strip()
+    if not text:
+        text = "asset"
+    safe = "".join(
+        ch if ch.isalnum() or ch in {"_", "-", "."} else "_" for ch in text
+    )
+    return safe or "asset"
+
+
+def _load_json_dict(path):
+    try:
+        data = load_artifact_json(path)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _local_source_dir(asset_dir, meta):
+    """Return ``merged/`` for a locked asset, else its newest pass directory."""
+
+    adjudication = meta.get("adjudication")
+    if isinstance(adjudication, dict) and adjudication.get("status") == "locked":
+        merged = Path(str(adjudication.get("merged_path") or "merged"))
+        if not merged.is_absolute() and ".." not in merged.parts and (asset_dir / merged).is_dir():
+            return asset_dir / merged
+    return latest_pass_dir(asset_dir, discover_passes(asset_dir, meta))
+
+
+def _load_local_export(asset_id):
+    """Return ``(source, data)`` rebuilt from stage2_output, or ``None``.
 
+    ``data`` has the shape of a Supabase row's ``data`` column; artifact
+    files on disk take precedence over the copies in ``annotation.json``.
+    """
+
+    asset_dir = STAGE2_OUTPUT_DIR / _safe_asset_dirname(asset_id)
+    meta = _load_json_dict(asset_dir / "item_meta.json")
+    if meta is None:
+        return None
+    source_dir = _local_source_dir(asset_dir, meta)
+    if source_dir is None:
+        return None
+    data = _load_json_dict(source_dir / "annotation.json") or {}
+    if data.get("asset_id") not in (None, asset_id):
+        # A different asset id that sanitises to the same directory name.
+        return None
+    files = dict(data.get("files") or {})
+    for name, key in EXPORT_FILE_ENTRIES:
+        try:
+            files[key] = read_artifact_text(source_dir / name)
+        except (OSError, UnicodeDecodeError):
+            continue
+    if not any(files.values()):
+        return None
+    data = {**data, "asset_id": asset_id, "files": files}
+    if not isinstance(data.get("qa"), dict):
+        data["qa"] = _load_json_dict(source_dir / "qa_result.json") or {}
+    return f"local:{source_dir.relative_to(asset_dir).as_posix()}", data
+
+
+def _fetch_latest_row(asset_id):
     # Try to fetch the most recent row for this asset_id
     # PostgREST filter on JSON: data->>asset_id=eq.<id>
-    try:
-        ep = f"{SUPABASE_URL}/rest/v1/{STAGE2_TABLE}?select=data&id=not.is.null&data->>asset_id=eq.{asset_id}&order=id.desc&limit=1"
-        resp = requests.get(ep, headers=_headers(), timeout=20)
-        resp.raise_for_status()
-        rows = resp.json()
-        if not rows:
+    ep = f"{SUPABASE_URL}/rest/v1/{STAGE2_TABLE}?select=id,data&id=not.is.null&data->>asset_id=eq.{asset_id}&order=id.desc&limit=1"
+    resp = requests.get(ep, headers=_headers(), timeout=20)
+    resp.raise_for_status()
+    rows = resp.json()
+    if not rows:
+        return None
+    return rows[0].get("id"), rows[0]["data"]
+
+
+def _etag_matches(request, etag):
+    tags = [tag.strip() for tag in (request.headers.get("if-none-match") or "").split(",")]
+    return etag in tags or "*" in tags
+
+
+@app.get("/api/export")
+async def export_asset(
+    request: Request,
+    asset_id: str = Query(...),
+    source: Optional[str] = Query(None),
+):
+    mode = (source or EXPORT_SOURCE).strip().lower()
+    if mode not in EXPORT_SOURCES:
+        return JSONResponse({"error": f"source must be one of {sorted(EXPORT_SOURCES)}"}, status_code=400)
+
+    found = _load_local_export(asset_id) if mode != "supabase" else None
+    if found is None and mode == "local":
+        return JSONResponse({"error": "not found"}, status_code=404)
+    if found is not None:
+        row_id, data = found
+        origin = "local"
+    else:
+        if not (SUPABASE_URL and SUPABASE_KEY):
+            return JSONResponse({"error": "Supabase not configured"}, status_code=500)
+        try:
+            found = _fetch_latest_row(asset_id)
+        except Exception as e:
+            return JSONResponse({"error": f"fetch failed: {repr(e)}"}, status_code=500)
+        if found is None:
             return JSONResponse({"error": "not found"}, status_code=404)
-        data = rows[0]["data"]
-    except Exception as e:
-        return JSONResponse({"error": f"fetch failed: {repr(e)}"}, status_code=500)
+        row_id, data = found
+        origin = "supabase"
+
+    key = ExportCache.key(row_id, data)
+    # The source is looked up on every request, so the ETag always names the
+    # newest pass or row; clients must revalidate rather than reuse.
+    cache_headers = {"ETag": f'"{key}"', "Cache-Control": "no-cache", "X-Export-Source": origin}
+    if _etag_matches(request, cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
 
-    files = data.get("files", {})
-    mem = io.BytesIO()
-    with zipfile.ZipFile(mem, mode="w", compression=zipfile.ZIP_DEFLATED) as z:
-        z.writestr("annotation.json", json.dumps(data, ensure_ascii=False, indent=2))
-        if files.get("transcript_vtt"):
-            z.writestr("transcript.vtt", files.get("transcript_vtt"))
-        if files.get("translation_vtt"):
-            z.writestr("translation.vtt", files.get("translation_vtt"))
-        if files.get("code_switch_vtt"):
-            z.writestr("code_switch.vtt", files.get("code_switch_vtt"))
-        if files.get("events_vtt"):
-            z.writestr("events.vtt", files.get("events_vtt"))
-        if files.get("diarization_rttm"):
-            z.writestr("diarization.rttm", files.get("diarization_rttm"))
-        if files.get("code_switch_spans_json"):
-            z.writestr("code_switch_spans.json", files.get("code_switch_spans_json"))
-        qa_report = _build_qa_report(data)
-        if qa_report:
-            z.writestr("qa_report.json", json.dumps(qa_report, ensure_ascii=False, indent=2))
-
-    mem.seek(0)
     fname = f"export_{asset_id}_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.zip"
-    return StreamingResponse(mem, media_type="application/zip", headers={
-        "Content-Disposition": f"attachment; filename={fname}",
-        "Cache-Control": "no-store"
-    })
+    headers = {"Content-Disposition": f"attachment; filename={fname}", **cache_headers}
+    cached = EXPORT_CACHE.get(asset_id, key)
+    if cached is not None:
+        return FileResponse(cached, media_type="application/zip", headers=headers)
+    files = data.get("files", {})
+    chunks = EXPORT_CACHE.store(asset_id, key, stream_zip(_export_entries(data, files)))
+    return StreamingResponse(chunks, media_type="application/zip", headers=headers)
 
@@ -19,6 +19,7 @@ def _dbg(msg, **kw):
     safe = {k: ("<hidden>" if k.lower().endswith("key") else v) for k, v in kw.items()}
     print(f"[tasks] {_stamp()} :: {msg} :: {safe}")
 
+from api._artifact_io import load_artifact_json
 from api.coverage import (
     CoverageSnapshotInvalid,
     CoverageSnapshotNotFound,
@@ -721,12 +722,8 @@ def _asset_output_dir(asset_id: str) -> Path:
 
 
 def _load_meta_from_dir(path: Path) -> Optional[Dict[str, Any]]:
-    meta_path = path / "item_meta.json"
-    if not meta_path.is_file():
-        return None
     try:
-        with meta_path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = load_artifact_json(path / "item_meta.json")
     except Exception:
         return None
     return data if isinstance(data, dict) else None
@@ -735,16 +732,13 @@ def _load_meta_from_dir(path: Path) -> Optional[Dict[str, Any]]:
 def _load_item_meta(asset_id: str, cache: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     if asset_id in cache:
         return cache[asset_id]
-    meta_path = _asset_output_dir(asset_id) / "item_meta.json"
     data: Dict[str, Any] = {}
-    if meta_path.is_file():
-        try:
-            with meta_path.open("r", encoding="utf-8") as fh:
-                loaded = json.load(fh)
-                if isinstance(loaded, dict):
-                    data = loaded
-        except Exception:
-            data = {}
+    try:
+        loaded = load_artifact_json(_asset_output_dir(asset_id) / "item_meta.json")
+    except Exception:
+        loaded = None
+    if isinstance(loaded, dict):
+        data = loaded
     cache[asset_id] = data
     return data
 
@@ -1902,7 +1902,19 @@ const ReviewPage = {
       this.showToast(detail, { variant: 'error', duration: 6000 });
       return;
     }
-    await response.json().catch(() => ({}));
+    const data = await response.json().catch(() => ({}));
+    const jobId = data?.job?.job_id;
+    if (jobId) {
+      // Inline promotions come back finished; only poll jobs still in flight.
+      const finished = data.job.status === 'succeeded' || data.job.status === 'failed';
+      const job = finished ? data.job : await this.waitForPromotionJob(jobId);
+      if (!job || job.status !== 'succeeded') {
+        const detail = job?.error || 'Promotion did not finish. Check the adjudication queue and try again.';
+        this.setPromoteBusy(false);
+        this.showToast(detail, { variant: 'error', duration: 6000 });
+        return;
+      }
+    }
     this.setPromoteBusy(false);
     this.lockPromote('This asset has been promoted.');
     this.showToast('Merged layer promoted successfully.', { variant: 'success', duration: 2000 });
@@ -1914,6 +1926,27 @@ const ReviewPage = {
     }, 600);
   },
 
+  async waitForPromotionJob(jobId, { intervalMs = 1000, timeoutMs = 300000 } = {}) {
+    const url = `/api/adjudication/jobs/${encodeURIComponent(jobId)}`;
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => window.setTimeout(resolve, intervalMs));
+      let job = null;
+      try {
+        const response = await fetch(url, { cache: 'no-store' });
+        if (response.ok) {
+          job = await response.json().catch(() => null);
+        }
+      } catch (err) {
+        console.warn('Promotion job poll failed', err);
+      }
+      if (job && job.status !== 'queued' && job.status !== 'running') {
+        return job;
+      }
+    }
+    return null;
+  },
+
   showValidationModal(errors) {
     const list = Array.isArray(errors) ? errors : [];
     if (!list.length) return Promise.resolve();
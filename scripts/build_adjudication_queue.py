@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""Incremental builder for ``data/review/adjudication_queue.json``.
+
+Python counterpart of ``scripts/nightly_adjudication.js`` that shares the
+API's path handling and queue storage. Only assets whose directory,
+``item_meta.json`` or ``qa_result.json`` changed since the previous run's
+checkpoint are re-analysed; the per-asset analysis fans out over a process
+pool. Results are merged into the live queue under its exclusive lock, so
+statuses and assignees set by reviewers are never overwritten.
+
+Usage: python scripts/build_adjudication_queue.py [--full] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api._artifact_io import logical_path, read_artifact_bytes, stored_path  # noqa: E402
+from api._cue_alignment import compare_passes, parse_vtt  # noqa: E402
+from api._pass_index import assigned_pass_dirs, indexed_passes  # noqa: E402
+from api.adjudication import (  # noqa: E402
+    REVIEW_DIR,
+    ROOT_DIR,
+    STAGE2_OUTPUT_DIR,
+    _atomic_write_json,
+    _env_path,
+    _record_version,
+    rebuild_queue,
+)
+
+CONFIG_PATH = _env_path("ADJUDICATION_CONFIG_PATH", ROOT_DIR / "config" / "adjudication.json")
+CHECKPOINT_PATH = REVIEW_DIR / "adjudication_builder_checkpoint.json"
+LOG_DIR = REVIEW_DIR / "logs"
+CHECKPOINT_VERSION = 1
+
+PASS_SEGMENT_REGEX = re.compile(r"pass[_-]?(\d+)", re.IGNORECASE)
+
+QA_F1_KEYS = {
+    "low_f1",
+    "codeswitch_low_f1",
+    "code_switch_low_f1",
+    "rolling_median_code_switch_f1",
+    "rolling_median_codeswitch_f1",
+    "median_code_switch_f1",
+    "median_codeswitch_f1",
+    "codeswitch_f1_median",
+    "code_switch_median_f1",
+    "codeswitch_median_f1",
+    "median_codeswitch",
+    "code_switch_f1",
+    "codeswitch_f1",
+}
+
+QA_CUES_KEYS = {
+    "pct_cues_in_bounds",
+    "pct_cues_within_bounds",
+    "percent_cues_in_bounds",
+    "percentage_cues_in_bounds",
+    "cues_pct_in_bounds",
+    "cues_in_bounds_pct",
+    "cues_in_bounds",
+    "cue_in_bounds_pct",
+}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(read_artifact_bytes(path))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        print(f"Failed to read JSON from {path}: {exc}", file=sys.stderr)
+        return None
+
+
+def _sha1_file(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _mtime_ns(path: Path) -> int:
+    """mtime of the file storing ``path``, compressed or not; 0 if missing."""
+
+    try:
+        return (stored_path(path) or path).stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+# --- change detection -----------------------------------------------------
+
+
+def asset_fingerprint(asset_dir: Path, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the change fingerprint for ``asset_dir``.
+
+    mtimes are compared first; the ``item_meta.json`` hash is only
+    recomputed when its mtime moved, so touching the file without changing
+    it does not force a rescan.
+    """
+
+    meta_path = asset_dir / "item_meta.json"
+    fingerprint = {
+        "dir_mtime_ns": _mtime_ns(asset_dir),
+        "meta_mtime_ns": _mtime_ns(meta_path),
+        "qa_mtime_ns": _mtime_ns(asset_dir / "qa_result.json"),
+    }
+    if previous and previous.get("meta_mtime_ns") == fingerprint["meta_mtime_ns"]:
+        fingerprint["meta_sha1"] = previous.get("meta_sha1")
+    else:
+        fingerprint["meta_sha1"] = _sha1_file(meta_path)
+    return fingerprint
+
+
+def _fingerprint_unchanged(current: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+    if not previous:
+        return False
+    return (
+        current["dir_mtime_ns"] == previous.get("dir_mtime_ns")
+        and current["qa_mtime_ns"] == previous.get("qa_mtime_ns")
+        and current["meta_sha1"] == previous.get("meta_sha1")
+    )
+
+
+# --- per-asset analysis (runs in worker processes) -------------------------
+
+
+def _parse_pass_number(segment: str) -> Optional[int]:
+    match = PASS_SEGMENT_REGEX.search(segment or "")
+    return int(match.group(1)) if match else None
+
+
+def _infer_annotator(segments: List[str], pass_index: int) -> str:
+    def is_valid(seg: Optional[str]) -> bool:
+        return bool(
+            seg
+            and not re.fullmatch(r"pass[_-]?\d+", seg, re.IGNORECASE)
+            and seg.lower() not in {"merged", "aggregate"}
+        )
+
+    before = segments[pass_index - 1] if pass_index > 0 else None
+    if is_valid(before):
+        return before  # type: ignore[return-value]
+    after = segments[pass_index + 1] if pass_index + 1 < len(segments) else None
+    if is_valid(after):
+        return after  # type: ignore[return-value]
+    for seg in segments:
+        if is_valid(seg):
+            return seg
+    return "unknown"
+
+
+def _iter_pass_files(asset_dir: Path, meta: Optional[Dict[str, Any]]) -> Iterable[Tuple[int, str, Path]]:
+    passes = indexed_passes(meta)
+    indexed = bool(passes)
+    if not indexed:
+        # Unindexed API submissions live in ``<annotator>/``; pipeline
+        # ``pass_*`` trees are still found by the walk below.
+        passes = assigned_pass_dirs(asset_dir, meta)
+    for entry in passes or []:
+        pass_dir = asset_dir / entry["path"]
+        segments = list(Path(entry["path"]).parts)
+        pass_index = next(
+            (i for i, seg in enumerate(segments) if _parse_pass_number(seg) is not None), -1
+        )
+        if pass_index >= 0:
+            annotator = _infer_annotator(segments, pass_index)
+        else:
+            annotator = segments[-1] if segments else "unknown"
+        for name in ("code_switch_spans.json", "transcript.vtt"):
+            yield entry["pass_number"], annotator, pass_dir / name
+    if indexed:
+        return
+    for root, _dirs, files in os.walk(asset_dir):
+        rel_root = Path(root).relative_to(asset_dir)
+        for stored_name in files:
+            name = logical_path(Path(stored_name)).name
+            if name not in {"code_switch_spans.json", "transcript.vtt"}:
+                continue
+            segments = list((rel_root / name).parts)
+            pass_index = next(
+                (i for i, seg in enumerate(segments) if _parse_pass_number(seg) is not None), -1
+            )
+            if pass_index < 0:
+                continue
+            number = _parse_pass_number(segments[pass_index])
+            yield number, _infer_annotator(segments, pass_index), Path(root) / name  # type: ignore[misc]
+
+
+def collect_pass_data(asset_dir: Path, meta: Optional[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    passes: Dict[int, Dict[str, Any]] = {}
+    for number, annotator, path in _iter_pass_files(asset_dir, meta):
+        mtime = _mtime_ns(path)
+        if not mtime:
+            continue
+        record = passes.setdefault(
+            number,
+            {"annotator_id": annotator, "vote": None, "vote_mtime": -1, "voice": None, "voice_mtime": -1},
+        )
+        if record["annotator_id"] == "unknown" and annotator != "unknown":
+            record["annotator_id"] = annotator
+        if path.name == "code_switch_spans.json":
+            if mtime < record["vote_mtime"]:
+                continue
+            data = _read_json(path)
+            spans = data.get("spans") if isinstance(data, dict) else None
+            record["vote"] = 1 if isinstance(spans, list) and spans else 0
+            record["vote_mtime"] = mtime
+        else:
+            if mtime < record["voice_mtime"]:
+                continue
+            try:
+                content = read_artifact_bytes(path).decode("utf-8")
+            except (OSError, ValueError) as exc:
+                print(f"Failed to read {path}: {exc}", file=sys.stderr)
+                continue
+            record["voice"] = parse_vtt(content)
+            record["voice_mtime"] = mtime
+    return passes
+
+
+def _coerce_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value == value and abs(value) != float("inf") else None
+    if isinstance(value, str):
+        text = re.sub(r"[,\s%]+", "", value.strip())
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+def _finite_number(value: Any) -> Optional[float]:
+    """Config values must already be numbers, as with ``Number.isFinite``."""
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return _coerce_number(value)
+
+
+def _normalize_probability(value: Any) -> Optional[float]:
+    num = _coerce_number(value)
+    if num is None:
+        return None
+    return num / 100 if abs(num) > 1 else num
+
+
+def _normalize_percent(value: Any) -> Optional[float]:
+    num = _coerce_number(value)
+    if num is None:
+        return None
+    return num * 100 if 0 <= num <= 1 else num
+
+
+def extract_qa_metrics(source: Any) -> Dict[str, Optional[float]]:
+    f1: Optional[float] = None
+    cues: Optional[float] = None
+    queue: List[Any] = [source]
+    while queue:
+        current = queue.pop(0)
+        if isinstance(current, list):
+            queue.extend(current)
+            continue
+        if not isinstance(current, dict):
+            continue
+        for key, value in current.items():
+            lower = str(key).lower()
+            if f1 is None and lower in QA_F1_KEYS:
+                f1 = _normalize_probability(value)
+            if cues is None and lower in QA_CUES_KEYS:
+                cues = _normalize_percent(value)
+            if f1 is not None and cues is not None:
+                return {"f1": f1, "cuesInBounds": cues}
+            if isinstance(value, (dict, list)):
+                queue.append(value)
+    return {"f1": f1, "cuesInBounds": cues}
+
+
+def is_double_pass_target(*candidates: Any) -> bool:
+    for candidate in candidates:
+        if not isinstance(candidate, dict):
+            continue
+        for key in ("double_pass_target", "doublePassTarget", "double_pass", "doublePass"):
+            if candidate.get(key) is True:
+                return True
+        if candidate.get("target_type") == "double_pass":
+            return True
+        assignment = candidate.get("assignment")
+        if isinstance(assignment, dict) and assignment.get("double_pass_target") is True:
+            return True
+        assignments = candidate.get("assignments")
+        if isinstance(assignments, list) and any(
+            isinstance(entry, dict) and (_coerce_number(entry.get("pass_number")) or 0) >= 2
+            for entry in assignments
+        ):
+            return True
+    return False
+
+
+def _normalize_category(value: Any, fallback: str = "unknown") -> str:
+    if value is None:
+        return fallback
+    text = str(value).strip()
+    return text.lower() if text else fallback
+
+
+def _first_defined(obj: Dict[str, Any], keys: List[str]) -> Any:
+    for key in keys:
+        if obj.get(key) is not None:
+            return obj[key]
+    return None
+
+
+def infer_cell_key(meta: Any) -> str:
+    if not isinstance(meta, dict):
+        return "unknown:unknown:*:*"
+    candidates: List[Dict[str, Any]] = []
+    if isinstance(meta.get("assigned_cell"), dict):
+        candidates.append(meta["assigned_cell"])
+    assignment = meta.get("assignment")
+    if isinstance(assignment, dict):
+        if isinstance(assignment.get("cell"), dict):
+            candidates.append(assignment["cell"])
+        if isinstance(assignment.get("cells"), list):
+            candidates.extend(cell for cell in assignment["cells"] if isinstance(cell, dict))
+    if isinstance(meta.get("cell"), dict):
+        candidates.append(meta["cell"])
+    if isinstance(meta.get("cells"), list):
+        candidates.extend(cell for cell in meta["cells"] if isinstance(cell, dict))
+    cell = candidates[0] if candidates else meta
+    family = _normalize_category(
+        _first_defined(
+            cell,
+            ["dialect_family", "dialectFamily", "dialect_family_code", "dialect_family_label", "dialect"],
+        )
+    )
+    subregion = _normalize_category(
+        _first_defined(
+            cell,
+            ["subregion", "dialect_subregion", "dialectSubregion", "dialect_region", "sub_dialect"],
+        )
+    )
+    return f"{family}:{subregion}:*:*"
+
+
+def analyze_asset(asset_dir_str: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify one asset; mirrors the per-asset loop of the JS job."""
+
+    asset_dir = Path(asset_dir_str)
+    asset_id = asset_dir.name
+    meta = _read_json(asset_dir / "item_meta.json")
+    passes = collect_pass_data(asset_dir, meta if isinstance(meta, dict) else None)
+    pass1, pass2 = passes.get(1), passes.get(2)
+    if not pass1 or not pass2:
+        return {"asset_id": asset_id, "outcome": "single_pass"}
+
+    adjudication = meta.get("adjudication") if isinstance(meta, dict) else None
+    if isinstance(adjudication, dict) and str(adjudication.get("status") or "").lower() in {
+        "locked",
+        "resolved",
+    }:
+        return {"asset_id": asset_id, "outcome": "locked"}
+
+    qa_result = _read_json(asset_dir / "qa_result.json")
+    if not is_double_pass_target(meta, qa_result):
+        return {"asset_id": asset_id, "outcome": "not_target"}
+
+    gates = config.get("gates") if isinstance(config.get("gates"), dict) else {}
+    min_cue_pairs = _finite_number(config.get("min_cue_pairs_for_voiceTag")) or 0
+    include_voice_tag = bool(gates.get("include_voice_tag_disagreements"))
+    low_f1_threshold = _finite_number(gates.get("require_low_f1_lt"))
+    cues_threshold = _finite_number(gates.get("require_cues_in_bounds_lt"))
+
+    has_cs_disagreement = (
+        pass1["vote"] is not None and pass2["vote"] is not None and pass1["vote"] != pass2["vote"]
+    )
+    alignment = compare_passes(pass1["voice"] or parse_vtt(""), pass2["voice"] or parse_vtt(""))
+    voice_tag_disagreement = (
+        alignment["pairs"] >= min_cue_pairs and alignment["voice_tag_disagreements"] > 0
+    )
+
+    qa_metrics = extract_qa_metrics(qa_result)
+    low_f1_risk = (
+        low_f1_threshold is not None and qa_metrics["f1"] is not None and qa_metrics["f1"] < low_f1_threshold
+    )
+    cues_risk = (
+        cues_threshold is not None
+        and qa_metrics["cuesInBounds"] is not None
+        and qa_metrics["cuesInBounds"] < cues_threshold
+    )
+
+    reasons = set()
+    if low_f1_risk:
+        reasons.add("low_f1")
+    if cues_risk:
+        reasons.add("cues_out_of_bounds")
+    if has_cs_disagreement and (low_f1_risk or cues_risk):
+        reasons.add("hasCS_disagreement")
+    if include_voice_tag and voice_tag_disagreement:
+        reasons.add("voiceTag_disagreement")
+
+    result: Dict[str, Any] = {"asset_id": asset_id, "outcome": "target", "alignment": alignment}
+    if "hasCS_disagreement" in reasons or "voiceTag_disagreement" in reasons:
+        result["candidate"] = {
+            "asset_id": asset_id,
+            "reasons": sorted(reasons),
+            "pass_annotators": {
+                "pass_1": pass1["annotator_id"] or None,
+                "pass_2": pass2["annotator_id"] or None,
+            },
+            "cell": infer_cell_key(meta),
+            "qa_metrics": qa_metrics,
+        }
+    return result
+
+
+# --- orchestration --------------------------------------------------------
+
+
+def _load_checkpoint(config_sha: str, full: bool) -> Dict[str, Any]:
+    data = None if full else _read_json(CHECKPOINT_PATH)
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != CHECKPOINT_VERSION
+        or data.get("config_sha") != config_sha
+        or not isinstance(data.get("assets"), dict)
+    ):
+        return {}
+    return data["assets"]
+
+
+# Candidate fields copied onto a queue record; only a change to one of them
+# bumps the record's version.
+MERGED_FIELDS = ("reasons", "cell", "pass_annotators", "config_sha")
+
+
+def _merge_candidates(
+    records: List[dict],
+    candidates: List[Dict[str, Any]],
+    config_sha: str,
+    stats: Dict[str, int],
+    analysed: Optional[Set[str]] = None,
+) -> List[dict]:
+    """Insert new candidates and fold changed ones into their queue records.
+
+    Records for assets not in ``analysed`` (their checkpointed result was
+    reused) are left alone, and so are records the candidate would not
+    change, so reviewers' If-Match versions and the change feed only move
+    when a record really does.
+    """
+
+    now = _now_iso()
+    positions = {record.get("asset_id"): index for index, record in enumerate(records)}
+    for candidate in candidates:
+        index = positions.get(candidate["asset_id"])
+        if index is not None:
+            if analysed is not None and candidate["asset_id"] not in analysed:
+                continue
+            existing = records[index]
+            merged = dict(existing)
+            merged["reasons"] = sorted(set(existing.get("reasons") or []) | set(candidate["reasons"]))
+            merged["config_sha"] = config_sha
+            merged["pass_annotators"] = candidate["pass_annotators"]
+            merged["cell"] = candidate["cell"]
+            if all(merged.get(name) == existing.get(name) for name in MERGED_FIELDS):
+                continue
+            merged["last_seen_at"] = now
+            merged["version"] = _record_version(existing) + 1
+            records[index] = merged
+            stats["updated"] += 1
+            continue
+        positions[candidate["asset_id"]] = len(records)
+        records.append(
+            {
+                "asset_id": candidate["asset_id"],
+                "reasons": candidate["reasons"],
+                "queued_at": now,
+                "last_seen_at": now,
+                "status": "pending",
+                "assignee": None,
+                "pass_annotators": candidate["pass_annotators"],
+                "cell": candidate["cell"],
+                "config_sha": config_sha,
+            }
+        )
+        stats["inserted"] += 1
+    records.sort(key=lambda record: str(record.get("asset_id") or ""))
+    return records
+
+
+def _write_log(config_sha: str, stats: Dict[str, int], candidates: List[Dict[str, Any]]) -> None:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    lines = [
+        f"[{_now_iso()}] nightly adjudication summary",
+        f"Config SHA: {config_sha}",
+        f"Assets scanned: {stats['scanned']}",
+        f"Assets re-analysed: {stats['analysed']}",
+        f"Double-pass targets: {stats['double_pass_targets']}",
+        f"Skipped locked/resolved: {stats['locked']}",
+        f"Eligible candidates: {len(candidates)}",
+        f"Inserted: {stats['inserted']}",
+        f"Updated: {stats['updated']}",
+    ]
+    if candidates:
+        lines.append("Details:")
+        for candidate in candidates:
+            lines.append(
+                f"  - {candidate['asset_id']}: reasons={', '.join(candidate['reasons'])}; "
+                f"annotators={json.dumps(candidate['pass_annotators'])}"
+            )
+    lines.append("")
+    log_path = LOG_DIR / f"adjudication_{config_sha}_{today}.log"
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+
+
+def build_queue(full: bool = False, workers: Optional[int] = None) -> Dict[str, int]:
+    try:
+        config_raw = CONFIG_PATH.read_bytes()
+    except FileNotFoundError:
+        raise SystemExit(f"Adjudication config not found at {CONFIG_PATH}")
+    config = json.loads(config_raw)
+    config_sha = hashlib.sha1(config_raw).hexdigest()
+
+    previous = _load_checkpoint(config_sha, full)
+    asset_dirs = (
+        sorted(path for path in STAGE2_OUTPUT_DIR.iterdir() if path.is_dir())
+        if STAGE2_OUTPUT_DIR.is_dir()
+        else []
+    )
+
+    stats = {
+        "scanned": len(asset_dirs),
+        "analysed": 0,
+        "double_pass_targets": 0,
+        "locked": 0,
+        "inserted": 0,
+        "updated": 0,
+    }
+    next_assets: Dict[str, Any] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    stale: List[Path] = []
+    analysed_ids: Set[str] = set()
+    for asset_dir in asset_dirs:
+        prior = previous.get(asset_dir.name)
+        fingerprint = asset_fingerprint(asset_dir, prior.get("fingerprint") if prior else None)
+        next_assets[asset_dir.name] = {"fingerprint": fingerprint}
+        if prior and _fingerprint_unchanged(fingerprint, prior.get("fingerprint")):
+            results[asset_dir.name] = prior["result"]
+        else:
+            stale.append(asset_dir)
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            analysed = pool.map(
+                analyze_asset,
+                [str(path) for path in stale],
+                [config] * len(stale),
+                chunksize=max(1, len(stale) // ((workers or os.cpu_count() or 1) * 4)),
+            )
+            for result in analysed:
+                results[result["asset_id"]] = result
+                analysed_ids.add(result["asset_id"])
+        stats["analysed"] = len(stale)
+
+    candidates: List[Dict[str, Any]] = []
+    for asset_id, result in results.items():
+        next_assets[asset_id]["result"] = result
+        if result["outcome"] == "locked":
+            stats["locked"] += 1
+        elif result["outcome"] == "target":
+            stats["double_pass_targets"] += 1
+            if result.get("candidate"):
+                candidates.append(result["candidate"])
+    candidates.sort(key=lambda candidate: candidate["asset_id"])
+
+    rebuild_queue(lambda records: _merge_candidates(records, candidates, config_sha, stats, analysed_ids))
+    _atomic_write_json(
+        CHECKPOINT_PATH,
+        {
+            "version": CHECKPOINT_VERSION,
+            "config_sha": config_sha,
+            "built_at": _now_iso(),
+            "assets": next_assets,
+        },
+    )
+    _write_log(config_sha, stats, candidates)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="ignore the checkpoint and rescan every asset")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    stats = build_queue(full=args.full, workers=args.workers)
+    print(
+        f"Processed {stats['scanned']} assets ({stats['analysed']} re-analysed), "
+        f"queued {stats['inserted']} new and updated {stats['updated']} adjudication records."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
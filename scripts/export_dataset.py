@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Export stage2 clips into a versioned dataset, one process per CPU.
+
+Writes ``clips/``, ``dataset.jsonl``, ``qa_summary.json`` and
+``export_log.txt`` the way ``scripts/export_dataset.js`` does, but streams
+records as they are built and runs the per-asset work in parallel. An
+interrupted export resumes from its last checkpoint when rerun with the
+same options.
+
+Usage:
+    python scripts/export_dataset.py --version v1.2 [--public] [--workers 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api._dataset_export import export_dataset, load_provenance, load_rights  # noqa: E402
+from api.annotations import STAGE2_OUTPUT_DIR  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", required=True)
+    parser.add_argument("--source", type=Path, default=STAGE2_OUTPUT_DIR)
+    parser.add_argument("--out", type=Path, default=Path("datasets"))
+    parser.add_argument("--exclude-gold", action="store_true", help="skip clips marked as gold targets")
+    parser.add_argument("--min-f1", type=float, default=0.80)
+    parser.add_argument("--split-ratio", default="0.8,0.1,0.1")
+    parser.add_argument("--rights", type=Path, help="rights metadata (JSON or CSV)")
+    parser.add_argument("--provenance", type=Path, help="provenance ledger (JSON or CSV)")
+    parser.add_argument("--public", action="store_true", help="redacted public evaluation subset")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="assets between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    try:
+        rights = load_rights(args.rights) if args.rights else {}
+    except (OSError, ValueError) as exc:
+        print(f"Warning: failed to load rights metadata: {exc}", file=sys.stderr)
+        rights = {}
+    try:
+        provenance = load_provenance(args.provenance) if args.provenance else {}
+    except (OSError, ValueError) as exc:
+        print(f"Warning: failed to load provenance ledger: {exc}", file=sys.stderr)
+        provenance = {}
+
+    try:
+        result = export_dataset(
+            args.source,
+            args.out,
+            args.version,
+            min_f1=args.min_f1,
+            include_gold=not args.exclude_gold,
+            split_ratio=args.split_ratio,
+            public=args.public,
+            rights=rights,
+            provenance=provenance,
+            workers=args.workers,
+            checkpoint_every=args.checkpoint_every,
+            resume=not args.restart,
+        )
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    resumed = f" (resumed after {result['resumed_after']})" if result["resumed_after"] else ""
+    print(f"Export complete{resumed}. {result['records']} clips written to {result['dataset_root']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
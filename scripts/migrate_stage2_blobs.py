@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Move an existing ``stage2_output`` tree onto the content-addressed blob store.
+
+Every artifact file (everything except ``item_meta.json``) is hashed, stored
+once in ``STAGE2_BLOB_DIR`` and replaced by a hardlink to that blob, so
+byte-identical files across passes, annotators and ``merged/`` share one
+copy on disk. Safe to re-run: files that are already views are skipped.
+
+Usage:
+    python scripts/migrate_stage2_blobs.py [--dry-run]
+    python scripts/migrate_stage2_blobs.py --gc [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api._blob_store import BlobStore, sha256_file, is_blob_eligible  # noqa: E402
+from api.annotations import STAGE2_BLOB_DIR, STAGE2_OUTPUT_DIR  # noqa: E402
+
+
+def _iter_artifacts(root: Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.is_file() and not path.is_symlink() and is_blob_eligible(path):
+                yield path
+
+
+def migrate(store: BlobStore, dry_run: bool) -> Dict[str, int]:
+    stats = {"files": 0, "already_linked": 0, "linked": 0, "copied": 0, "unique_blobs": 0}
+    inodes_before: Set[Tuple[int, int]] = set()
+    sizes: Dict[Tuple[int, int], int] = {}
+    digests: Dict[str, int] = {}
+    for path in _iter_artifacts(STAGE2_OUTPUT_DIR):
+        stats["files"] += 1
+        stat = path.stat()
+        key = (stat.st_dev, stat.st_ino)
+        inodes_before.add(key)
+        sizes[key] = stat.st_size
+        digest = sha256_file(path)
+        digests.setdefault(digest, stat.st_size)
+        if store.is_view(path, digest):
+            stats["already_linked"] += 1
+            continue
+        if dry_run:
+            continue
+        store.put_file(path)
+        if store.link_view(digest, path):
+            stats["linked"] += 1
+        else:
+            stats["copied"] += 1
+    stats["unique_blobs"] = len(digests)
+    stats["bytes_before"] = sum(sizes[key] for key in inodes_before)
+    stats["bytes_after"] = sum(digests.values())
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report savings without changing files")
+    parser.add_argument("--gc", action="store_true", help="delete blobs no artifact links to")
+    args = parser.parse_args(argv)
+
+    store = BlobStore(STAGE2_BLOB_DIR)
+    if args.gc:
+        stats = store.collect_garbage(dry_run=args.dry_run)
+        print(
+            f"Checked {stats['blobs']} blobs, "
+            f"{'would remove' if args.dry_run else 'removed'} {stats['removed']} "
+            f"({stats['bytes_freed']} bytes)."
+        )
+        return 0
+
+    if not STAGE2_OUTPUT_DIR.is_dir():
+        print(f"No stage2 output at {STAGE2_OUTPUT_DIR}", file=sys.stderr)
+        return 1
+    stats = migrate(store, args.dry_run)
+    print(
+        f"{stats['files']} artifact files, {stats['unique_blobs']} unique bodies; "
+        f"{stats['already_linked']} already linked, {stats['linked']} linked, {stats['copied']} copied. "
+        f"Disk use {stats['bytes_before']} -> {stats['bytes_after']} bytes"
+        f"{' (dry run)' if args.dry_run else ''}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Recompute the QA rollup store from every ``qa_result.json`` on disk.
+
+Annotation submits keep the store current; run this once for output written
+before the store existed, or if it was lost.
+
+Usage:
+    python scripts/rebuild_qa_rollup.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api._artifact_io import load_artifact_json  # noqa: E402
+from api._pass_index import discover_passes  # noqa: E402
+from api._qa_rollup import QARollupStore, contribution_from_qa  # noqa: E402
+from api.annotations import QA_ROLLUP_DIR, STAGE2_OUTPUT_DIR  # noqa: E402
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    try:
+        data = load_artifact_json(path)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _iter_contributions() -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for asset_dir in sorted(path for path in STAGE2_OUTPUT_DIR.iterdir() if path.is_dir()):
+        passes = discover_passes(asset_dir, _load(asset_dir / "item_meta.json"))
+        for rel_path in dict.fromkeys(str(entry["path"]) for entry in passes):
+            pass_dir = asset_dir / rel_path
+            qa_record = _load(pass_dir / "qa_result.json")
+            if not qa_record:
+                continue
+            payload = _load(pass_dir / "annotation.json")
+            annotator_id = os.path.basename(rel_path)
+            yield f"{asset_dir.name}/{rel_path}", contribution_from_qa(
+                qa_record, annotator_id, payload.get("assigned_cell"), qa_record.get("submitted_at")
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+    if not STAGE2_OUTPUT_DIR.is_dir():
+        print(f"No stage2 output at {STAGE2_OUTPUT_DIR}", file=sys.stderr)
+        return 1
+    totals = QARollupStore(QA_ROLLUP_DIR).rebuild(_iter_contributions())
+    print(
+        f"Rolled up {totals['overall']['clips']} submissions across "
+        f"{len(totals['annotator'])} annotators, {len(totals['cell'])} cells and {len(totals['day'])} days."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Shared setup for the Python API tests.
+
+The ``api`` modules read their data directories from the environment at
+import time, so every one of them is pointed at a throwaway directory
+before any test imports them. Tests that write to disk then repoint the
+module-level paths they use at their own ``tmp_path``.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="annotate-tests-"))
+for _name, _sub in {
+    "STAGE2_OUTPUT_DIR": "stage2_output",
+    "STAGE2_SUMMARY_DIR": "stage2_summary",
+    "STAGE2_BLOB_DIR": "stage2_blobs",
+    "ADJUDICATION_OUTPUT_DIR": "review",
+    "ANNOTATIONS_IDEMPOTENCY_DIR": "idempotency",
+    "ANNOTATIONS_WAL_DIR": "ingest_wal",
+    "EXPORT_CACHE_DIR": "export_cache",
+    "QA_ROLLUP_DIR": "qa_rollup",
+}.items():
+    os.environ[_name] = str(_DATA_DIR / _sub)
+# Tests talk to Supabase only through the fakes they install.
+for _name in ("NEXT_PUBLIC_SUPABASE_URL", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY", "SUPABASE_SERVICE_KEY", "SUPABASE_ANON_KEY"):
+    os.environ.pop(_name, None)
+
+
+class FakeResponse:
+    def __init__(self, status_code=201, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload if payload is not None else []
+        self.headers = headers or {}
+        self.text = ""
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+@pytest.fixture
+def fake_response():
+    return FakeResponse
+
+
+@pytest.fixture
+def adjudication(tmp_path, monkeypatch):
+    """``api.adjudication`` with its queue, journal and output under ``tmp_path``."""
+
+    from api import adjudication as module
+    from api._stage2_summary import SummaryCache
+
+    review = tmp_path / "review"
+    output = tmp_path / "stage2_output"
+    output.mkdir()
+    monkeypatch.setattr(module, "REVIEW_DIR", review)
+    monkeypatch.setattr(module, "QUEUE_PATH", review / "adjudication_queue.json")
+    monkeypatch.setattr(module, "JOURNAL_PATH", review / "adjudication_queue.journal.jsonl")
+    monkeypatch.setattr(module, "JOURNAL_ARCHIVE_DIR", review / "logs")
+    monkeypatch.setattr(module, "JOBS_DIR", review / "jobs")
+    monkeypatch.setattr(module, "RECORD_LOCK_DIR", review / "locks")
+    monkeypatch.setattr(module, "STAGE2_OUTPUT_DIR", output)
+    monkeypatch.setattr(module, "SUMMARY_CACHE", SummaryCache(output, tmp_path / "stage2_summary"))
+    monkeypatch.setattr(module, "_QUEUE_STATE", None)
+    monkeypatch.setattr(module, "_QUEUE_INDEX", None)
+    return module
+
+
+@pytest.fixture
+def annotations(tmp_path, monkeypatch):
+    """``api.annotations`` writing under ``tmp_path`` with Supabase off."""
+
+    from api import annotations as module
+    from api._export_cache import ExportCache
+    from api._idempotency import IdempotencyStore
+    from api._qa_rollup import QARollupStore
+    from api._stage2_summary import SummaryCache
+
+    output = tmp_path / "stage2_output"
+    output.mkdir(exist_ok=True)
+    monkeypatch.setattr(module, "STAGE2_OUTPUT_DIR", output)
+    monkeypatch.setattr(module, "SUMMARY_CACHE", SummaryCache(output, tmp_path / "stage2_summary"))
+    monkeypatch.setattr(module, "QA_ROLLUP", QARollupStore(tmp_path / "qa_rollup"))
+    monkeypatch.setattr(module, "EXPORT_CACHE", ExportCache(tmp_path / "export_cache", 0))
+    monkeypatch.setattr(module, "IDEMPOTENCY_STORE", IdempotencyStore(tmp_path / "idempotency", 3600, 100))
+    monkeypatch.setattr(module, "INGEST_WAL", None)
+    monkeypatch.setattr(module, "BLOB_STORE", None)
+    monkeypatch.setattr(module, "SUPABASE_URL", None)
+    monkeypatch.setattr(module, "SUPABASE_KEY", None)
+    return module
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    """``api.export`` reading and caching under ``tmp_path`` with Supabase off."""
+
+    from api import export as module
+    from api._export_cache import ExportCache
+    from api._qa_rollup import QARollupStore
+    from api._stage2_summary import SummaryCache
+
+    output = tmp_path / "stage2_output"
+    output.mkdir(exist_ok=True)
+    monkeypatch.setattr(module, "STAGE2_OUTPUT_DIR", output)
+    monkeypatch.setattr(module, "SUMMARY_CACHE", SummaryCache(output, tmp_path / "stage2_summary"))
+    monkeypatch.setattr(module, "QA_ROLLUP", QARollupStore(tmp_path / "qa_rollup"))
+    monkeypatch.setattr(module, "EXPORT_CACHE", ExportCache(tmp_path / "export_cache", 0))
+    monkeypatch.setattr(module, "SUPABASE_URL", None)
+    monkeypatch.setattr(module, "SUPABASE_KEY", None)
+    return module
+
+
+@pytest.fixture
+def annotation_payload():
+    """Factory for minimal valid ``POST /api/annotations`` bodies."""
+
+    return _annotation_payload
+
+
+def _annotation_payload(asset_id="ea_1", annotator="ann", pass_number=1, **overrides):
+    payload = {
+        "asset_id": asset_id,
+        "pass_number": pass_number,
+        "files": {
+            "transcript_vtt": "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nhola\n",
+            "translation_vtt": "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nhello\n",
+            "code_switch_vtt": "WEBVTT\n",
+            "code_switch_spans_json": "[]",
+        },
+        "qa": {"annotator_id": annotator},
+    }
+    payload.update(overrides)
+    return payload
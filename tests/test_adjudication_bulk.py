@@ -0,0 +1,55 @@
+import json
+
+from fastapi.testclient import TestClient
+
+
+def _client(adjudication, count=3):
+    records = [{"asset_id": f"ea_{i}", "status": "pending"} for i in range(count)]
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, records)
+    return TestClient(adjudication.app)
+
+
+def test_bulk_applies_valid_operations_and_reports_failures(adjudication):
+    client = _client(adjudication)
+    response = client.post(
+        "/api/adjudication/bulk",
+        json={
+            "operations": [
+                {"op": "assign", "asset_id": "ea_0", "assignee": "rev"},
+                {"op": "status", "asset_id": "ea_0", "status": "in_review"},
+                {"op": "assign", "asset_id": "missing", "assignee": "rev"},
+                {"op": "assign", "asset_id": "ea_1"},
+                {"op": "explode", "asset_id": "ea_2"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["ok"] for r in results] == [True, True, False, False, False]
+    assert [r.get("status_code") for r in results[2:]] == [404, 400, 400]
+
+    records = {r["asset_id"]: r for r in adjudication._read_queue()}
+    assert records["ea_0"]["status"] == "in_review"
+    assert records["ea_0"]["assignee"] == "rev"
+    assert records["ea_1"]["status"] == "pending"
+
+
+def test_bulk_journals_with_a_single_append(adjudication):
+    client = _client(adjudication)
+    client.post(
+        "/api/adjudication/bulk",
+        json={"operations": [{"op": "status", "asset_id": f"ea_{i}", "status": "done"} for i in range(3)]},
+    )
+    entries = [json.loads(line) for line in adjudication.JOURNAL_PATH.read_text().splitlines()[1:]]
+    assert [entry["asset_id"] for entry in entries] == ["ea_0", "ea_1", "ea_2"]
+
+
+def test_bulk_rejects_oversized_requests(adjudication, monkeypatch):
+    monkeypatch.setattr(adjudication, "BULK_MAX_OPERATIONS", 2)
+    client = _client(adjudication)
+    response = client.post(
+        "/api/adjudication/bulk",
+        json={"operations": [{"op": "status", "asset_id": "ea_0", "status": "done"}] * 3},
+    )
+    assert response.status_code == 400
+    assert not adjudication.JOURNAL_PATH.exists()
@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(adjudication):
+    adjudication._atomic_write_json(
+        adjudication.QUEUE_PATH, [{"asset_id": f"ea_{i}", "status": "pending"} for i in range(3)]
+    )
+    return TestClient(adjudication.app)
+
+
+def _changes(client, **params):
+    response = client.get("/api/adjudication/changes", params=params)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    return response.json()
+
+
+def test_feed_returns_changes_after_the_cursor(client):
+    start = _changes(client)["cursor"]
+    client.post("/api/adjudication/assign", json={"asset_id": "ea_0", "assignee": "rev"})
+    client.post("/api/adjudication/status", json={"asset_id": "ea_1", "status": "done"})
+
+    feed = _changes(client, since=start)
+    assert feed["reset"] is False
+    assert [(c["asset_id"], c["set"]["status"]) for c in feed["changes"]] == [("ea_0", "assigned"), ("ea_1", "done")]
+    assert feed["changes"][-1]["cursor"] == feed["cursor"]
+
+    client.post("/api/adjudication/status", json={"asset_id": "ea_2", "status": "done"})
+    following = _changes(client, since=feed["changes"][0]["cursor"])
+    assert [c["asset_id"] for c in following["changes"]] == ["ea_1", "ea_2"]
+
+
+def test_idle_feed_returns_an_empty_page_after_waiting(client):
+    cursor = _changes(client)["cursor"]
+    feed = _changes(client, since=cursor, wait=0.01)
+    assert feed == {"changes": [], "cursor": cursor, "reset": False}
+
+
+def test_compaction_past_the_cursor_asks_for_a_reload(adjudication, client, monkeypatch):
+    cursor = _changes(client)["cursor"]
+    monkeypatch.setattr(adjudication, "JOURNAL_COMPACT_EVERY", 1)
+    client.post("/api/adjudication/status", json={"asset_id": "ea_0", "status": "done"})
+
+    feed = _changes(client, since=cursor)
+    assert feed["reset"] is True
+    assert feed["changes"] == []
+    assert _changes(client, since=feed["cursor"])["reset"] is False
+
+
+def test_compaction_after_the_state_is_loaded_still_resets(adjudication, client, monkeypatch):
+    cursor = _changes(client)["cursor"]
+    client.post("/api/adjudication/status", json={"asset_id": "ea_0", "status": "done"})
+    load_state = adjudication._load_queue_state
+    compacted = []
+
+    def load_then_compact():
+        state = load_state()
+        if not compacted:
+            # Another worker compacts and appends to the new journal right
+            # after this request read the queue state.
+            compacted.append(True)
+            adjudication._compact_journal(state)
+            for asset_id in ("ea_1", "ea_2"):
+                adjudication._update_queue_record(asset_id, adjudication._status_mutator("done"), "status", "rev")
+        return state
+
+    monkeypatch.setattr(adjudication, "_load_queue_state", load_then_compact)
+    feed = _changes(client, since=cursor)
+    assert feed["reset"] is True
+    assert feed["changes"] == []
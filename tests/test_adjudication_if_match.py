@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+
+def _client(adjudication):
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, [{"asset_id": "ea_1", "status": "pending"}])
+    return TestClient(adjudication.app)
+
+
+def test_each_mutation_bumps_the_version_and_etag(adjudication):
+    client = _client(adjudication)
+    assert client.get("/api/adjudication/queue/ea_1").headers["ETag"] == '"0"'
+
+    response = client.post("/api/adjudication/assign", json={"asset_id": "ea_1", "assignee": "rev"})
+    assert response.json()["version"] == 1
+    assert response.headers["ETag"] == '"1"'
+    assert client.get("/api/adjudication/queue/ea_1").headers["ETag"] == '"1"'
+
+
+def test_matching_if_match_is_accepted_in_any_spelling(adjudication):
+    client = _client(adjudication)
+    for tag, expected in (('"0"', 1), ("W/\"1\"", 2), ("1, 2", 3), ("*", 4)):
+        response = client.post(
+            "/api/adjudication/status",
+            json={"asset_id": "ea_1", "status": "in_review"},
+            headers={"If-Match": tag},
+        )
+        assert response.status_code == 200, tag
+        assert response.json()["version"] == expected
+
+
+def test_stale_if_match_is_rejected_with_the_current_etag(adjudication):
+    client = _client(adjudication)
+    client.post("/api/adjudication/assign", json={"asset_id": "ea_1", "assignee": "rev"})
+
+    response = client.post(
+        "/api/adjudication/status",
+        json={"asset_id": "ea_1", "status": "done"},
+        headers={"If-Match": '"0"'},
+    )
+    assert response.status_code == 409
+    assert response.headers["ETag"] == '"1"'
+    assert adjudication._read_queue()[0]["status"] == "assigned"
+
+
+def test_bulk_if_match_is_checked_per_operation(adjudication):
+    client = _client(adjudication)
+    results = client.post(
+        "/api/adjudication/bulk",
+        json={
+            "operations": [
+                {"op": "status", "asset_id": "ea_1", "status": "in_review", "if_match": '"0"'},
+                {"op": "status", "asset_id": "ea_1", "status": "done", "if_match": '"0"'},
+                {"op": "status", "asset_id": "ea_1", "status": "done", "if_match": '"1"'},
+            ]
+        },
+    ).json()["results"]
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["status_code"] == 409
+    assert results[2]["etag"] == '"2"'
@@ -0,0 +1,114 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(adjudication):
+    asset = adjudication.STAGE2_OUTPUT_DIR / "ea_1"
+    (asset / "ann").mkdir(parents=True)
+    (asset / "ann" / "transcript.vtt").write_text("WEBVTT\n")
+    (asset / "item_meta.json").write_text(
+        json.dumps({"assignments": [{"annotator_id": "ann", "pass_number": 1}]})
+    )
+    adjudication._atomic_write_json(
+        adjudication.QUEUE_PATH, [{"asset_id": "ea_1", "status": "in_review"}]
+    )
+    return TestClient(adjudication.app)
+
+
+def _wait(client, job_id):
+    for _ in range(200):
+        job = client.get(f"/api/adjudication/jobs/{job_id}").json()
+        if job["status"] in {"succeeded", "failed"}:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_background_promotion_is_polled_to_completion(adjudication, client, monkeypatch):
+    monkeypatch.setattr(adjudication, "PROMOTE_MODE", "background")
+    response = client.post("/api/adjudication/promote", json={"asset_id": "ea_1", "adjudicator_id": "lead"})
+    assert response.status_code == 202
+    assert response.headers["Location"].endswith(response.json()["job"]["job_id"])
+
+    job = _wait(client, response.json()["job"]["job_id"])
+    assert job["status"] == "succeeded"
+    assert job["result"]["merged_path"] == "merged"
+    assert (adjudication.STAGE2_OUTPUT_DIR / "ea_1" / "merged" / "transcript.vtt").exists()
+
+
+def test_inline_promotion_finishes_within_the_request(adjudication, client, monkeypatch):
+    monkeypatch.setattr(adjudication, "PROMOTE_MODE", "inline")
+    submitted = []
+    monkeypatch.setattr(adjudication._PROMOTION_POOL, "submit", lambda *args: submitted.append(args))
+
+    response = client.post("/api/adjudication/promote", json={"asset_id": "ea_1", "adjudicator_id": "lead"})
+
+    assert response.status_code == 200
+    assert response.json()["job"]["status"] == "succeeded"
+    assert response.json()["job"]["result"]["source_pass"] == "ann"
+    assert submitted == []
+
+
+def test_failed_promotion_hands_the_record_back(adjudication, client, monkeypatch):
+    monkeypatch.setattr(adjudication, "PROMOTE_MODE", "inline")
+
+    def boom(*_args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(adjudication, "_finalize_promotion", boom)
+    job = client.post(
+        "/api/adjudication/promote", json={"asset_id": "ea_1", "adjudicator_id": "lead"}
+    ).json()["job"]
+
+    assert job["status"] == "failed"
+    assert "disk full" in job["error"]
+    assert adjudication._read_queue()[0]["status"] == "in_review"
+
+
+def test_stale_jobs_are_resubmitted_when_polled(adjudication, client, monkeypatch):
+    monkeypatch.setattr(adjudication, "PROMOTE_MODE", "inline")
+    adjudication.JOBS_DIR.mkdir(parents=True)
+    job = {
+        "job_id": "abc123",
+        "type": "promote",
+        "asset_id": "ea_1",
+        "adjudicator_id": "lead",
+        "decision_at": "2024-01-01T00:00:00Z",
+        "status": "running",
+    }
+    adjudication._job_path("abc123").write_text(json.dumps({**job, "updated_at": "2000-01-01T00:00:00Z"}))
+
+    assert client.get("/api/adjudication/jobs/abc123").json()["status"] == "succeeded"
+    assert client.get("/api/adjudication/jobs/nope").status_code == 404
+
+
+def test_only_one_poller_claims_a_stale_job(adjudication, client):
+    adjudication.JOBS_DIR.mkdir(parents=True)
+    seen = {
+        "job_id": "abc123",
+        "asset_id": "ea_1",
+        "adjudicator_id": "lead",
+        "decision_at": "2024-01-01T00:00:00Z",
+        "status": "running",
+        "owner": "dead-worker",
+        "updated_at": "2000-01-01T00:00:00Z",
+    }
+    adjudication._job_path("abc123").write_text(json.dumps(seen))
+
+    claimed = adjudication._claim_job("abc123", seen)
+    assert claimed["status"] == "queued"
+    assert claimed["owner"] != "dead-worker"
+    assert adjudication._claim_job("abc123", seen) is None
+
+    # The worker that lost the job neither runs it nor overwrites its state.
+    adjudication._run_promotion_job("abc123", "dead-worker")
+    assert adjudication._load_job("abc123")["owner"] == claimed["owner"]
+    assert adjudication._load_job("abc123")["status"] == "queued"
+    assert not (adjudication.STAGE2_OUTPUT_DIR / "ea_1" / "merged").exists()
+
+    adjudication._run_promotion_job("abc123", claimed["owner"])
+    assert adjudication._load_job("abc123")["status"] == "succeeded"
@@ -0,0 +1,83 @@
+import json
+
+from fastapi.testclient import TestClient
+
+
+def _seed(adjudication, count=3):
+    records = [{"asset_id": f"ea_{i}", "status": "pending"} for i in range(count)]
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, records)
+    return TestClient(adjudication.app)
+
+
+def test_mutations_are_journaled_not_rewritten(adjudication):
+    client = _seed(adjudication)
+    snapshot = adjudication.QUEUE_PATH.read_bytes()
+    client.post("/api/adjudication/assign", json={"asset_id": "ea_1", "assignee": "rev"})
+
+    assert adjudication.QUEUE_PATH.read_bytes() == snapshot
+    lines = [json.loads(line) for line in adjudication.JOURNAL_PATH.read_text().splitlines()]
+    assert lines[0]["journal"] == 1
+    assert lines[1]["op"] == "assign"
+    assert lines[1]["set"]["status"] == "assigned"
+    assert lines[1]["set"]["assignee"] == "rev"
+
+
+def test_replay_from_a_cold_start(adjudication, monkeypatch):
+    client = _seed(adjudication)
+    client.post("/api/adjudication/assign", json={"asset_id": "ea_0", "assignee": "rev"})
+    client.post("/api/adjudication/status", json={"asset_id": "ea_2", "status": "in_review"})
+
+    monkeypatch.setattr(adjudication, "_QUEUE_STATE", None)
+    records = {r["asset_id"]: r for r in adjudication._read_queue()}
+    assert records["ea_0"]["status"] == "assigned"
+    assert records["ea_2"]["status"] == "in_review"
+    assert records["ea_1"]["status"] == "pending"
+
+
+def test_torn_trailing_line_is_ignored_and_terminated(adjudication, monkeypatch):
+    client = _seed(adjudication)
+    client.post("/api/adjudication/status", json={"asset_id": "ea_0", "status": "in_review"})
+    with adjudication.JOURNAL_PATH.open("ab") as handle:
+        handle.write(b'{"op":"status","asset_id":"ea_1","set":{"status":"bro')
+
+    monkeypatch.setattr(adjudication, "_QUEUE_STATE", None)
+    assert {r["asset_id"]: r["status"] for r in adjudication._read_queue()}["ea_1"] == "pending"
+
+    client.post("/api/adjudication/status", json={"asset_id": "ea_2", "status": "done"})
+    monkeypatch.setattr(adjudication, "_QUEUE_STATE", None)
+    statuses = {r["asset_id"]: r["status"] for r in adjudication._read_queue()}
+    assert statuses == {"ea_0": "in_review", "ea_1": "pending", "ea_2": "done"}
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(adjudication, monkeypatch):
+    monkeypatch.setattr(adjudication, "JOURNAL_COMPACT_EVERY", 2)
+    client = _seed(adjudication)
+    client.post("/api/adjudication/status", json={"asset_id": "ea_0", "status": "in_review"})
+    client.post("/api/adjudication/status", json={"asset_id": "ea_1", "status": "done"})
+
+    snapshot = {r["asset_id"]: r["status"] for r in json.loads(adjudication.QUEUE_PATH.read_text())}
+    assert snapshot == {"ea_0": "in_review", "ea_1": "done", "ea_2": "pending"}
+    journal = adjudication.JOURNAL_PATH.read_text().splitlines()
+    assert len(journal) == 1 and json.loads(journal[0])["generation"] == 1
+    archived = [
+        json.loads(line)
+        for path in adjudication.JOURNAL_ARCHIVE_DIR.glob("*.jsonl")
+        for line in path.read_text().splitlines()
+    ]
+    assert [entry["asset_id"] for entry in archived] == ["ea_0", "ea_1"]
+
+
+def test_rebuild_queue_sees_journaled_changes(adjudication):
+    client = _seed(adjudication)
+    client.post("/api/adjudication/status", json={"asset_id": "ea_0", "status": "in_review"})
+
+    seen = {}
+
+    def merge(records):
+        seen.update({r["asset_id"]: r["status"] for r in records})
+        return records + [{"asset_id": "ea_9", "status": "pending"}]
+
+    adjudication.rebuild_queue(merge)
+    assert seen["ea_0"] == "in_review"
+    assert [r["asset_id"] for r in json.loads(adjudication.QUEUE_PATH.read_text())][-1] == "ea_9"
+    assert len(adjudication._read_queue()) == 4
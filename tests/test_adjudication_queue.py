@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+
+def _records(count):
+    return [
+        {
+            "asset_id": f"ea_{i:03d}",
+            "status": "pending" if i % 2 else "assigned",
+            "cell": f"cell{i % 3}",
+            "reasons": ["cue_drift"] if i % 4 == 0 else ["vote_mismatch"],
+            "severity": i % 5,
+            "queued_at": f"2024-01-{1 + i % 28:02d}T00:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def test_filters_match_a_full_scan(adjudication):
+    records = _records(40)
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, records)
+    client = TestClient(adjudication.app)
+
+    body = client.get("/api/adjudication/queue", params={"status": "pending", "cell": "cell1"}).json()
+    expected = [r["asset_id"] for r in records if r["status"] == "pending" and r["cell"] == "cell1"]
+    assert [r["asset_id"] for r in body] == expected
+
+    count = client.get("/api/adjudication/queue", params={"reason": "cue_drift", "count_only": True}).json()
+    assert count == {"count": sum(1 for r in records if "cue_drift" in r["reasons"])}
+
+
+def test_cursor_pages_cover_every_record_once(adjudication):
+    records = _records(23)
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, records)
+    client = TestClient(adjudication.app)
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "severity", "limit": 5}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/adjudication/queue", params=params).json()
+        assert page["total"] == 23
+        seen.extend(item["asset_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    ordered = sorted(records, key=lambda r: (-r["severity"], r["queued_at"], r["asset_id"]))
+    assert seen == [r["asset_id"] for r in ordered]
+
+
+def test_rejects_unknown_sort_and_bad_cursor(adjudication):
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, _records(3))
+    client = TestClient(adjudication.app)
+    assert client.get("/api/adjudication/queue", params={"sort": "nope"}).status_code == 400
+    assert client.get("/api/adjudication/queue", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_mutations_update_the_index_without_a_rebuild(adjudication, monkeypatch):
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, _records(10))
+    client = TestClient(adjudication.app)
+    client.get("/api/adjudication/queue", params={"sort": "age", "limit": 3})
+
+    builds = []
+    original = adjudication._build_queue_index
+    monkeypatch.setattr(
+        adjudication, "_build_queue_index", lambda state: builds.append(1) or original(state)
+    )
+    response = client.post("/api/adjudication/status", json={"asset_id": "ea_001", "status": "in_review"})
+    assert response.status_code == 200
+
+    in_review = client.get("/api/adjudication/queue", params={"status": "in_review"}).json()
+    assert [r["asset_id"] for r in in_review] == ["ea_001"]
+    pending = client.get("/api/adjudication/queue", params={"status": "pending", "sort": "age", "limit": 50})
+    assert "ea_001" not in [r["asset_id"] for r in pending.json()["items"]]
+    assert builds == []
+
+
+def test_compaction_rebuilds_the_index(adjudication, monkeypatch):
+    monkeypatch.setattr(adjudication, "JOURNAL_COMPACT_EVERY", 1)
+    adjudication._atomic_write_json(adjudication.QUEUE_PATH, _records(4))
+    client = TestClient(adjudication.app)
+    client.get("/api/adjudication/queue")
+    client.post("/api/adjudication/status", json={"asset_id": "ea_002", "status": "done"})
+
+    body = client.get("/api/adjudication/queue", params={"status": "done"}).json()
+    assert [r["asset_id"] for r in body] == ["ea_002"]
+    assert adjudication._QUEUE_INDEX.state.generation == 1
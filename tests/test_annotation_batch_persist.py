@@ -0,0 +1,52 @@
+import json
+
+from fastapi.testclient import TestClient
+
+
+def test_batch_writes_every_item_and_one_meta_per_asset(annotations, annotation_payload, monkeypatch):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    writes = []
+    original = annotations._update_item_meta
+    monkeypatch.setattr(
+        annotations,
+        "_update_item_meta",
+        lambda asset_dir, asset_id, updates: writes.append((asset_id, len(updates))) or original(asset_dir, asset_id, updates),
+    )
+    items = [
+        annotation_payload("ea_1", pass_number=1),
+        annotation_payload("ea_1", pass_number=2),
+        annotation_payload("ea_2"),
+        {"asset_id": "ea_3"},
+    ]
+
+    results = annotations._persist_annotation_batch([(item, "ann") for item in items])
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok", "skipped"]
+    assert sorted(writes) == [("ea_1", 2), ("ea_2", 1)]
+    meta = json.loads((annotations.STAGE2_OUTPUT_DIR / "ea_1" / "item_meta.json").read_text())
+    assert [a["pass_number"] for a in meta["assignments"]] == [1, 2]
+    assert meta["double_pass_target"] is True
+
+
+def test_submissions_to_one_directory_keep_their_order(annotations, annotation_payload):
+    items = []
+    for n in range(6):
+        payload = annotation_payload()
+        payload["files"]["transcript_vtt"] = f"WEBVTT\n\nNOTE {n}\n"
+        items.append((payload, "ann"))
+
+    annotations._persist_annotation_batch(items)
+    transcript = annotations.STAGE2_OUTPUT_DIR / "ea_1" / "ann" / "transcript.vtt"
+    assert transcript.read_text() == "WEBVTT\n\nNOTE 5\n"
+
+
+def test_batch_endpoint_reports_per_item_results(annotations, annotation_payload, monkeypatch):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    client = TestClient(annotations.app)
+    body = client.post(
+        "/api/annotations/batch?annotator=ann",
+        json={"items": [annotation_payload("ea_1"), {"files": {}}]},
+    ).json()
+    assert body["count"] == 2
+    assert [r["status"] for r in body["results"]] == ["ok", "skipped"]
+    assert (annotations.STAGE2_OUTPUT_DIR / "ea_1" / "ann" / "qa_result.json").exists()
@@ -0,0 +1,106 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api._idempotency import IdempotencyStore, request_key
+
+
+@pytest.fixture
+def client(annotations, monkeypatch):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    persisted = []
+    original = annotations._persist_annotation_files
+    monkeypatch.setattr(
+        annotations,
+        "_persist_annotation_files",
+        lambda payload, annotator: persisted.append(payload["asset_id"]) or original(payload, annotator),
+    )
+    test_client = TestClient(annotations.app)
+    test_client.persisted = persisted
+    return test_client
+
+
+def test_request_keys_are_scoped():
+    assert request_key("a", "k", None) != request_key("b", "k", None)
+    assert request_key("a", " k ", {"x": 1}) == request_key("a", "k", {"y": 2})
+    assert request_key("a", None, {"x": 1, "y": 2}) == request_key("a", "", {"y": 2, "x": 1})
+
+
+def test_retry_with_the_same_key_is_replayed(client, annotation_payload):
+    headers = {"Idempotency-Key": "submit-1"}
+    first = client.post("/api/annotations?annotator=ann", json=annotation_payload(), headers=headers)
+    second = client.post("/api/annotations?annotator=ann", json=annotation_payload(), headers=headers)
+
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert client.persisted == ["ea_1"]
+
+
+def test_identical_bodies_without_a_key_are_written_by_default(client, annotations, annotation_payload):
+    assert annotations.IDEMPOTENCY_CONTENT_HASH is False
+    for _ in range(2):
+        response = client.post("/api/annotations?annotator=ann", json=annotation_payload())
+        assert "Idempotent-Replayed" not in response.headers
+    assert client.persisted == ["ea_1", "ea_1"]
+
+
+def test_content_hashing_is_opt_in(client, annotations, annotation_payload, monkeypatch):
+    monkeypatch.setattr(annotations, "IDEMPOTENCY_CONTENT_HASH", True)
+    client.post("/api/annotations?annotator=ann", json=annotation_payload())
+    replay = client.post("/api/annotations?annotator=ann", json=annotation_payload())
+    other = client.post("/api/annotations?annotator=bob", json=annotation_payload())
+
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in other.headers
+    assert client.persisted == ["ea_1", "ea_1"]
+
+
+def test_batch_items_are_deduplicated_by_their_keys(client, annotation_payload):
+    items = [
+        {**annotation_payload("ea_1"), "idempotency_key": "a"},
+        {**annotation_payload("ea_1"), "idempotency_key": "a"},
+        {**annotation_payload("ea_2"), "idempotency_key": "b"},
+    ]
+    first = client.post("/api/annotations/batch?annotator=ann", json={"items": items}).json()
+    assert first["duplicates"] == 1
+    assert first["results"][1]["duplicate"] is True
+
+    again = client.post("/api/annotations/batch?annotator=ann", json={"items": items[2:]}).json()
+    assert again["results"][0]["duplicate"] is True
+    assert again["duplicates"] == 1
+
+
+def test_store_expires_and_survives_a_restart(tmp_path, monkeypatch):
+    store = IdempotencyStore(tmp_path, ttl_seconds=60)
+    store.put("ab" * 32, {"status": "ok"})
+    assert IdempotencyStore(tmp_path, ttl_seconds=60).get("ab" * 32) == {"status": "ok"}
+
+    import api._idempotency as module
+
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 120)
+    assert IdempotencyStore(tmp_path, ttl_seconds=60).get("ab" * 32) is None
+
+
+def test_pruning_runs_in_the_background_at_most_once_per_interval(tmp_path, monkeypatch):
+    import api._idempotency as module
+
+    pruned = []
+    monkeypatch.setattr(IdempotencyStore, "prune", lambda self: pruned.append(self) or 0)
+    store = IdempotencyStore(tmp_path, ttl_seconds=60, prune_interval_seconds=30)
+
+    for index in range(5):
+        store.put(f"{index:02d}" * 32, {"status": "ok"})
+        store._prune_thread.join()
+    assert pruned == [store]
+
+    # Another worker sharing the directory sees the marker and skips.
+    other = IdempotencyStore(tmp_path, ttl_seconds=60, prune_interval_seconds=30)
+    other.put("ff" * 32, {"status": "ok"})
+    other._prune_thread.join()
+    assert pruned == [store]
+
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 31)
+    store.put("ee" * 32, {"status": "ok"})
+    store._prune_thread.join()
+    assert pruned == [store, store]
@@ -0,0 +1,76 @@
+import gzip
+import json
+
+import pytest
+
+from api import _artifact_io as artifact_io
+
+
+@pytest.fixture
+def gzip_mode(monkeypatch):
+    monkeypatch.setattr(artifact_io, "COMPRESSION_MODE", "gzip")
+    return artifact_io
+
+
+def test_only_the_configured_files_are_compressed(gzip_mode, tmp_path):
+    stored, data = gzip_mode.encode_for_storage(tmp_path / "annotation.json", b"{}")
+    assert stored.name == "annotation.json.gz"
+    assert gzip.decompress(data) == b"{}"
+    for name in ("transcript.vtt", "item_meta.json"):
+        assert gzip_mode.encode_for_storage(tmp_path / name, b"x") == (tmp_path / name, b"x")
+
+
+def test_compress_all_leaves_node_read_files_plain(gzip_mode, tmp_path, monkeypatch):
+    monkeypatch.setattr(gzip_mode, "COMPRESS_ALL", True)
+    assert gzip_mode.encode_for_storage(tmp_path / "speakers.json", b"x")[0].name == "speakers.json.gz"
+    for name in sorted(gzip_mode.NODE_READ_FILES | {"item_meta.json"}):
+        assert gzip_mode.encode_for_storage(tmp_path / name, b"x")[0].name == name
+
+
+def test_gzip_output_is_deterministic(gzip_mode, tmp_path):
+    first = gzip_mode.encode_for_storage(tmp_path / "annotation.json", b"same")[1]
+    assert gzip_mode.encode_for_storage(tmp_path / "annotation.json", b"same")[1] == first
+
+
+def test_readers_find_plain_or_compressed_files(tmp_path):
+    (tmp_path / "annotation.json.gz").write_bytes(gzip.compress(b'{"a": 1}'))
+    (tmp_path / "transcript.vtt").write_text("WEBVTT\n")
+    assert artifact_io.load_artifact_json(tmp_path / "annotation.json") == {"a": 1}
+    assert artifact_io.read_artifact_text(tmp_path / "transcript.vtt") == "WEBVTT\n"
+    assert artifact_io.logical_path(tmp_path / "annotation.json.gz") == tmp_path / "annotation.json"
+    assert artifact_io.stored_path(tmp_path / "missing.vtt") is None
+    with pytest.raises(FileNotFoundError):
+        artifact_io.read_artifact_bytes(tmp_path / "missing.vtt")
+
+
+def test_compressed_submissions_read_back_through_every_api_reader(
+    gzip_mode, annotations, annotation_payload, monkeypatch
+):
+    from api import export
+
+    monkeypatch.setattr(export, "STAGE2_OUTPUT_DIR", annotations.STAGE2_OUTPUT_DIR)
+    payload = annotation_payload(files={**annotation_payload()["files"], "transcript_ctm": "ctm body\n"})
+    annotations._persist_annotation_files(payload, "ann")
+
+    pass_dir = annotations.STAGE2_OUTPUT_DIR / "ea_1" / "ann"
+    assert (pass_dir / "annotation.json.gz").exists() and not (pass_dir / "annotation.json").exists()
+    assert (pass_dir / "transcript.ctm.gz").exists()
+    assert (pass_dir / "transcript.vtt").exists()
+
+    source, data = export._load_local_export("ea_1")
+    assert source == "local:ann"
+    assert data["files"]["transcript_ctm"] == "ctm body\n"
+
+    annotations._derive_qa_metrics("ea_1", "ann")
+    assert "derived" in json.loads((pass_dir / "qa_result.json").read_text())
+
+
+def test_rewriting_in_another_encoding_drops_the_old_copy(annotations, annotation_payload, monkeypatch):
+    annotations._persist_annotation_files(annotation_payload(), "ann")
+    pass_dir = annotations.STAGE2_OUTPUT_DIR / "ea_1" / "ann"
+    assert (pass_dir / "annotation.json").exists()
+
+    monkeypatch.setattr(artifact_io, "COMPRESSION_MODE", "gzip")
+    annotations._persist_annotation_files(annotation_payload(), "ann")
+    assert not (pass_dir / "annotation.json").exists()
+    assert artifact_io.load_artifact_json(pass_dir / "annotation.json")["asset_id"] == "ea_1"
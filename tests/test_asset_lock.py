@@ -0,0 +1,54 @@
+"""Concurrent read-modify-write of ``item_meta.json``."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from api._asset_lock import LOCK_FILENAME, asset_lock, write_json_atomic
+
+
+def test_concurrent_item_meta_updates_keep_every_pass(annotations):
+    asset_dir = annotations._asset_output_dir("ea_1")
+    barrier = threading.Barrier(16)
+
+    def submit(index):
+        barrier.wait()
+        payload = {"asset_id": "ea_1", "pass_number": 1}
+        annotations._update_item_meta(asset_dir, "ea_1", [(f"ann_{index}", datetime.utcnow(), payload)])
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(submit, range(16)))
+
+    meta = json.loads((asset_dir / "item_meta.json").read_text(encoding="utf-8"))
+    assert sorted(entry["annotator_id"] for entry in meta["assignments"]) == sorted(f"ann_{i}" for i in range(16))
+    assert len(meta["passes"]) == 16
+
+
+def test_item_meta_update_keeps_the_adjudication_block(annotations):
+    asset_dir = annotations._asset_output_dir("ea_1")
+    write_json_atomic(asset_dir / "item_meta.json", {"asset_id": "ea_1", "adjudication": {"status": "locked"}})
+
+    annotations._update_item_meta(asset_dir, "ea_1", [("ann", datetime.utcnow(), {"asset_id": "ea_1"})])
+
+    meta = json.loads((asset_dir / "item_meta.json").read_text(encoding="utf-8"))
+    assert meta["adjudication"] == {"status": "locked"}
+    assert [path.name for path in asset_dir.iterdir() if path.name.startswith(".")] == [LOCK_FILENAME]
+
+
+def test_asset_lock_excludes_other_threads(tmp_path):
+    order = []
+    inside = threading.Event()
+
+    def other():
+        with asset_lock(tmp_path):
+            order.append("other")
+
+    with asset_lock(tmp_path):
+        thread = threading.Thread(target=other)
+        thread.start()
+        inside.wait(0.2)
+        order.append("holder")
+    thread.join()
+
+    assert order == ["holder", "other"]
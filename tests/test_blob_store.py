@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from api._blob_store import BlobStore, is_blob_eligible
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    first = tmp_path / "ea_1" / "ann" / "transcript.vtt"
+    second = tmp_path / "ea_1" / "bob" / "transcript.vtt"
+
+    digest = store.write_view(first, b"WEBVTT\n")
+    assert store.write_view(second, b"WEBVTT\n") == digest
+
+    assert len(list(store.iter_blobs())) == 1
+    assert os.path.samefile(first, second)
+    assert store.is_view(first) and store.is_view(second, digest)
+
+
+def test_replacing_a_view_leaves_other_passes_alone(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    first = tmp_path / "ann" / "transcript.vtt"
+    second = tmp_path / "bob" / "transcript.vtt"
+    store.write_view(first, b"same\n")
+    store.write_view(second, b"same\n")
+
+    store.write_view(first, b"edited\n")
+    assert first.read_bytes() == b"edited\n"
+    assert second.read_bytes() == b"same\n"
+
+
+def test_concurrent_links_to_one_path_do_not_collide(tmp_path, monkeypatch):
+    store = BlobStore(tmp_path / "blobs")
+    view = tmp_path / "ann" / "transcript.vtt"
+    digests = [store.put_bytes(f"body {index}\n".encode()) for index in range(4)]
+    real_link = os.link
+
+    def slow_link(source, target):
+        # Widen the window between making the temp link and renaming it.
+        real_link(source, target)
+        time.sleep(0.001)
+
+    monkeypatch.setattr(os, "link", slow_link)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda index: store.link_view(digests[index % 4], view), range(200)))
+
+    assert store.is_view(view)
+    assert [child.name for child in view.parent.iterdir()] == ["transcript.vtt"]
+
+
+def test_garbage_collection_removes_unreferenced_blobs(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    view = tmp_path / "ann" / "transcript.vtt"
+    store.write_view(view, b"old\n")
+    store.write_view(view, b"new\n")
+
+    assert store.collect_garbage(dry_run=True) == {"blobs": 2, "removed": 1, "bytes_freed": 4}
+    assert len(list(store.iter_blobs())) == 2
+    store.collect_garbage()
+    assert [path.read_bytes() for path in store.iter_blobs()] == [b"new\n"]
+
+
+def test_put_file_adopts_an_existing_file(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    path = tmp_path / "transcript.vtt"
+    path.write_bytes(b"WEBVTT\n")
+    digest = store.put_file(path)
+    store.link_view(digest, path)
+    assert store.is_view(path)
+    assert store.blob_path(digest).stat().st_mode & 0o777 == 0o444
+
+
+def test_metadata_and_hidden_files_are_never_blobs():
+    assert is_blob_eligible(Path("transcript.vtt"))
+    assert not is_blob_eligible(Path("item_meta.json"))
+    assert not is_blob_eligible(Path(".tmp"))
+
+
+def test_content_addressed_submissions_dedupe_across_passes(annotations, annotation_payload, monkeypatch):
+    store = BlobStore(annotations.STAGE2_OUTPUT_DIR.parent / "blobs")
+    monkeypatch.setattr(annotations, "BLOB_STORE", store)
+    annotations._persist_annotation_files(annotation_payload(), "ann")
+    annotations._persist_annotation_files(annotation_payload(pass_number=2), "bob")
+
+    asset = annotations.STAGE2_OUTPUT_DIR / "ea_1"
+    assert os.path.samefile(asset / "ann" / "transcript.vtt", asset / "bob" / "transcript.vtt")
+    assert not store.is_view(asset / "item_meta.json")
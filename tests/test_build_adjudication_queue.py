@@ -0,0 +1,119 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+CONFIG = {
+    "gates": {"require_low_f1_lt": 0.85, "require_cues_in_bounds_lt": 85, "include_voice_tag_disagreements": True},
+    "min_cue_pairs_for_voiceTag": 5,
+}
+
+
+@pytest.fixture
+def builder(adjudication, tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location("build_adjudication_queue", ROOT / "scripts" / "build_adjudication_queue.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the worker pool can pickle ``analyze_asset`` by name.
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    config = tmp_path / "adjudication.json"
+    config.write_text(json.dumps(CONFIG))
+    monkeypatch.setattr(module, "CONFIG_PATH", config)
+    monkeypatch.setattr(module, "CHECKPOINT_PATH", tmp_path / "checkpoint.json")
+    monkeypatch.setattr(module, "LOG_DIR", tmp_path / "logs")
+    monkeypatch.setattr(module, "STAGE2_OUTPUT_DIR", adjudication.STAGE2_OUTPUT_DIR)
+    return module
+
+
+def _write(path, value):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(value if isinstance(value, str) else json.dumps(value))
+
+
+def _pass(directory, spans):
+    _write(directory / "code_switch_spans.json", {"spans": spans})
+    _write(directory / "transcript.vtt", "WEBVTT\n\n00:00.000 --> 00:01.000\n<v A>hola\n")
+
+
+def _pipeline_asset(root, asset_id="ea_1"):
+    asset = root / asset_id
+    _pass(asset / "pass_1" / "ann", [{"start": 0, "end": 1}])
+    _pass(asset / "pass_2" / "bob", [])
+    _write(asset / "item_meta.json", {"double_pass_target": True})
+    _write(asset / "qa_result.json", {"codeswitch_f1": 0.5})
+    return asset
+
+
+def test_disagreeing_low_f1_asset_is_a_candidate(builder, tmp_path):
+    result = builder.analyze_asset(str(_pipeline_asset(tmp_path)), CONFIG)
+    assert result["outcome"] == "target"
+    assert result["candidate"]["reasons"] == ["hasCS_disagreement", "low_f1"]
+    assert result["candidate"]["pass_annotators"] == {"pass_1": "ann", "pass_2": "bob"}
+
+
+def test_api_layout_without_an_index_is_analysed_the_same(builder, tmp_path):
+    asset = tmp_path / "ea_2"
+    _pass(asset / "ann", [{"start": 0, "end": 1}])
+    _pass(asset / "bob", [])
+    _write(asset / "qa_result.json", {"codeswitch_f1": 0.5})
+    _write(
+        asset / "item_meta.json",
+        {"assignments": [{"annotator_id": "ann", "pass_number": 1}, {"annotator_id": "bob", "pass_number": 2}]},
+    )
+    result = builder.analyze_asset(str(asset), CONFIG)
+    assert result["candidate"]["pass_annotators"] == {"pass_1": "ann", "pass_2": "bob"}
+
+
+def test_single_pass_and_locked_assets_are_skipped(builder, tmp_path):
+    asset = _pipeline_asset(tmp_path)
+    _write(asset / "item_meta.json", {"double_pass_target": True, "adjudication": {"status": "locked"}})
+    assert builder.analyze_asset(str(asset), CONFIG)["outcome"] == "locked"
+    single = tmp_path / "ea_3"
+    _pass(single / "pass_1" / "ann", [])
+    assert builder.analyze_asset(str(single), CONFIG)["outcome"] == "single_pass"
+
+
+def test_rebuild_is_incremental_and_keeps_reviewer_state(builder, adjudication):
+    _pipeline_asset(adjudication.STAGE2_OUTPUT_DIR)
+
+    stats = builder.build_queue(workers=1)
+    assert (stats["analysed"], stats["inserted"]) == (1, 1)
+
+    adjudication._update_queue_record("ea_1", adjudication._status_mutator("in_review"), "status", "rev")
+    version = adjudication._record_version(adjudication._read_queue()[0])
+    stats = builder.build_queue(workers=1)
+    assert (stats["analysed"], stats["inserted"], stats["updated"]) == (0, 0, 0)
+    record = adjudication._read_queue()[0]
+    assert record["status"] == "in_review"
+    assert record["reasons"] == ["hasCS_disagreement", "low_f1"]
+    assert adjudication._record_version(record) == version
+
+
+def test_unchanged_rebuild_leaves_versions_and_change_feed_alone(builder, adjudication):
+    _pipeline_asset(adjudication.STAGE2_OUTPUT_DIR)
+    builder.build_queue(workers=1)
+    version = adjudication._record_version(adjudication._read_queue()[0])
+    cursor = adjudication._load_queue_state()
+    cursor = adjudication._format_change_cursor(cursor.generation, cursor.offset)
+
+    stats = builder.build_queue(full=True, workers=1)
+    assert (stats["analysed"], stats["updated"]) == (1, 0)
+    state = adjudication._load_queue_state()
+    assert adjudication._format_change_cursor(state.generation, state.offset) == cursor
+    assert adjudication._record_version(adjudication._read_queue()[0]) == version
+
+
+def test_changed_candidate_bumps_the_version(builder, adjudication):
+    asset = _pipeline_asset(adjudication.STAGE2_OUTPUT_DIR)
+    builder.build_queue(workers=1)
+    version = adjudication._record_version(adjudication._read_queue()[0])
+
+    (asset / "pass_2" / "bob").rename(asset / "pass_2" / "cat")
+    stats = builder.build_queue(full=True, workers=1)
+    assert stats["updated"] == 1
+    record = adjudication._read_queue()[0]
+    assert record["pass_annotators"] == {"pass_1": "ann", "pass_2": "cat"}
+    assert adjudication._record_version(record) == version + 1
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from api._cue_alignment import align_starts, compare_passes, parse_rttm, parse_vtt
+
+VTT_A = """WEBVTT
+
+00:00:00.000 --> 00:00:01.000
+<v S1>hola
+
+00:00:02.000 --> 00:00:03.000
+<v S2>hello
+
+00:00:05.000 --> 00:00:06.000
+no tag
+"""
+
+VTT_B = """WEBVTT
+
+1
+00:00:00.050 --> 00:00:01.100
+<v S1>hola
+
+00:00:02.500 --> 00:00:03.000
+<v S2>hello
+
+00:00:05.100 --> 00:00:06.000
+<v S1>tagged
+"""
+
+
+def _brute_force(starts_a, starts_b, threshold):
+    pairs = []
+    for i, start in enumerate(starts_a):
+        j = int(np.argmin(np.abs(starts_b - start)))
+        back = int(np.argmin(np.abs(starts_a - starts_b[j])))
+        if back == i and abs(start - starts_b[j]) <= threshold:
+            pairs.append((i, j))
+    return pairs
+
+
+def test_parse_vtt_sorts_cues_and_flags_voice_tags():
+    cues = parse_vtt(VTT_A.replace("\n", "\r\n"))
+    assert cues.starts.tolist() == [0.0, 2.0, 5.0]
+    assert cues.ends.tolist() == [1.0, 3.0, 6.0]
+    assert cues.voice_tags.tolist() == [True, True, False]
+    assert len(parse_vtt("")) == 0
+
+
+def test_parse_rttm_skips_comments_and_bad_rows():
+    cues = parse_rttm(
+        "# header\n"
+        "SPEAKER f 1 2.5 1.0 <NA> <NA> S2 <NA> <NA>\n"
+        "SPEAKER f 1 0.5 x <NA> <NA> S1 <NA> <NA>\n"
+        "SPEAKER f 1 0.0 0 <NA> <NA> S1 <NA> <NA>\n"
+        "SPEAKER f 1 0.0 1.5 <NA> <NA> S1 <NA> <NA>\n"
+    )
+    assert cues.starts.tolist() == [0.0, 2.5]
+    assert cues.ends.tolist() == [1.5, 3.5]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_alignment_matches_a_brute_force_mutual_nearest_search(seed):
+    rng = np.random.default_rng(seed)
+    starts_a = np.sort(rng.uniform(0, 30, 60))
+    starts_b = np.sort(np.concatenate([starts_a[::2] + rng.normal(0, 0.05, 30), rng.uniform(0, 30, 20)]))
+    idx_a, idx_b = align_starts(starts_a, starts_b, 0.12)
+    assert list(zip(idx_a.tolist(), idx_b.tolist())) == _brute_force(starts_a, starts_b, 0.12)
+
+
+def test_compare_passes_summarises_agreement():
+    result = compare_passes(parse_vtt(VTT_A), parse_vtt(VTT_B))
+    assert (result["pairs"], result["unmatched_a"], result["unmatched_b"]) == (2, 1, 1)
+    assert result["voice_tag_disagreements"] == 1
+    assert result["voice_tag_agreement"] == 0.5
+    # Both passes cover 0.05-1.0, 2.5-3.0 and 5.1-6.0 out of 0-1.1, 2-3 and 5-6.
+    assert result["overlap_seconds"] == pytest.approx(2.35)
+    assert result["overlap_ratio"] == pytest.approx(2.35 / 3.1)
+    assert result["start_deviation"]["max"] == pytest.approx(0.1)
+
+
+def test_empty_passes_compare_cleanly():
+    result = compare_passes(parse_vtt(""), parse_vtt(VTT_A))
+    assert result["pairs"] == 0
+    assert result["voice_tag_agreement"] is None
+    assert result["overlap_ratio"] == 0.0
+    assert result["start_deviation"]["mean"] is None
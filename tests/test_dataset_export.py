@@ -0,0 +1,149 @@
+"""Checkpointed, resumable dataset export."""
+
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from api import _dataset_export
+from api._dataset_export import CHECKPOINT_FILENAME, REQUIRED_FILES, export_dataset
+from api._paths import ROOT_DIR
+
+QA = {
+    "code_switch_f1_at300ms": 0.9,
+    "diarization_boundary_mae_sec": 0.1,
+    "cue_delta_sec": 0.05,
+    "translation_pct_in_bounds": 0.95,
+}
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    source = tmp_path / "stage2_output"
+    for index in range(7):
+        asset_dir = source / f"ea_{index:02d}"
+        asset_dir.mkdir(parents=True)
+        for name in REQUIRED_FILES:
+            (asset_dir / name).write_text("{}" if name.endswith(".json") else "", encoding="utf-8")
+        (asset_dir / "transcript.vtt").write_text(
+            f"WEBVTT\n\n00:00:00.000 --> 00:00:0{index + 1}.000\n<v Speaker 1>hola {index}\n", encoding="utf-8"
+        )
+        # Every third asset fails the F1 gate, so the log has skips too.
+        f1 = 0.5 if index % 3 == 2 else QA["code_switch_f1_at300ms"]
+        (asset_dir / "qa_result.json").write_text(
+            json.dumps({**QA, "code_switch_f1_at300ms": f1}), encoding="utf-8"
+        )
+    return source
+
+
+def _interrupt_after(monkeypatch, count):
+    original = _dataset_export._ordered_results
+
+    def interrupted(executor, tasks, lookahead):
+        for index, result in enumerate(original(executor, tasks, lookahead)):
+            if index == count:
+                raise Interrupted()
+            yield result
+
+    monkeypatch.setattr(_dataset_export, "_ordered_results", interrupted)
+
+
+def _outputs(root):
+    return {name: (root / name).read_bytes() for name in ("dataset.jsonl", "export_log.txt", "qa_summary.json")}
+
+
+def test_clean_export_writes_records_and_drops_the_checkpoint(corpus, tmp_path):
+    result = export_dataset(corpus, tmp_path / "out", "v1", workers=1)
+
+    root = tmp_path / "out" / "v1"
+    records = [json.loads(line) for line in (root / "dataset.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [record["asset_id"] for record in records] == ["ea_00", "ea_01", "ea_03", "ea_04", "ea_06"]
+    assert result["records"] == 5 and result["processed"] == 7
+    assert result["resumed_after"] is None
+    assert "SKIPPED ea_02 reason=f1_below_threshold" in (root / "export_log.txt").read_text(encoding="utf-8")
+    assert not (root / CHECKPOINT_FILENAME).exists()
+
+
+def test_interrupted_export_resumes_from_its_checkpoint(corpus, tmp_path, monkeypatch):
+    export_dataset(corpus, tmp_path / "clean", "v1", workers=1)
+    expected = _outputs(tmp_path / "clean" / "v1")
+
+    _interrupt_after(monkeypatch, 5)
+    with pytest.raises(Interrupted):
+        export_dataset(corpus, tmp_path / "out", "v1", workers=1, checkpoint_every=2)
+    root = tmp_path / "out" / "v1"
+    checkpoint = json.loads((root / CHECKPOINT_FILENAME).read_text(encoding="utf-8"))
+    assert checkpoint["last_asset_id"] == "ea_03"
+    # ea_04 was written after the last checkpoint and must not be duplicated.
+    assert b'"ea_04"' in (root / "dataset.jsonl").read_bytes()
+
+    monkeypatch.undo()
+    result = export_dataset(corpus, tmp_path / "out", "v1", workers=1, checkpoint_every=2)
+
+    assert result["resumed_after"] == "ea_03"
+    assert result["processed"] == 3
+    assert result["records"] == 5
+    assert _outputs(root) == expected
+    assert not (root / CHECKPOINT_FILENAME).exists()
+
+
+def _checkpointed_run(corpus, out, monkeypatch):
+    _interrupt_after(monkeypatch, 3)
+    with pytest.raises(Interrupted):
+        export_dataset(corpus, out, "v1", workers=1, checkpoint_every=1)
+    monkeypatch.undo()
+    return out / "v1"
+
+
+def test_checkpoint_from_other_options_is_ignored(corpus, tmp_path, monkeypatch):
+    _checkpointed_run(corpus, tmp_path / "out", monkeypatch)
+
+    result = export_dataset(corpus, tmp_path / "out", "v1", workers=1, min_f1=0.4)
+
+    assert result["resumed_after"] is None
+    assert result["records"] == 7
+
+
+def test_restart_ignores_the_checkpoint(corpus, tmp_path, monkeypatch):
+    _checkpointed_run(corpus, tmp_path / "out", monkeypatch)
+
+    result = export_dataset(corpus, tmp_path / "out", "v1", workers=1, resume=False)
+
+    assert result["resumed_after"] is None
+    assert result["processed"] == 7
+    assert result["records"] == 5
+
+
+def test_checkpoint_past_the_end_of_the_output_is_ignored(corpus, tmp_path, monkeypatch):
+    root = _checkpointed_run(corpus, tmp_path / "out", monkeypatch)
+    (root / "dataset.jsonl").write_bytes(b"")
+
+    result = export_dataset(corpus, tmp_path / "out", "v1", workers=1)
+
+    assert result["resumed_after"] is None
+    assert result["records"] == 5
+
+
+def test_script_reports_resumed_exports(corpus, tmp_path, monkeypatch, capsys):
+    path = ROOT_DIR / "scripts" / "export_dataset.py"
+    spec = importlib.util.spec_from_file_location("export_dataset_script", path)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    argv = ["--version", "v1", "--source", str(corpus), "--out", str(tmp_path / "out"), "--workers", "1"]
+
+    _interrupt_after(monkeypatch, 4)
+    with pytest.raises(Interrupted):
+        script.main([*argv, "--checkpoint-every", "2"])
+    monkeypatch.undo()
+
+    assert script.main(argv) == 0
+    assert "Export complete (resumed after ea_03). 5 clips written" in capsys.readouterr().out
+
+    _checkpointed_run(corpus, tmp_path / "out", monkeypatch)
+    assert script.main([*argv, "--restart"]) == 0
+    assert "Export complete. 5 clips written" in capsys.readouterr().out
@@ -0,0 +1,113 @@
+"""Supabase paging behind ``POST /api/export/bulk``."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def supabase(export, monkeypatch, fake_response):
+    """Serve ``rows`` newest first, capped at ``max_rows`` per response."""
+
+    state = {"rows": [], "max_rows": 1000, "fail_at_offset": None, "calls": []}
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        state["calls"].append(dict(params))
+        offset, limit = int(params.get("offset", 0)), int(params.get("limit", 10**9))
+        if offset == state["fail_at_offset"]:
+            return fake_response(503, {"message": "unavailable"})
+        rows = sorted(state["rows"], key=lambda row: -row["id"])
+        wanted = params.get("data->>asset_id")
+        if wanted:
+            ids = json.loads("[" + wanted[len("in.(") : -1] + "]")
+            rows = [row for row in rows if row["data"]["asset_id"] in ids]
+        return fake_response(200, rows[offset : offset + min(limit, state["max_rows"])])
+
+    monkeypatch.setattr(export.requests, "get", fake_get)
+    monkeypatch.setattr(export, "SUPABASE_URL", "https://supabase.test")
+    monkeypatch.setattr(export, "SUPABASE_KEY", "key")
+    monkeypatch.setattr(export, "EXPORT_BULK_PAGE_ROWS", 4)
+    return state
+
+
+def _row(row_id, asset_id):
+    return {"id": row_id, "data": {"asset_id": asset_id, "row": row_id, "files": {"transcript_vtt": "WEBVTT\n"}}}
+
+
+def _manifest(export, body):
+    response = TestClient(export.app).post("/api/export/bulk", json=body)
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    return archive, json.loads(archive.read("manifest.json"))
+
+
+def test_latest_batch_pages_past_a_max_rows_cap(export, supabase):
+    # Ten revisions of ea_0 fill the first pages; ea_1 only shows up later.
+    supabase["rows"] = [_row(100 + index, "ea_0") for index in range(10)] + [_row(1, "ea_1")]
+    supabase["max_rows"] = 3
+
+    latest = export._fetch_latest_batch(["ea_0", "ea_1"])
+
+    assert latest["ea_0"]["row"] == 109
+    assert latest["ea_1"]["row"] == 1
+    assert [call["offset"] for call in supabase["calls"]] == ["0", "3", "6", "9"]
+    assert all(call["order"] == "id.desc" for call in supabase["calls"])
+
+
+def test_latest_batch_stops_once_every_id_is_found(export, supabase):
+    supabase["rows"] = [_row(index, "ea_0") for index in range(20)] + [_row(50, "ea_1")]
+
+    export._fetch_latest_batch(["ea_0", "ea_1"])
+
+    assert len(supabase["calls"]) == 1
+
+
+def test_missing_ids_page_until_the_rows_run_out(export, supabase):
+    supabase["rows"] = [_row(1, "ea_0")]
+
+    assert export._fetch_latest_batch(["ea_0", "ea_9"]).keys() == {"ea_0"}
+    assert [call["offset"] for call in supabase["calls"]] == ["0", "1"]
+
+
+def test_bulk_reports_failed_pages_as_errors_not_missing(export, supabase):
+    supabase["rows"] = [_row(100 + index, "ea_0") for index in range(6)] + [_row(1, "ea_1")]
+    supabase["fail_at_offset"] = 4
+
+    _, manifest = _manifest(export, {"asset_ids": ["ea_0", "ea_1"]})
+
+    assert [entry["status"] for entry in manifest["assets"]] == ["error", "error"]
+    assert manifest["exported"] == 0
+
+
+def test_bulk_exports_assets_found_on_later_pages(export, supabase):
+    supabase["rows"] = [_row(100 + index, "ea_0") for index in range(6)] + [_row(1, "ea_1")]
+    supabase["max_rows"] = 2
+
+    archive, manifest = _manifest(export, {"asset_ids": ["ea_0", "ea_1", "ea_2"]})
+
+    assert [(entry["asset_id"], entry["status"]) for entry in manifest["assets"]] == [
+        ("ea_0", "ok"),
+        ("ea_1", "ok"),
+        ("ea_2", "not_found"),
+    ]
+    assert "ea_1/transcript.vtt" in archive.namelist()
+
+
+def test_non_list_response_is_an_error(export, supabase, monkeypatch, fake_response):
+    monkeypatch.setattr(export.requests, "get", lambda *args, **kwargs: fake_response(200, {"message": "oops"}))
+
+    with pytest.raises(ValueError):
+        export._fetch_latest_batch(["ea_0"])
+
+
+def test_filtered_export_keeps_paging_past_a_capped_page(export, supabase):
+    supabase["rows"] = [_row(100 + index, f"ea_{index}") for index in range(7)]
+    supabase["max_rows"] = 3
+
+    _, manifest = _manifest(export, {"filter": {"annotator": "ann"}})
+
+    assert len(manifest["assets"]) == 7
+    assert manifest["exported"] == 7
@@ -0,0 +1,99 @@
+"""ETags and the on-disk archive cache behind ``GET /api/export``."""
+
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api._export_cache import ExportCache
+from api._paths import ROOT_DIR, data_dir
+
+
+@pytest.fixture
+def clients(export, annotations, tmp_path, monkeypatch):
+    """Export and annotation clients sharing one enabled archive cache."""
+
+    cache = ExportCache(tmp_path / "export_cache", 10 * 1024 * 1024)
+    monkeypatch.setattr(export, "EXPORT_CACHE", cache)
+    monkeypatch.setattr(annotations, "EXPORT_CACHE", cache)
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    return TestClient(export.app), TestClient(annotations.app), cache
+
+
+def _submit(client, payload):
+    response = client.post("/api/annotations?annotator=ann", json=payload)
+    assert response.status_code < 300, response.text
+
+
+def test_data_dir_anchors_relative_paths_at_the_repo_root(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("EXAMPLE_DIR", raising=False)
+    assert data_dir("EXAMPLE_DIR", "data/example") == ROOT_DIR / "data" / "example"
+
+    monkeypatch.setenv("EXAMPLE_DIR", "elsewhere/cache")
+    assert data_dir("EXAMPLE_DIR", "data/example") == ROOT_DIR / "elsewhere" / "cache"
+
+    monkeypatch.setenv("EXAMPLE_DIR", str(tmp_path / "abs"))
+    assert data_dir("EXAMPLE_DIR", "data/example") == tmp_path / "abs"
+
+
+def test_annotations_and_export_share_the_cache_directory():
+    from api import annotations, export
+
+    assert annotations.EXPORT_CACHE.directory == export.EXPORT_CACHE_DIR
+
+
+def test_etag_revalidation_returns_304(clients, annotation_payload):
+    export_client, annotation_client, _ = clients
+    _submit(annotation_client, annotation_payload())
+
+    first = export_client.get("/api/export", params={"asset_id": "ea_1"})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = export_client.get("/api/export", params={"asset_id": "ea_1"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert export_client.get(
+        "/api/export", params={"asset_id": "ea_1"}, headers={"If-None-Match": '"other", *'}
+    ).status_code == 304
+
+
+def test_archives_are_cached_until_the_asset_changes(clients, annotation_payload):
+    export_client, annotation_client, cache = clients
+    _submit(annotation_client, annotation_payload())
+
+    first = export_client.get("/api/export", params={"asset_id": "ea_1"})
+    key = first.headers["ETag"].strip('"')
+    cached = cache.get("ea_1", key)
+    assert cached is not None and cached.read_bytes() == first.content
+    assert zipfile.ZipFile(io.BytesIO(first.content)).testzip() is None
+
+    second = export_client.get("/api/export", params={"asset_id": "ea_1"})
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    payload = annotation_payload(pass_number=2)
+    payload["files"]["transcript_vtt"] = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nadiós\n"
+    _submit(annotation_client, payload)
+
+    assert cache.get("ea_1", key) is None
+    third = export_client.get(
+        "/api/export", params={"asset_id": "ea_1"}, headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert third.status_code == 200
+    assert third.headers["ETag"] != first.headers["ETag"]
+    assert "adiós" in zipfile.ZipFile(io.BytesIO(third.content)).read("transcript.vtt").decode("utf-8")
+
+
+def test_disabled_cache_still_sends_etags(export, annotations, annotation_payload, monkeypatch, tmp_path):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    _submit(TestClient(annotations.app), annotation_payload())
+
+    response = TestClient(export.app).get("/api/export", params={"asset_id": "ea_1"})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert not (tmp_path / "export_cache").exists()
@@ -0,0 +1,118 @@
+"""``GET /api/export`` built from stage2_output instead of Supabase."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(export, annotations, monkeypatch):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    test_client = TestClient(export.app)
+    test_client.submit_client = TestClient(annotations.app)
+    return test_client
+
+
+def _submit(client, payload, annotator="ann"):
+    response = client.submit_client.post(f"/api/annotations?annotator={annotator}", json=payload)
+    assert response.status_code < 300, response.text
+
+
+def _transcript(text):
+    return f"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n{text}\n"
+
+
+def _archive(response):
+    assert response.status_code == 200, response.text
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_local_asset_is_exported_without_supabase(client, annotation_payload):
+    _submit(client, annotation_payload())
+
+    response = client.get("/api/export", params={"asset_id": "ea_1"})
+
+    assert response.headers["X-Export-Source"] == "local"
+    archive = _archive(response)
+    assert archive.read("transcript.vtt").decode("utf-8") == _transcript("hola")
+    assert "translation.vtt" in archive.namelist()
+
+
+def test_newest_pass_wins(client, annotation_payload):
+    _submit(client, annotation_payload())
+    second = annotation_payload(pass_number=2)
+    second["files"]["transcript_vtt"] = _transcript("segunda")
+    _submit(client, second, annotator="other")
+
+    archive = _archive(client.get("/api/export", params={"asset_id": "ea_1"}))
+
+    assert "segunda" in archive.read("transcript.vtt").decode("utf-8")
+
+
+def test_locked_asset_is_exported_from_merged(client, export, annotation_payload):
+    _submit(client, annotation_payload())
+    asset_dir = export.STAGE2_OUTPUT_DIR / "ea_1"
+    merged = asset_dir / "merged"
+    merged.mkdir()
+    (merged / "transcript.vtt").write_text(_transcript("adjudicado"), encoding="utf-8")
+    meta_path = asset_dir / "item_meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["adjudication"] = {"status": "locked", "merged_path": "merged"}
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    archive = _archive(client.get("/api/export", params={"asset_id": "ea_1"}))
+
+    assert "adjudicado" in archive.read("transcript.vtt").decode("utf-8")
+
+
+def test_files_on_disk_override_annotation_json(client, export, annotation_payload):
+    _submit(client, annotation_payload())
+    asset_dir = export.STAGE2_OUTPUT_DIR / "ea_1"
+    source_dir = export._local_source_dir(asset_dir, export._load_json_dict(asset_dir / "item_meta.json"))
+    (source_dir / "transcript.vtt").write_text(_transcript("corregido"), encoding="utf-8")
+
+    archive = _archive(client.get("/api/export", params={"asset_id": "ea_1"}))
+
+    assert "corregido" in archive.read("transcript.vtt").decode("utf-8")
+
+
+def test_sanitised_name_collision_is_not_served(client, annotation_payload):
+    _submit(client, annotation_payload(asset_id="ea/1"))
+
+    assert client.get("/api/export", params={"asset_id": "ea_1", "source": "local"}).status_code == 404
+    assert client.get("/api/export", params={"asset_id": "ea/1", "source": "local"}).status_code == 200
+
+
+def test_source_modes(client, export, annotation_payload, monkeypatch):
+    _submit(client, annotation_payload())
+    fetched = []
+
+    def fake_fetch(asset_id):
+        fetched.append(asset_id)
+        return 7, {"asset_id": asset_id, "files": {"transcript_vtt": _transcript("remoto")}}
+
+    monkeypatch.setattr(export, "_fetch_latest_row", fake_fetch)
+    monkeypatch.setattr(export, "SUPABASE_URL", "https://supabase.test")
+    monkeypatch.setattr(export, "SUPABASE_KEY", "key")
+
+    assert client.get("/api/export", params={"asset_id": "ea_1", "source": "nope"}).status_code == 400
+    assert client.get("/api/export", params={"asset_id": "ea_9", "source": "local"}).status_code == 404
+    assert fetched == []
+
+    remote = client.get("/api/export", params={"asset_id": "ea_1", "source": "supabase"})
+    assert remote.headers["X-Export-Source"] == "supabase"
+    assert "remoto" in _archive(remote).read("transcript.vtt").decode("utf-8")
+
+    fallback = client.get("/api/export", params={"asset_id": "ea_9"})
+    assert fallback.headers["X-Export-Source"] == "supabase"
+    assert fetched == ["ea_1", "ea_9"]
+
+
+def test_missing_local_asset_without_supabase(client):
+    response = client.get("/api/export", params={"asset_id": "ea_9"})
+
+    assert response.status_code == 500
+    assert response.json() == {"error": "Supabase not configured"}
@@ -0,0 +1,212 @@
+import json
+
+import pytest
+
+from api._ingest_wal import IngestWAL, WALRetryableError
+
+
+def _wal(tmp_path, sinks, **kwargs):
+    wal = IngestWAL(tmp_path / "wal", sinks, flush_interval=0.0, **kwargs)
+    # Flush by hand instead of from the background thread.
+    wal.start = lambda: None
+    return wal
+
+
+def _ids(batches):
+    return [entry["record"]["n"] for batch in batches for entry in batch]
+
+
+def test_entries_are_delivered_in_order_and_in_batches(tmp_path):
+    batches = []
+    wal = _wal(tmp_path, {"disk": batches.append}, batch_size=2)
+    for n in range(5):
+        wal.append({"n": n})
+
+    while wal.flush_once():
+        pass
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert _ids(batches) == [0, 1, 2, 3, 4]
+
+
+def test_restart_replays_only_unacknowledged_entries(tmp_path):
+    delivered = []
+    wal = _wal(tmp_path, {"disk": delivered.append}, batch_size=2)
+    for n in range(3):
+        wal.append({"n": n})
+    wal.flush_once()
+
+    replayed = []
+    restarted = _wal(tmp_path, {"disk": replayed.append}, batch_size=10)
+    restarted.flush_once()
+    assert _ids(delivered) == [0, 1]
+    assert _ids(replayed) == [2]
+
+
+def test_failing_sink_does_not_hold_back_the_others(tmp_path):
+    disk, calls = [], []
+
+    def supabase(entries):
+        calls.append(len(entries))
+        if len(calls) == 1:
+            raise WALRetryableError("503")
+
+    wal = _wal(tmp_path, {"disk": disk.append, "supabase": supabase})
+    wal.append({"n": 0})
+
+    wal.flush_once()
+    assert _ids([disk[0]]) == [0]
+    assert wal.stats()["sinks"]["supabase"]["depth"] == 1
+    assert wal.stats()["sinks"]["supabase"]["consecutive_failures"] == 1
+
+    wal.flush_once()
+    assert calls == [1, 1]
+    assert wal.stats()["depth"] == 0
+
+
+def test_torn_tail_is_skipped_and_terminated(tmp_path):
+    batches = []
+    wal = _wal(tmp_path, {"disk": batches.append})
+    wal.append({"n": 0})
+    with wal.path.open("ab") as handle:
+        handle.write(b'{"id":"torn","record":{"n"')
+    wal.append({"n": 1})
+
+    wal.flush_once()
+    assert _ids(batches) == [0, 1]
+
+
+def test_log_rotates_once_every_sink_caught_up(tmp_path):
+    wal = _wal(tmp_path, {"disk": lambda entries: None, "supabase": lambda entries: None})
+    wal.append({"n": 0})
+    inode = wal.path.stat().st_ino
+
+    wal.flush_once()
+    assert wal.path.stat().st_size == 0
+    assert wal.path.stat().st_ino != inode
+    checkpoint = json.loads(wal.checkpoint_path.read_text())
+    assert checkpoint == {**checkpoint, "inode": wal.path.stat().st_ino, "offsets": {"disk": 0, "supabase": 0}}
+
+
+def test_offsets_for_an_older_log_are_discarded(tmp_path):
+    batches = []
+    wal = _wal(tmp_path, {"disk": batches.append})
+    wal.append({"n": 0})
+    wal.checkpoint_path.write_text(json.dumps({"inode": -1, "offsets": {"disk": 10**6}}))
+
+    wal.flush_once()
+    assert _ids(batches) == [0]
+
+
+@pytest.mark.parametrize("error", [RuntimeError("boom"), WALRetryableError("later")])
+def test_sink_errors_are_reported_in_stats(tmp_path, error):
+    def sink(entries):
+        raise error
+
+    wal = _wal(tmp_path, {"disk": sink})
+    wal.append({"n": 0})
+    wal.flush_once()
+    stats = wal.stats()
+    assert stats["depth"] == 1
+    assert stats["sinks"]["disk"]["last_error"] == repr(error)
+    assert stats["lag_seconds"] is not None
+
+
+def test_annotation_submits_are_acknowledged_then_written_by_the_flusher(
+    annotations, annotation_payload, tmp_path, monkeypatch
+):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    wal = _wal(tmp_path, {"supabase": annotations._wal_supabase_sink, "files": annotations._wal_files_sink})
+    monkeypatch.setattr(annotations, "INGEST_WAL", wal)
+    client = TestClient(annotations.app)
+
+    response = client.post("/api/annotations?annotator=ann", json=annotation_payload())
+    assert response.status_code == 202
+    assert response.json()["queued"] is True
+    transcript = annotations.STAGE2_OUTPUT_DIR / "ea_1" / "ann" / "transcript.vtt"
+    assert not transcript.exists()
+    assert client.get("/api/annotations/wal").json()["depth"] == 1
+
+    wal.flush_once()
+    assert transcript.read_text().startswith("WEBVTT")
+    assert client.get("/api/annotations/wal").json()["depth"] == 0
+
+
+def test_partially_delivered_batches_resume_after_the_delivered_entries(tmp_path):
+    calls = []
+
+    def sink(entries):
+        calls.append([entry["record"]["n"] for entry in entries])
+        if len(calls) == 1:
+            raise WALRetryableError("503", delivered=2)
+
+    wal = _wal(tmp_path, {"supabase": sink})
+    for n in range(4):
+        wal.append({"n": n})
+
+    wal.flush_once()
+    assert wal.stats()["sinks"]["supabase"]["depth"] == 2
+    wal.flush_once()
+    assert calls == [[0, 1, 2, 3], [2, 3]]
+
+
+@pytest.fixture
+def supabase_wal(annotations, fake_response, tmp_path, monkeypatch):
+    """WAL with only the Supabase sink; ``respond(rows)`` picks the reply."""
+
+    class Server:
+        respond = staticmethod(lambda rows: 201)
+        calls = []
+
+    def post(endpoint, headers=None, json=None, timeout=None):
+        Server.calls.append([row["n"] for row in json])
+        reply = Server.respond(json)
+        return fake_response(*reply) if isinstance(reply, tuple) else fake_response(reply)
+
+    monkeypatch.setattr(annotations.requests, "post", post)
+    monkeypatch.setattr(annotations, "SUPABASE_URL", "https://db.example")
+    monkeypatch.setattr(annotations, "SUPABASE_KEY", "key")
+    monkeypatch.setattr(annotations, "SUPABASE_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(annotations, "SUPABASE_INSERT_RETRIES", 0)
+    monkeypatch.setattr(annotations, "SUPABASE_CHUNK_ROWS", 2)
+    wal = _wal(tmp_path, {"supabase": annotations._wal_supabase_sink})
+    for n in range(6):
+        wal.append({"n": n})
+    Server.wal = wal
+    return Server
+
+
+@pytest.mark.parametrize("status", [401, 403, 404, 503])
+def test_supabase_sink_stalls_instead_of_dropping(supabase_wal, status):
+    supabase_wal.respond = staticmethod(lambda rows: status)
+
+    supabase_wal.wal.flush_once()
+
+    stats = supabase_wal.wal.stats()["sinks"]["supabase"]
+    assert stats["depth"] == 6
+    assert stats["consecutive_failures"] == 1
+
+
+def test_supabase_sink_drops_only_rejected_rows(supabase_wal):
+    duplicate = (409, {"code": "23505"})
+    supabase_wal.respond = staticmethod(lambda rows: duplicate if any(row["n"] == 3 for row in rows) else 201)
+
+    supabase_wal.wal.flush_once()
+
+    assert supabase_wal.wal.stats()["sinks"]["supabase"]["depth"] == 0
+    assert sorted(supabase_wal.calls) == [[0, 1], [2], [2, 3], [3], [4, 5]]
+
+
+def test_supabase_sink_resumes_at_the_first_failed_chunk(supabase_wal):
+    supabase_wal.respond = staticmethod(lambda rows: 503 if rows[0]["n"] == 2 else 201)
+
+    supabase_wal.wal.flush_once()
+    assert supabase_wal.wal.stats()["sinks"]["supabase"]["depth"] == 4
+
+    supabase_wal.respond = staticmethod(lambda rows: 201)
+    supabase_wal.calls.clear()
+    supabase_wal.wal._retry_at.clear()
+    supabase_wal.wal.flush_once()
+    assert sorted(supabase_wal.calls) == [[2, 3], [4, 5]]
+    assert supabase_wal.wal.stats()["sinks"]["supabase"]["depth"] == 0
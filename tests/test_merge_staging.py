@@ -0,0 +1,65 @@
+import os
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_staging_links_pass_files_into_merged(adjudication, tmp_path):
+    asset = tmp_path / "asset"
+    pass_dir = asset / "pass_1" / "ann"
+    _write(pass_dir / "transcript.vtt", "WEBVTT\n")
+    _write(pass_dir / "nested" / "qa_result.json", "{}")
+
+    merged = adjudication._prepare_merged_directory(asset, pass_dir)
+
+    assert (merged / "transcript.vtt").read_text() == "WEBVTT\n"
+    assert (merged / "nested" / "qa_result.json").read_text() == "{}"
+    if adjudication.MERGE_STAGING_MODE != "copy":
+        assert os.path.samefile(merged / "transcript.vtt", pass_dir / "transcript.vtt")
+    assert not list(asset.glob("merged_tmp_*"))
+    assert not list(asset.glob(".merged_backup_*"))
+
+
+def test_existing_merged_files_are_kept_and_replaced_not_written_through(adjudication, tmp_path):
+    asset = tmp_path / "asset"
+    first = asset / "pass_1" / "ann"
+    second = asset / "pass_2" / "ann"
+    _write(first / "transcript.vtt", "first\n")
+    _write(first / "notes.txt", "keep\n")
+    _write(second / "transcript.vtt", "second\n")
+
+    adjudication._prepare_merged_directory(asset, first)
+    merged = adjudication._prepare_merged_directory(asset, second)
+
+    assert (merged / "transcript.vtt").read_text() == "second\n"
+    assert (merged / "notes.txt").read_text() == "keep\n"
+    assert (first / "transcript.vtt").read_text() == "first\n"
+
+
+def test_unchanged_promotion_leaves_merged_in_place(adjudication, tmp_path, monkeypatch):
+    monkeypatch.setattr(adjudication, "MERGE_INCREMENTAL", True)
+    asset = tmp_path / "asset"
+    pass_dir = asset / "pass_1" / "ann"
+    _write(pass_dir / "transcript.vtt", "WEBVTT\n")
+
+    merged = adjudication._prepare_merged_directory(asset, pass_dir)
+    inode = merged.stat().st_ino
+    assert adjudication._prepare_merged_directory(asset, pass_dir).stat().st_ino == inode
+
+    # Pass writers replace files atomically, which breaks the hard link.
+    _write(pass_dir / "transcript.tmp", "WEBVTT\n\nchanged\n")
+    os.replace(pass_dir / "transcript.tmp", pass_dir / "transcript.vtt")
+    assert (merged / "transcript.vtt").read_text() == "WEBVTT\n"
+    assert adjudication._merged_is_current(pass_dir, merged) is False
+
+
+def test_copy_mode_never_shares_inodes(adjudication, tmp_path, monkeypatch):
+    monkeypatch.setattr(adjudication, "MERGE_STAGING_MODE", "copy")
+    asset = tmp_path / "asset"
+    pass_dir = asset / "pass_1" / "ann"
+    _write(pass_dir / "transcript.vtt", "WEBVTT\n")
+
+    merged = adjudication._prepare_merged_directory(asset, pass_dir)
+    assert not os.path.samefile(merged / "transcript.vtt", pass_dir / "transcript.vtt")
@@ -0,0 +1,80 @@
+import json
+
+from api._pass_index import discover_passes, indexed_passes, latest_pass_dir, record_pass
+from api._stage2_summary import summarize_clip
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _api_asset(root, passes):
+    """Lay out an asset the way ``POST /api/annotations`` writes it."""
+
+    asset = root / "ea_1"
+    assignments = []
+    for number, annotator in passes:
+        _write(asset / annotator / "transcript.vtt", f"WEBVTT\n\nNOTE {annotator}\n")
+        _write(asset / annotator / "qa_result.json", "{}")
+        assignments.append(
+            {"annotator_id": annotator, "pass_number": number, "submitted_at": f"2024-01-0{number}T00:00:00Z"}
+        )
+    meta = {"asset_id": "ea_1", "assignments": assignments}
+    _write(asset / "item_meta.json", json.dumps(meta))
+    return asset, meta
+
+
+def test_record_pass_replaces_and_orders_entries():
+    meta = {}
+    record_pass(meta, 2, "bob", "2024-01-02T00:00:00Z")
+    record_pass(meta, 1, "ann", "2024-01-01T00:00:00Z")
+    record_pass(meta, 2, "bob", "2024-01-03T00:00:00Z")
+    assert [(e["pass_number"], e["path"], e["completed_at"]) for e in indexed_passes(meta)] == [
+        (1, "ann", "2024-01-01T00:00:00Z"),
+        (2, "bob", "2024-01-03T00:00:00Z"),
+    ]
+
+
+def test_indexed_passes_drops_escaping_paths():
+    meta = {"passes": [{"pass_number": 1, "path": "../x"}, {"pass_number": 1, "path": "/etc"}]}
+    assert indexed_passes(meta) == []
+    assert indexed_passes({}) is None
+
+
+def test_unindexed_api_asset_discovers_annotator_dirs(tmp_path):
+    asset, meta = _api_asset(tmp_path, [(1, "ann"), (2, "bob")])
+    passes = discover_passes(asset, meta)
+    assert [(e["pass_number"], e["path"]) for e in passes] == [(1, "ann"), (2, "bob")]
+    assert latest_pass_dir(asset, passes) == asset / "bob"
+
+
+def test_pipeline_tree_is_still_scanned(tmp_path):
+    asset = tmp_path / "ea_2"
+    _write(asset / "pass_1" / "ann" / "transcript.vtt", "WEBVTT\n")
+    _write(asset / "pass_2" / "bob" / "transcript.vtt", "WEBVTT\n")
+    passes = discover_passes(asset, {})
+    assert {e["path"] for e in passes} == {"pass_1", "pass_2"}
+    assert summarize_clip(asset) == {"clip": True, "double": True}
+
+
+def test_summary_agrees_before_and_after_indexing(tmp_path):
+    asset, meta = _api_asset(tmp_path, [(1, "ann"), (2, "bob")])
+    before = summarize_clip(asset)
+    for entry in meta["assignments"]:
+        record_pass(meta, entry["pass_number"], entry["annotator_id"], entry["submitted_at"])
+    (asset / "item_meta.json").write_text(json.dumps(meta))
+    assert before == summarize_clip(asset) == {"clip": True, "double": True}
+
+
+def test_promotion_stages_the_newest_annotator_dir_and_records_it(adjudication):
+    asset, _meta = _api_asset(adjudication.STAGE2_OUTPUT_DIR, [(1, "ann"), (2, "bob")])
+
+    result = adjudication._finalize_promotion(asset, "lead", "2024-02-01T00:00:00Z")
+
+    assert result["source_pass"] == "bob"
+    assert result["source_pass_number"] == 2
+    assert (asset / "merged" / "transcript.vtt").read_text() == "WEBVTT\n\nNOTE bob\n"
+    meta = json.loads((asset / "item_meta.json").read_text())
+    assert meta["review_status"] == "locked"
+    assert [e["path"] for e in meta["passes"]] == ["ann", "bob"]
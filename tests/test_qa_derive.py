@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from api import export
+from api._qa_derive import codeswitch_f1, cue_stats, derive_submission_metrics, diarization_mae
+from api._qa_rollup import contribution_from_qa
+
+TRANSCRIPT = "WEBVTT\n\n00:00:00.000 --> 00:00:02.000\nuno dos\n\n00:00:02.000 --> 00:00:05.000\ntres\n"
+TRANSLATION = "WEBVTT\n\n00:00:00.000 --> 00:00:02.000\none two\n"
+
+
+def _files(spans, rttm):
+    return {
+        "transcript_vtt": TRANSCRIPT,
+        "translation_vtt": TRANSLATION,
+        "code_switch_vtt": "WEBVTT\n",
+        "code_switch_spans_json": json.dumps({"spans": spans}),
+        "diarization_rttm": rttm,
+    }
+
+
+def test_submission_metrics_describe_the_submission_alone():
+    metrics = derive_submission_metrics(_files([], ""))
+    assert metrics["cues"]["cue_count"] == 2
+    assert metrics["cue_diff_sec"] == pytest.approx(0.0)
+    assert metrics["translation_char_ratio"] == pytest.approx(6 / 10)
+    assert metrics["translation_completeness"] == pytest.approx(2 / 3)
+    assert cue_stats("", "")["translation_char_ratio"] == 0.0
+
+
+def test_pair_scores():
+    spans = json.dumps([{"start": 1.0, "end": 2.0}, {"start": 5.0, "end": 6.0}])
+    assert codeswitch_f1(spans, json.dumps([{"start": 1.1, "end": 2.1}]))["f1"] == pytest.approx(2 / 3)
+    assert codeswitch_f1("[]", "[]")["f1"] == 1.0
+    rttm = "SPEAKER f 1 0.0 1.0 <NA> <NA> A <NA> <NA>\nSPEAKER f 1 1.0 1.0 <NA> <NA> B <NA> <NA>\n"
+    shifted = rttm.replace("1 1.0 1.0", "1 1.5 1.0")
+    assert diarization_mae(rttm, shifted) == pytest.approx(0.5)
+    assert diarization_mae(rttm, "") == 5.0
+
+
+@pytest.fixture
+def derived_asset(annotations, annotation_payload):
+    rttm = "SPEAKER f 1 0.0 1.0 <NA> <NA> A <NA> <NA>\nSPEAKER f 1 1.0 1.0 <NA> <NA> B <NA> <NA>\n"
+    first = annotation_payload(files=_files([{"start": 1, "end": 2}], rttm), qa={"annotator_id": "ann"})
+    client_qa = {"annotator_id": "bob", "metrics": {"cues": {"translationCompleteness": 0.9}}}
+    second = annotation_payload(pass_number=2, files=_files([], rttm), qa=client_qa)
+    annotations._persist_annotation_files(first, "ann")
+    annotations._persist_annotation_files(second, "bob")
+    annotations._derive_qa_metrics("ea_1", "ann")
+    annotations._derive_qa_metrics("ea_1", "bob")
+    asset = annotations.STAGE2_OUTPUT_DIR / "ea_1"
+    return {name: json.loads((asset / name / "qa_result.json").read_text()) for name in ("ann", "bob")}, asset
+
+
+def test_agreement_stays_under_derived(derived_asset):
+    qa, asset = derived_asset
+    agreement = qa["bob"]["derived"]["agreement"]
+    assert agreement["reference"] == "ann"
+    assert agreement["codeswitch_f1"] == 0.0
+    for key in ("codeswitch_f1", "diarization_mae", "cue_diff_sec", "translation_char_ratio"):
+        assert key not in qa["bob"]
+    row = json.loads((asset / "qa_metrics.json").read_text())
+    assert row["agreement"]["passes"] == ["ann", "bob"]
+    assert set(row["passes"]) == {"ann", "bob"}
+
+
+def test_readers_prefer_client_values_and_fall_back_to_derived(derived_asset):
+    qa, _asset = derived_asset
+    client = contribution_from_qa(qa["bob"], "bob", None, None)["metrics"]
+    fallback = contribution_from_qa(qa["ann"], "ann", None, None)["metrics"]
+    assert client["translation_char_ratio"] == 0.9
+    assert fallback["translation_char_ratio"] == pytest.approx(0.6)
+    assert "codeswitch_f1" not in client and "diarization_mae" not in client
+
+    report = export._build_qa_report({"asset_id": "ea_1", "qa": [qa["bob"], qa["ann"]]})
+    by_annotator = {clip["annotator_id"]: clip for clip in report["clips"]}
+    assert by_annotator["bob"]["translation_char_ratio"] == 0.9
+    assert by_annotator["ann"]["translation_char_ratio"] == pytest.approx(0.6)
+    assert by_annotator["bob"]["codeswitch_f1"] is None
+
+
+def test_derivation_queued_for_an_older_submission_is_skipped(annotations, annotation_payload):
+    rttm = "SPEAKER f 1 0.0 1.0 <NA> <NA> A <NA> <NA>\n"
+    first = annotations._persist_annotation_files(annotation_payload(files=_files([], rttm)), "ann")
+    second = annotations._persist_annotation_files(
+        annotation_payload(files=_files([], rttm), qa={"annotator_id": "ann", "note": "resubmitted"}), "ann"
+    )
+    asset = annotations.STAGE2_OUTPUT_DIR / "ea_1"
+
+    annotations._derive_qa_metrics("ea_1", "ann", first.isoformat() + "Z")
+    qa = json.loads((asset / "ann" / "qa_result.json").read_text())
+    assert "derived" not in qa
+    assert not (asset / "qa_metrics.json").exists()
+
+    annotations._derive_qa_metrics("ea_1", "ann", second.isoformat() + "Z")
+    qa = json.loads((asset / "ann" / "qa_result.json").read_text())
+    assert qa["note"] == "resubmitted"
+    assert qa["derived"]["cues"]["cue_count"] == 2
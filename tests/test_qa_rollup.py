@@ -0,0 +1,119 @@
+"""Running QA totals and ``GET /api/export/qa_rollup``."""
+
+import importlib.util
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api._paths import ROOT_DIR
+from api._qa_rollup import QARollupStore, contribution_from_qa, summarize_bucket
+
+
+@pytest.fixture
+def clients(export, annotations, monkeypatch):
+    monkeypatch.setattr(annotations, "DERIVE_QA_METRICS", False)
+    monkeypatch.setattr(export, "QA_ROLLUP", annotations.QA_ROLLUP)
+    return TestClient(export.app), TestClient(annotations.app)
+
+
+def _submit(client, payload, annotator):
+    response = client.post(f"/api/annotations?annotator={annotator}", json=payload)
+    assert response.status_code < 300, response.text
+
+
+def _qa(annotator, **fields):
+    return {"annotator_id": annotator, **fields}
+
+
+def _contribution(annotator="ann", day="2026-01-02", **fields):
+    return contribution_from_qa(_qa(annotator, **fields), annotator, "cell_a", f"{day}T10:00:00Z")
+
+
+def test_record_replaces_and_removes_contributions(tmp_path):
+    store = QARollupStore(tmp_path / "rollup")
+
+    store.record("ea_1/ann", _contribution(codeswitch_f1=0.5))
+    store.record("ea_2/ann", _contribution(codeswitch_f1=0.9, gold_target=True, gold_check="pass"))
+    store.record("ea_1/ann", _contribution(codeswitch_f1=0.7))
+
+    overall = summarize_bucket(store.load_totals()["overall"])
+    assert overall["clips"] == 2
+    assert overall["averageCodeSwitchF1"] == pytest.approx(0.8)
+    assert (overall["goldTargets"], overall["passCount"], overall["passRate"]) == (1, 1, 0.5)
+
+    store.record("ea_2/ann", None)
+    totals = store.load_totals()
+    assert summarize_bucket(totals["overall"])["averageCodeSwitchF1"] == pytest.approx(0.7)
+    assert totals["annotator"]["ann"]["clips"] == 1
+
+
+def test_empty_groups_are_dropped(tmp_path):
+    store = QARollupStore(tmp_path / "rollup")
+    store.record("ea_1/ann", _contribution(day="2026-01-02"))
+
+    store.record("ea_1/ann", _contribution(day="2026-01-03"))
+
+    assert sorted(store.load_totals()["day"]) == ["2026-01-03"]
+
+
+def test_rollup_directory_is_resolved_the_same_way_in_both_modules():
+    from api import annotations, export
+
+    assert annotations.QA_ROLLUP_DIR == export.QA_ROLLUP_DIR
+
+
+def test_submits_feed_the_rollup_endpoint(clients, annotation_payload):
+    export_client, annotation_client = clients
+    _submit(annotation_client, annotation_payload(qa=_qa("ann", codeswitch_f1=0.6)), "ann")
+    _submit(annotation_client, annotation_payload(asset_id="ea_2", qa=_qa("bob", codeswitch_f1=1.0)), "bob")
+    # A resubmission replaces the earlier numbers instead of adding to them.
+    _submit(annotation_client, annotation_payload(qa=_qa("ann", codeswitch_f1=0.8)), "ann")
+
+    response = export_client.get("/api/export/qa_rollup")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["overall"]["clips"] == 2
+    assert body["overall"]["averageCodeSwitchF1"] == pytest.approx(0.9)
+    assert body["annotator"]["ann"]["averageCodeSwitchF1"] == pytest.approx(0.8)
+    assert set(body) >= {"annotator", "cell", "day"}
+
+    revalidated = export_client.get("/api/export/qa_rollup", headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_rollup_endpoint_filters(clients, annotations):
+    export_client, _ = clients
+    for index, day in enumerate(["2026-01-01", "2026-01-02", "2026-01-03"]):
+        annotations.QA_ROLLUP.record(f"ea_{index}/ann", _contribution(day=day))
+
+    by_day = export_client.get(
+        "/api/export/qa_rollup", params={"by": "day", "since": "2026-01-02", "until": "2026-01-02"}
+    ).json()
+
+    assert list(by_day["day"]) == ["2026-01-02"]
+    assert "annotator" not in by_day
+    assert by_day["overall"]["clips"] == 3
+    assert export_client.get("/api/export/qa_rollup", params={"by": "nope"}).status_code == 400
+
+
+def test_rebuild_script_matches_incremental_totals(clients, annotations, annotation_payload, monkeypatch):
+    _, annotation_client = clients
+    _submit(annotation_client, annotation_payload(qa=_qa("ann", codeswitch_f1=0.6)), "ann")
+    _submit(annotation_client, annotation_payload(asset_id="ea_2", pass_number=2, qa=_qa("bob")), "bob")
+    incremental = annotations.QA_ROLLUP.load_totals()
+
+    path = ROOT_DIR / "scripts" / "rebuild_qa_rollup.py"
+    spec = importlib.util.spec_from_file_location("rebuild_qa_rollup", path)
+    script = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, script)
+    spec.loader.exec_module(script)
+    monkeypatch.setattr(script, "STAGE2_OUTPUT_DIR", annotations.STAGE2_OUTPUT_DIR)
+    monkeypatch.setattr(script, "QA_ROLLUP_DIR", annotations.QA_ROLLUP.directory)
+    assert script.main([]) == 0
+
+    rebuilt = annotations.QA_ROLLUP.load_totals()
+    for key in ("overall", "annotator", "cell", "day"):
+        assert rebuilt[key] == incremental[key]
+    assert rebuilt["generation"] == incremental["generation"] + 1
@@ -0,0 +1,125 @@
+"""Incremental maintenance of the stage2 summary totals."""
+
+import json
+import shutil
+
+import pytest
+
+from api import _stage2_summary
+from api._pass_index import record_pass
+from api._stage2_summary import SummaryCache
+
+
+def _add_pass(root, asset, pass_name):
+    target = root / asset / pass_name
+    target.mkdir(parents=True, exist_ok=True)
+    (target / "transcript.vtt").write_text("WEBVTT\n", encoding="utf-8")
+    return root / asset
+
+
+def _index_passes(asset_dir, *pass_numbers):
+    meta = {}
+    for number in pass_numbers:
+        (asset_dir / f"ann_{number}").mkdir(parents=True, exist_ok=True)
+        record_pass(meta, number, f"ann_{number}", "2024-01-01T00:00:00Z")
+    (asset_dir / "item_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return asset_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    root = tmp_path / "stage2_output"
+    root.mkdir()
+    return SummaryCache(root, tmp_path / "summary")
+
+
+def test_summary_counts_clips_and_double_passes(cache):
+    _add_pass(cache.root, "ea_1", "pass_1")
+    _add_pass(cache.root, "ea_2", "pass_1")
+    _add_pass(cache.root, "ea_2", "pass_2")
+
+    summary = cache.summary()
+
+    assert summary["clips"] == 2
+    assert summary["double_passes"] == 1
+    assert sorted(p.name for p in (cache.directory / "clips").iterdir()) == ["ea_1.json", "ea_2.json"]
+
+
+def test_note_clip_applies_delta_without_touching_other_clips(cache):
+    _add_pass(cache.root, "ea_1", "pass_1")
+    _add_pass(cache.root, "ea_2", "pass_1")
+    generation = cache.summary()["generation"]
+    other = cache.directory / "clips" / "ea_1.json"
+    other_mtime = other.stat().st_mtime_ns
+
+    cache.note_clip(_add_pass(cache.root, "ea_3", "pass_1"))
+    cache.note_clip(_add_pass(cache.root, "ea_2", "pass_2"))
+
+    assert other.stat().st_mtime_ns == other_mtime
+    totals = json.loads((cache.directory / "totals.json").read_text(encoding="utf-8"))
+    assert (totals["clips"], totals["double_passes"]) == (3, 1)
+    assert totals["generation"] == generation + 2
+    # The new clip moved the root mtime, but note_clip already counted it.
+    assert cache.summary() == {"clips": 3, "double_passes": 1, "generation": generation + 2}
+
+
+def test_note_clip_subtracts_removed_clip(cache):
+    _add_pass(cache.root, "ea_1", "pass_1")
+    clip = _add_pass(cache.root, "ea_2", "pass_2")
+    cache.summary()
+
+    shutil.rmtree(clip)
+    cache.note_clip(clip)
+
+    totals = json.loads((cache.directory / "totals.json").read_text(encoding="utf-8"))
+    assert (totals["clips"], totals["double_passes"]) == (1, 0)
+    assert not (cache.directory / "clips" / "ea_2.json").exists()
+
+
+def test_note_clip_without_totals_waits_for_rescan(cache):
+    clip = _add_pass(cache.root, "ea_1", "pass_1")
+
+    cache.note_clip(clip)
+
+    assert not (cache.directory / "totals.json").exists()
+    assert cache.summary()["clips"] == 1
+
+
+def test_refresh_rebuilds_from_clip_files_and_drops_stale_ones(cache):
+    _add_pass(cache.root, "ea_1", "pass_1")
+    _add_pass(cache.root, "ea_2", "pass_1")
+    cache.summary()
+    # Totals that drifted and a clip removed behind the cache's back.
+    totals_path = cache.directory / "totals.json"
+    totals = json.loads(totals_path.read_text(encoding="utf-8"))
+    totals_path.write_text(json.dumps({**totals, "clips": 99}), encoding="utf-8")
+    shutil.rmtree(cache.root / "ea_2")
+
+    rebuilt = cache.refresh()
+
+    assert (rebuilt["clips"], rebuilt["double_passes"]) == (1, 0)
+    assert [p.name for p in (cache.directory / "clips").iterdir()] == ["ea_1.json"]
+
+
+def test_refresh_does_not_read_item_meta_of_unchanged_clips(cache, monkeypatch):
+    _index_passes(cache.root / "ea_1", 1)
+    _add_pass(cache.root, "ea_2", "pass_1")
+    cache.refresh()
+    reads = []
+    real_read = _stage2_summary._read_item_meta
+    monkeypatch.setattr(_stage2_summary, "_read_item_meta", lambda clip: reads.append(clip.name) or real_read(clip))
+
+    cache.refresh()
+    assert reads == []
+
+    _index_passes(cache.root / "ea_1", 1, 2)
+    rebuilt = cache.refresh()
+    assert reads == ["ea_1"]
+    assert (rebuilt["clips"], rebuilt["double_passes"]) == (2, 1)
+
+
+def test_modules_share_one_summary_directory():
+    from api import adjudication, annotations, export
+
+    assert annotations.STAGE2_SUMMARY_DIR == export.STAGE2_SUMMARY_DIR == adjudication.STAGE2_SUMMARY_DIR
+    assert annotations.STAGE2_SUMMARY_DIR.is_absolute()
@@ -0,0 +1,118 @@
+import pytest
+import requests
+
+
+@pytest.fixture
+def supabase(annotations, fake_response, monkeypatch):
+    """Record every insert request; ``respond(rows)`` picks the status.
+
+    It may also return ``(status, body)`` for errors that carry a PostgREST
+    error body.
+    """
+
+    calls = []
+
+    class Server:
+        respond = staticmethod(lambda rows: 201)
+
+    def post(endpoint, headers=None, json=None, timeout=None):
+        calls.append([row["n"] for row in json])
+        status = Server.respond(json)
+        if isinstance(status, Exception):
+            raise status
+        if isinstance(status, tuple):
+            return fake_response(*status)
+        return fake_response(status)
+
+    monkeypatch.setattr(annotations.requests, "post", post)
+    monkeypatch.setattr(annotations, "SUPABASE_URL", "https://db.example")
+    monkeypatch.setattr(annotations, "SUPABASE_KEY", "key")
+    monkeypatch.setattr(annotations, "SUPABASE_RETRY_BACKOFF_SECONDS", 0)
+    Server.calls = calls
+    return Server
+
+
+def _rows(count, size=0):
+    return [{"n": n, "pad": "x" * size} for n in range(count)]
+
+
+def test_chunks_are_bounded_by_rows_and_bytes(annotations, monkeypatch):
+    monkeypatch.setattr(annotations, "SUPABASE_CHUNK_ROWS", 3)
+    assert annotations._chunk_records(_rows(7)) == [(0, 3), (3, 6), (6, 7)]
+
+    monkeypatch.setattr(annotations, "SUPABASE_CHUNK_ROWS", 100)
+    monkeypatch.setattr(annotations, "SUPABASE_CHUNK_BYTES", 250)
+    assert annotations._chunk_records(_rows(4, size=100)) == [(0, 2), (2, 4)]
+    # A single row over the byte bound still goes out on its own.
+    assert annotations._chunk_records(_rows(1, size=1000)) == [(0, 1)]
+    assert annotations._chunk_records([]) == []
+
+
+def test_every_chunk_is_sent_and_reported(annotations, supabase, monkeypatch):
+    monkeypatch.setattr(annotations, "SUPABASE_CHUNK_ROWS", 2)
+    chunks = annotations._insert_supabase_batch("t", _rows(5))
+    assert sorted(supabase.calls) == [[0, 1], [2, 3], [4]]
+    assert [(c["start"], c["count"], c["saved"]) for c in chunks] == [(0, 2, True), (2, 2, True), (4, 1, True)]
+
+
+def test_payload_too_large_splits_until_the_bad_row_is_isolated(annotations, supabase):
+    supabase.respond = staticmethod(lambda rows: 413 if any(row["n"] == 2 for row in rows) else 201)
+    chunks = annotations._insert_supabase_batch("t", _rows(4))
+    assert [(c["start"], c["count"], c["saved"]) for c in chunks] == [(0, 2, True), (2, 1, False), (3, 1, True)]
+    assert chunks[1]["error"] == "Supabase batch insert failed: 413"
+
+
+def test_transient_failures_are_retried(annotations, supabase, monkeypatch):
+    monkeypatch.setattr(annotations, "SUPABASE_INSERT_RETRIES", 2)
+    outcomes = iter([503, requests.ConnectionError("reset"), 201])
+    supabase.respond = staticmethod(lambda rows: next(outcomes))
+    chunks = annotations._insert_supabase_batch("t", _rows(2))
+    assert chunks == [{"start": 0, "count": 2, "saved": True, "attempts": 3}]
+
+
+def test_retries_are_bounded(annotations, supabase, monkeypatch):
+    monkeypatch.setattr(annotations, "SUPABASE_INSERT_RETRIES", 1)
+    supabase.respond = staticmethod(lambda rows: 429)
+    [chunk] = annotations._insert_supabase_batch("t", _rows(2))
+    assert (chunk["saved"], chunk["attempts"]) == (False, 2)
+    assert len(supabase.calls) == 2
+
+
+def test_rejected_row_is_isolated_and_the_rest_are_saved(annotations, supabase):
+    check_violation = (400, {"code": "23514", "message": "violates check constraint"})
+    supabase.respond = staticmethod(lambda rows: check_violation if any(row["n"] == 5 for row in rows) else 201)
+    chunks = annotations._insert_supabase_batch("t", _rows(8))
+
+    saved = {n for c in chunks if c["saved"] for n in range(c["start"], c["start"] + c["count"])}
+    failed = [c for c in chunks if not c["saved"]]
+    assert saved == {0, 1, 2, 3, 4, 6, 7}
+    assert [(c["start"], c["count"], c["error"]) for c in failed] == [(5, 1, "Supabase batch insert failed: 400")]
+
+
+def test_request_level_errors_are_not_split(annotations, supabase):
+    supabase.respond = staticmethod(lambda rows: 401)
+    [chunk] = annotations._insert_supabase_batch("t", _rows(8))
+    assert (chunk["count"], chunk["saved"]) == (8, False)
+    assert len(supabase.calls) == 1
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        (400, {"code": "PGRST204", "message": "Could not find the 'x' column"}),
+        (403, {"code": "42501", "message": "new row violates row-level security policy"}),
+        (400, None),
+    ],
+)
+def test_errors_that_hit_every_row_are_not_split(annotations, supabase, response):
+    supabase.respond = staticmethod(lambda rows: response)
+    [chunk] = annotations._insert_supabase_batch("t", _rows(8))
+    assert (chunk["count"], chunk["saved"]) == (8, False)
+    assert len(supabase.calls) == 1
+
+
+def test_coalesced_callers_get_their_own_outcome(annotations, supabase):
+    duplicate = (409, {"code": "23505", "message": "duplicate key value"})
+    supabase.respond = staticmethod(lambda rows: duplicate if any(row["n"] == 1 for row in rows) else 201)
+    outcomes = annotations._send_coalesced(_rows(3))
+    assert outcomes == [None, "Supabase batch insert failed: 409", None]
@@ -0,0 +1,88 @@
+"""Archives written by ``api._zip_stream`` open cleanly with ``zipfile``."""
+
+import io
+import os
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api import _zip_stream
+
+TEXT = ("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nhola mundo\n" * 200).encode("utf-8")
+
+
+def _open(chunks):
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    return archive
+
+
+def test_stream_zip_round_trips_every_kind_of_entry(tmp_path):
+    audio = tmp_path / "clip.wav"
+    audio.write_bytes(os.urandom(200_000))
+
+    archive = _open(
+        _zip_stream.stream_zip(
+            [
+                ("transcript.vtt", TEXT.decode("utf-8")),
+                ("raw.bin", TEXT),
+                ("clip.wav", audio),
+                ("chunks.json", iter([b'{"a": ', b"1}"])),
+                ("empty.txt", b""),
+                ("ñandú/notas.txt", "sí"),
+            ]
+        )
+    )
+
+    assert archive.read("transcript.vtt") == TEXT
+    assert archive.read("raw.bin") == TEXT
+    assert archive.read("clip.wav") == audio.read_bytes()
+    assert archive.read("chunks.json") == b'{"a": 1}'
+    assert archive.read("empty.txt") == b""
+    assert archive.read("ñandú/notas.txt") == "sí".encode("utf-8")
+    assert archive.getinfo("transcript.vtt").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.getinfo("clip.wav").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("transcript.vtt").external_attr == 0o644 << 16
+
+
+def test_stream_zip_deflates_at_the_configured_level(monkeypatch):
+    monkeypatch.setattr(_zip_stream, "EXPORT_ZIP_LEVEL", 1)
+    fast = _open(_zip_stream.stream_zip([("a.txt", TEXT)])).getinfo("a.txt").compress_size
+    expected = zlib.compressobj(1, zlib.DEFLATED, -15)
+    assert fast == len(expected.compress(TEXT) + expected.flush())
+
+    monkeypatch.setattr(_zip_stream, "EXPORT_ZIP_LEVEL", 0)
+    stored = _open(_zip_stream.stream_zip([("a.txt", TEXT)])).getinfo("a.txt")
+    assert stored.compress_type == zipfile.ZIP_STORED
+    assert stored.compress_size == len(TEXT)
+
+
+def test_stream_zip_uses_zip64_headers_for_large_size_hints(monkeypatch):
+    monkeypatch.setattr(_zip_stream, "_size_hint", lambda data: 5 * 1024**3)
+
+    archive = _open(_zip_stream.stream_zip([("big.txt", TEXT), ("small.txt", b"x")]))
+
+    assert archive.read("big.txt") == TEXT
+    assert archive.read("small.txt") == b"x"
+
+
+def test_stream_zip_rejects_entries_that_outgrow_zip32(monkeypatch):
+    monkeypatch.setattr(_zip_stream, "_ZIP32_LIMIT", 100)
+
+    with pytest.raises(zipfile.LargeZipFile):
+        b"".join(_zip_stream.stream_zip([("a.bin", iter([os.urandom(200)]))]))
+
+
+def test_stream_zip_parallel_matches_serial_contents():
+    entries = [(f"clip_{index}/transcript.vtt", TEXT + str(index).encode()) for index in range(20)]
+    entries.append(("clip.mp3", os.urandom(5000)))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = _open(_zip_stream.stream_zip_parallel(entries, executor, lookahead=3))
+    serial = _open(_zip_stream.stream_zip(entries))
+
+    assert parallel.namelist() == serial.namelist() == [name for name, _ in entries]
+    for name, data in entries:
+        assert parallel.read(name) == serial.read(name) == data